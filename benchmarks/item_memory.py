@@ -0,0 +1,104 @@
+"""
+Item/Job 메모리 사용량 벤치마크
+-------------------------------
+__slots__ 기반 Item/Job과 기존 dict 기반 객체 구조(LegacyItem/LegacyJob)를
+같은 개수만큼 생성하여 tracemalloc으로 메모리 사용량을 비교합니다.
+
+실행: python benchmarks/item_memory.py [--items 1000000] [--items-per-job 2]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from environment import Item, Job  # noqa: E402
+
+
+class LegacyJob:
+    """__slots__ 도입 전 Job과 같은 속성 구성 (인스턴스 __dict__ 사용)"""
+    def __init__(self, job_id, items, create_time):
+        self.job_id = job_id
+        self.items = items
+        self.create_time = create_time
+        self.build_time = None
+        self.washing_time = None
+        self.drying_time = None
+        self.completed_postprocessing = 0
+        self.packaging_time = None
+
+
+class LegacyItem:
+    """__slots__ 도입 전 Item과 같은 속성 구성 (env 참조 + 사후에 추가되던 job, log_index)"""
+    def __init__(self, env, item_id, height, width, depth, volume, job_id=None):
+        self.env = env
+        self.item_id = item_id
+        self.job_id = job_id
+        self.create_time = 0.0
+        self.height = height
+        self.width = width
+        self.depth = depth
+        self.volume = volume
+        self.build_time = None
+        self.post_processing_time = None
+        self.due_date = None
+        self.printing_cost = 0
+        self.post_processing_cost = 0
+        self.packaging_cost = 0
+        self.delivery_cost = 0
+        self.shortage_cost = 0
+        self.shortage = 0
+
+
+def build_slots(n_items, items_per_job):
+    jobs = []
+    for item_id in range(n_items):
+        if item_id % items_per_job == 0:
+            job = Job(len(jobs), [], 0.0)
+            jobs.append(job)
+        item = Item(item_id, 0.0, 12, 12, 12, 1728, job=job)
+        item.log_index = item_id
+        job.items.append(item)
+    return jobs
+
+
+def build_legacy(n_items, items_per_job):
+    env = object()
+    jobs = []
+    for item_id in range(n_items):
+        if item_id % items_per_job == 0:
+            job = LegacyJob(len(jobs), [], 0.0)
+            jobs.append(job)
+        item = LegacyItem(env, item_id, 12, 12, 12, 1728, job_id=job.job_id)
+        item.job = job
+        item.log_index = item_id
+        job.items.append(item)
+    return jobs
+
+
+def measure(builder, n_items, items_per_job):
+    """builder로 객체를 생성한 뒤 남아있는 메모리(bytes)를 반환"""
+    gc.collect()
+    tracemalloc.start()
+    jobs = builder(n_items, items_per_job)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del jobs
+    gc.collect()
+    return current
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--items-per-job", type=int, default=2)
+    args = parser.parse_args()
+
+    legacy = measure(build_legacy, args.items, args.items_per_job)
+    slots = measure(build_slots, args.items, args.items_per_job)
+    print(f"items: {args.items:,} (items per job: {args.items_per_job})")
+    print(f"dict-based Item/Job : {legacy / 2**20:8.1f} MiB ({legacy / args.items:.0f} B/item)")
+    print(f"__slots__ Item/Job  : {slots / 2**20:8.1f} MiB ({slots / args.items:.0f} B/item)")
+    print(f"reduction           : {1 - slots / legacy:.1%}")
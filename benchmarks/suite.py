@@ -0,0 +1,229 @@
+"""
+시뮬레이터 벤치마크 스위트
+---------------------------
+config_Simpy.py 설정에 knob(sweep.py의 KNOBS) 값을 적용한 대표 시나리오들을 각각 새 프로세스에서 실행하고,
+다음 항목을 측정하여 기계가 읽을 수 있는 기록(history, JSON Lines)에 추가합니다.
+
+측정 항목:
+    events_per_s: 초당 처리한 SimPy 이벤트 수 (가장 빠른 실행 기준)
+    wall_s: run_simulation() 실행 시간 (최솟값, 최소 repeat번, 합계 --min-time초가 될 때까지 반복 실행)
+    peak_rss_mb: 자식 프로세스의 최대 RSS
+    import_s: 시뮬레이터 모듈(simulation, simpy, numpy, pandas) import 시간
+    startup_s: 프로세스 시작부터 첫 실행 직전까지의 시간 (인터프리터 시작 + import + 설정 생성)
+
+이전 기록(같은 시나리오, 같은 호스트의 최근 --window개 기록의 중앙값)보다 허용 범위 이상 나빠진 항목이 있으면
+회귀(regression)로 보고하고 종료 코드 1을 반환합니다.
+허용 범위는 THRESHOLDS 비율, 같은 기록들의 퍼짐(MAD_K × 1.4826 × MAD), ABS_TOLERANCE 중 가장 큰 값입니다.
+(측정 시간은 같은 코드에서도 실행마다 최대 25% 정도 달라지므로, 시간 항목의 기본 비율은 이보다 크게 잡았습니다.)
+회귀가 있는 실행은 기준값이 나빠지지 않도록 기록하지 않습니다. (의도한 변화라면 --accept로 기록)
+측정 환경의 잡음이 큰 경우 --threshold-scale로 허용 범위를 일괄 조정할 수 있습니다.
+
+실행: python benchmarks/suite.py [--scenarios default day30] [--repeat 3] [--no-record]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import nullcontext
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.jsonl")
+
+# 시나리오 이름 -> sweep.point_config()에 넘길 knob 딕셔너리 (빈 딕셔너리는 config_Simpy.py 그대로)
+SCENARIOS = {
+    "default": {},                                             # 현재 기본 설정 (SIM_TIME = 2일)
+    "day30": {"sim_time": 30},
+    "day365": {"sim_time": 365},
+    "large_farm": {"sim_time": 30, "printers": 50, "washing_machines": 20, "drying_machines": 20,
+                   "post_processing_workers": 40, "packaging_workers": 20},
+    # Job 도착 간격(JOB_ARRIVAL_INTERVAL)은 기본값 그대로 두고 Job당 Item 수로 도착 부하를 높임
+    "stress": {"sim_time": 30, "item_size": 40, "job_list_size": 1},
+}
+
+# 항목 -> (나빠지는 방향, 허용 비율): "higher"는 값이 커지면 회귀
+THRESHOLDS = {
+    "events_per_s": ("lower", 0.30),
+    "wall_s": ("higher", 0.30),
+    "peak_rss_mb": ("higher", 0.10),
+    "import_s": ("higher", 0.25),
+    "startup_s": ("higher", 0.25),
+}
+# 항목 -> 회귀로 보지 않는 절대 차이 (짧은 시나리오의 측정 잡음)
+ABS_TOLERANCE = {
+    "events_per_s": 1000.0,
+    "wall_s": 0.005,
+    "peak_rss_mb": 2.0,
+    "import_s": 0.05,
+    "startup_s": 0.05,
+}
+# 기록의 퍼짐을 허용 범위에 반영할 때 곱하는 계수 (MAD × 1.4826은 정규분포의 표준편차 추정값)
+MAD_K = 3.0
+METRICS = tuple(THRESHOLDS)
+
+
+class EventCounter:
+    """
+    EventCounter 클래스
+    ----------------------
+    run_simulation()의 profiler 인자로 넘겨 Environment.step()을 감싸고, 처리한 SimPy 이벤트 수를 셉니다.
+    profiler.SimProfiler와 같은 attach()/running() 인터페이스만 구현합니다.
+    """
+
+    def __init__(self):
+        self.events = 0
+
+    def attach(self, simpy_env, *processes):
+        step = simpy_env.step
+
+        def counted_step():
+            self.events += 1
+            step()
+
+        simpy_env.step = counted_step
+
+    def running(self):
+        return nullcontext()
+
+
+def child_main(scenario, repeat, min_time, process_start):
+    """자식 프로세스: 시나리오를 repeat번 이상, 실행 시간 합이 min_time초가 될 때까지 실행하고 측정값을 JSON 한 줄로 출력"""
+    import resource
+
+    start = time.perf_counter()
+    sys.path.insert(0, SRC_DIR)
+    from simulation import run_simulation
+    from sweep import point_config
+    import_s = time.perf_counter() - start
+
+    config = point_config(SCENARIOS[scenario], {"PRINT_SIM_EVENTS": False})
+    startup_s = time.time() - process_start
+
+    runs = []
+    while len(runs) < repeat or sum(wall_s for wall_s, _ in runs) < min_time:
+        counter = EventCounter()
+        start = time.perf_counter()
+        result = run_simulation(config, seed=0, profiler=counter)
+        wall_s = time.perf_counter() - start
+        runs.append((wall_s, counter.events))
+
+    wall_s, events = min(runs)
+    print(json.dumps({
+        "events": events,
+        "runs": len(runs),
+        "events_per_s": events / wall_s,
+        "wall_s": wall_s,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "import_s": import_s,
+        "startup_s": startup_s,
+        "makespan": result.makespan,
+    }))
+
+
+def run_scenario(scenario, repeat, min_time):
+    """scenario를 새 Python 프로세스에서 실행하고 측정값 딕셔너리를 반환"""
+    command = [sys.executable, os.path.abspath(__file__), "--child", scenario, "--repeat", str(repeat),
+               "--min-time", repr(min_time), "--process-start", repr(time.time())]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline(history, scenario, host, window):
+    """같은 시나리오, 같은 호스트의 최근 window개 기록의 항목별 (중앙값, MAD) (기록이 없으면 None)"""
+    records = [record for record in history if record["scenario"] == scenario and record["host"] == host]
+    records = records[-window:]
+    if not records:
+        return None
+    reference = {}
+    for metric in METRICS:
+        values = [record["metrics"][metric] for record in records]
+        median = statistics.median(values)
+        reference[metric] = (median, statistics.median(abs(value - median) for value in values))
+    return reference
+
+
+def regressions(metrics, reference, scale=1.0):
+    """
+    reference의 중앙값보다 허용 범위 이상 나빠진 항목 리스트: (항목, 기준값, 현재값, 변화율)
+    허용 범위 = max(THRESHOLDS 비율 × 기준값, MAD_K × 1.4826 × MAD, ABS_TOLERANCE) × scale
+    """
+    found = []
+    for metric, (worse, ratio) in THRESHOLDS.items():
+        (old, mad), new = reference[metric], metrics[metric]
+        change = (new - old) / old if old else 0.0
+        delta = new - old if worse == "higher" else old - new
+        tolerance = max(ratio * old, MAD_K * 1.4826 * mad, ABS_TOLERANCE[metric]) * scale
+        if delta > tolerance:
+            found.append((metric, old, new, change))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3, help="minimum runs per scenario (fastest one is reported)")
+    parser.add_argument("--min-time", type=float, default=1.0, help="minimum total run time per scenario (seconds)")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON Lines history file")
+    parser.add_argument("--window", type=int, default=5, help="history records used for the baseline median")
+    parser.add_argument("--threshold-scale", type=float, default=1.0, help="multiply every regression tolerance")
+    parser.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    parser.add_argument("--accept", action="store_true", help="record this run even if it regressed")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--process-start", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args.child, args.repeat, args.min_time, args.process_start)
+        return 0
+
+    history = load_history(args.history)
+    host = platform.node()
+    revision = git_revision()
+    records = []
+    failed = False
+    for scenario in args.scenarios:
+        metrics = run_scenario(scenario, args.repeat, args.min_time)
+        reference = baseline(history, scenario, host, args.window)
+        print(f"{scenario:<11}: {metrics['events']:>10,} events | {metrics['events_per_s']:>9,.0f} events/s | "
+              f"wall {metrics['wall_s']:7.3f} s | peak RSS {metrics['peak_rss_mb']:7.1f} MB | "
+              f"import {metrics['import_s']:.3f} s | startup {metrics['startup_s']:.3f} s")
+        if reference is not None:
+            for metric, old, new, change in regressions(metrics, reference, args.threshold_scale):
+                failed = True
+                print(f"  REGRESSION {metric}: {old:.4g} -> {new:.4g} ({change:+.1%})")
+        records.append({
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": revision,
+            "host": host,
+            "python": platform.python_version(),
+            "scenario": scenario,
+            "metrics": metrics,
+        })
+
+    if not args.no_record and (args.accept or not failed):
+        with open(args.history, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+작업자 풀 처리량 벤치마크
+-------------------------
+기존 Proc_PostProcessing/Proc_Packaging의 작업자 할당 방식(workers 딕셔너리 순회 + list.pop(0) 대기열)과
+WorkerPool(쉬는 작업자 스택 + deque 대기열)을 같은 도착 패턴으로 실행하여 비교합니다.
+
+측정 항목:
+    completed: horizon까지 완료된 작업 수 (시뮬레이션 처리량)
+    idle while waiting: 대기열에 작업이 있는 동안 쉬고 있던 작업자 시간 합 (작업 보존 여부)
+    wall time: 실행 시간 (작업자 수가 많을 때 할당 비용 차이, IdleMonitor 없이 별도로 측정)
+
+실행: python benchmarks/worker_pool_throughput.py [--workers 5 500] [--tasks 200000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import simpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from environment import WorkerPool  # noqa: E402
+
+
+class IdleMonitor:
+    """대기열이 비어있지 않은 동안 쉬고 있는 작업자 수를 시간 가중 합산"""
+    def __init__(self, env, stage):
+        self.env = env
+        self.stage = stage
+        self.last_time = 0.0
+        self.idle_while_waiting = 0.0
+
+    def update(self):
+        now = self.env.now
+        if self.stage.queue_length():
+            self.idle_while_waiting += self.stage.idle_workers() * (now - self.last_time)
+        self.last_time = now
+
+
+class NullMonitor:
+    """실행 시간 측정용 (모니터링 비용 제외)"""
+    idle_while_waiting = 0.0
+
+    def update(self):
+        pass
+
+
+class LegacyStage:
+    """기존 Proc_Packaging과 같은 할당 방식 (release에서 worker_id를 busy로 표시하는 부분 포함)"""
+    def __init__(self, env, n_workers, service_time, monitor=True):
+        self.env = env
+        self.workers = {worker_id: {"is_busy": False} for worker_id in range(n_workers)}
+        self.queue = []
+        self.service_time = service_time
+        self.completed = 0
+        self.monitor = IdleMonitor(env, self) if monitor else NullMonitor()
+
+    def queue_length(self):
+        return len(self.queue)
+
+    def idle_workers(self):
+        return sum(not worker["is_busy"] for worker in self.workers.values())
+
+    def seize(self, task):
+        self.monitor.update()
+        assigned = False
+        for worker_id, worker in self.workers.items():
+            if not worker["is_busy"]:
+                worker["is_busy"] = True
+                self.env.process(self.delay(task, worker_id))
+                assigned = True
+                break
+        if not assigned:
+            self.queue.append(task)
+
+    def delay(self, task, worker_id):
+        yield self.env.timeout(self.service_time)
+        self.release(worker_id)
+
+    def release(self, worker_id):
+        self.monitor.update()
+        self.completed += 1
+        self.workers[worker_id]["is_busy"] = False
+        if self.queue:
+            next_task = self.queue.pop(0)
+            for wid, worker in self.workers.items():
+                if not worker["is_busy"]:
+                    self.workers[worker_id]["is_busy"] = True
+                    self.env.process(self.delay(next_task, wid))
+                    break
+
+
+class PoolStage:
+    """WorkerPool 기반 할당 방식 (현재 Proc_Packaging과 같음)"""
+    def __init__(self, env, n_workers, service_time, monitor=True):
+        self.env = env
+        self.pool = WorkerPool(range(n_workers), self.start)
+        self.service_time = service_time
+        self.completed = 0
+        self.monitor = IdleMonitor(env, self) if monitor else NullMonitor()
+
+    def queue_length(self):
+        return len(self.pool.queue)
+
+    def idle_workers(self):
+        return len(self.pool.free)
+
+    def seize(self, task):
+        self.monitor.update()
+        self.pool.request(task)
+
+    def start(self, worker_id, task):
+        self.env.process(self.delay(task, worker_id))
+
+    def delay(self, task, worker_id):
+        yield self.env.timeout(self.service_time)
+        self.release(worker_id)
+
+    def release(self, worker_id):
+        self.monitor.update()
+        self.completed += 1
+        self.pool.release(worker_id)
+
+
+def arrivals(env, stage, burst_sizes, interval):
+    """interval마다 burst_sizes[i]개의 작업이 한꺼번에 도착 (Drying 배치 단위 도착을 모사)"""
+    task = 0
+    for burst in burst_sizes:
+        for _ in range(burst):
+            stage.seize(task)
+            task += 1
+        yield env.timeout(interval)
+
+
+def run(stage_class, n_workers, n_tasks, seed, monitor=True):
+    rng = np.random.default_rng(seed)
+    # 평균 부하가 작업자 용량의 약 95%가 되도록 도착량 설정 (서비스 시간 1, 도착 간격 1)
+    burst_sizes = rng.poisson(0.95 * n_workers, size=max(1, int(n_tasks / (0.95 * n_workers)))).tolist()
+    env = simpy.Environment()
+    stage = stage_class(env, n_workers, service_time=1, monitor=monitor)
+    env.process(arrivals(env, stage, burst_sizes, interval=1))
+    horizon = len(burst_sizes)
+    start = time.perf_counter()
+    env.run(until=horizon)
+    elapsed = time.perf_counter() - start
+    stage.monitor.update()
+    return stage.completed, stage.monitor.idle_while_waiting, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[5, 500])
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for n_workers in args.workers:
+        print(f"workers: {n_workers}, tasks: ~{args.tasks:,}")
+        for name, stage_class in (("legacy scan", LegacyStage), ("WorkerPool", PoolStage)):
+            completed, idle, _ = run(stage_class, n_workers, args.tasks, args.seed)
+            _, _, elapsed = run(stage_class, n_workers, args.tasks, args.seed, monitor=False)
+            print(f"  {name:<12}: completed {completed:>8,} | idle while waiting {idle:10.1f} worker-h | "
+                  f"wall time {elapsed:6.2f} s")
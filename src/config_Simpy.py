@@ -100,11 +100,24 @@ COST_TYPES = {
     }
 }
 
+# 자원 한 단위의 비용 (optimizer.py에서 자원 구성을 비교할 때 사용, 시뮬레이션 비용(COST_TYPES)에는 포함되지 않음)
+# 키는 자원 설정 이름 (PRINTERS, WASHING_MACHINE 등)이며 구성의 비용은 단위 비용 × 자원 수의 합
+RESOURCE_COST = {
+    "PRINTERS": 100,
+    "WASHING_MACHINE": 30,
+    "DRY_MACHINE": 30,
+    "POST_PROCESSING_WORKER": 40,
+    "PACKAGING_MACHINE": 20
+}
+
 CUSTOMER = {
     "JOB_LIST_SIZE": 2,
      "ITEM_SIZE": 2
      }
 
+# 고객 Job 생성 간격 (시간 단위, Customer.create_jobs_continuously와 queueing_model.line_parameters에서 사용)
+JOB_ARRIVAL_INTERVAL = 5
+
 # 3D 프린터 정보 설정, VOL: WIDTH * HEIGHT * DEPTH / 단위: mm
 PRINTERS = {
     0: {"ID": 0}, 
@@ -119,6 +132,33 @@ PRINTERS_SIZE = {"VOL": 669130000, "WIDTH": 1540, "HEIGHT": 790, "DEPTH": 550, "
 
 BATCH_TIMEOUT = 1
 
+# 빌드 플레이트 nesting(packing) 설정 (packing.py)
+# ENABLED: True이면 프린터가 작업을 시작할 때 대기 중인 Job들을 디스패칭 순서대로 플레이트 하나에 들어가는 만큼 함께 배치하여 한 번에 인쇄
+#          (인쇄 시간 = 층마다 가장 긴 Item build_time의 합, False이면 기존과 같이 Job 하나씩 Item build_time 합만큼 인쇄)
+# ROTATE: True이면 Item을 가장 넓은 면이 바닥에 닿도록 눕혀서 배치
+# GAP: Item 사이 간격 (mm)
+# MAX_LAYERS: 플레이트 하나에 쌓을 최대 층 수 (None이면 PRINTERS_SIZE["HEIGHT"]까지)
+# MAX_JOBS: 한 번에 함께 배치를 시도할 대기 Job 수 상한 (None이면 대기 중인 모든 Job)
+PACKING = {
+    "ENABLED": False,
+    "ROTATE": True,
+    "GAP": 2,
+    "MAX_LAYERS": 1,
+    "MAX_JOBS": None
+}
+
+# 후처리 후 검사(Inspection)와 재작업(rework) 설정
+# DEFECT_RATE: 검사에서 Item이 불량으로 판정될 확률 (0이면 검사만 하고 불량 없음)
+# REWORK_BATCH_SIZE: 불량 Item이 이 개수만큼 모이면 재작업 Job 하나로 묶어 프린터로 보냄
+# REWORK_TIMEOUT: 재작업 Job의 첫 불량 Item 이후 이 시간이 지나면 REWORK_BATCH_SIZE에 못 미쳐도 보냄
+# REWORK_PRIORITY: True이면 재작업 Job을 DISPATCHING_RULE과 관계없이 대기 중인 일반 Job보다 먼저 인쇄
+INSPECTION = {
+    "DEFECT_RATE": 0.0,
+    "REWORK_BATCH_SIZE": 4,
+    "REWORK_TIMEOUT": 4,
+    "REWORK_PRIORITY": True
+}
+
 WASHING_MACHINE = {
     0: {"ID": 0, "WASHING_SIZE": 3},
     1: {"ID": 1, "WASHING_SIZE": 3}
@@ -152,7 +192,32 @@ DISPATCHING_RULE = {
     "EDD" : False
 }
 
-PRINT_SATISFICATION = True
+PRINT_SATISFICATION = True  # True이면 만족도 이벤트와 일별 만족도 합계를 출력 (total_satisfication KPI는 항상 계산)
 VISUALIZATION = True
 PRINT_SIM_EVENTS = True
+
+# 시뮬레이션 종료 후 Item별 전체 공정 기록(Daily_Report) 내보내기 (main.py)
+# PATH: CSV 파일 경로 (None이면 내보내지 않음, 예: "./Daily_Report.csv")
+# PARQUET: True이면 같은 이름의 .parquet 파일도 저장 (pyarrow 또는 fastparquet 필요, 없으면 경고 후 CSV만 저장)
+# GANTT: Gantt 차트 이미지 경로 (.png, .svg, .pdf, None이면 그리지 않음, VISUALIZATION이 False이면 무시)
+#        화면에 띄우지 않고 파일로만 저장하므로 디스플레이 없이 실행해도 멈추지 않음
+DAILY_REPORT = {
+    "PATH": None,
+    "PARQUET": False,
+    "GANTT": None
+}
+
+# 이벤트 로그를 메모리 대신 파일로 기록 (장기간 시뮬레이션에서 메모리 사용량을 일정하게 유지)
+# PATH: NDJSON 파일 경로 (None이면 메모리의 일별 이벤트 로그 사용)
+# MAX_BYTES: 파일 하나의 최대 크기(압축 전), 넘으면 다음 번호의 파일로 넘어감
+# COMPRESS: True이면 gzip 압축
+# BUFFER_SIZE: 한 번에 모아서 기록할 이벤트 수
+# SPILL_LOGS: True이면 ITEM_LOG, DAILY_REPORTS의 완료된 행도 하루마다 CSV 파일로 내보내고 메모리에서 제거
+EVENT_SINK = {
+    "PATH": None,
+    "MAX_BYTES": 64 * 2**20,
+    "COMPRESS": False,
+    "BUFFER_SIZE": 4096,
+    "SPILL_LOGS": False
+}
 PRINT_SIM_COST = True  # True로 설정하면 비용이 출력됨, False로 설정하면 출력되지 않음
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+import warnings
+
+import pandas as pd
+
+from log_simpy import read_log
+
+# Daily_Report의 공정별 열: (daily_reports의 process 이름, 열 이름 접두어, 담당 리소스 열, daily_reports의 리소스 ID 열)
+REPORT_STAGES = (
+    ("Printing", "PRINTING", "ASSIGNED_PRINTER", "printer_id"),
+    ("Washing", "WASHING", "ASSIGNED_WASHING_MACHINE", "machine_id"),
+    ("Drying", "DRYING", "ASSIGNED_DRY_MACHINE", "machine_id"),
+    ("Post-Processing", "POSTPROCESSING", "ASSIGNED_POSTPROCESS_WORKER", "worker_id"),
+    ("Packaging", "PACKAGING", "ASSIGNED_PACKAGING_WORKER", "worker_id"),
+)
+
+# Item 단위로 기록되는 공정 (나머지 공정은 Job 단위로 기록됨)
+ITEM_STAGES = ("Post-Processing",)
+
+REPORT_COLUMNS = ["DAY", "JOB_ID", "ITEM_ID"] + [
+    column
+    for _, prefix, resource_column, _ in REPORT_STAGES
+    for column in (resource_column, f"{prefix}_START", f"{prefix}_FINISH")
+]
+
+
+def load_daily_reports(ctx):
+    """
+    실행이 끝난 ctx의 daily_reports 전체를 DataFrame으로 반환합니다.
+    EVENT_SINK["SPILL_LOGS"]로 파일에 내보낸 행이 있으면 파일의 행과 메모리에 남은 행을 이어 붙입니다.
+    """
+    frame = ctx.daily_reports.to_frame()
+    spill = ctx.log_spills.get("daily_reports")
+    if spill is None or spill.rows == 0:
+        return frame
+    spilled = read_log(spill.path)
+    spilled["process"] = pd.Categorical(spilled["process"], categories=frame["process"].cat.categories)
+    return pd.concat([spilled, frame], ignore_index=True)
+
+
+def _stage_table(frame, process, prefix, resource_column, id_column, keys):
+    """process 공정의 행을 keys(JOB_ID 또는 JOB_ID, ITEM_ID)당 한 행인 테이블로 변환"""
+    rows = frame[frame["process"] == process]
+    table = pd.DataFrame({
+        "JOB_ID": rows["job_id"].to_numpy(),
+        "ITEM_ID": rows["item_id"].to_numpy(),
+        resource_column: rows[id_column].to_numpy(),
+        f"{prefix}_START": rows["start_time"].to_numpy(),
+        f"{prefix}_FINISH": rows["end_time"].to_numpy(),
+    })
+    return table.drop_duplicates(keys, keep="last")[keys + [resource_column, f"{prefix}_START", f"{prefix}_FINISH"]]
+
+
+def build_daily_report(daily_reports):
+    """
+    build_daily_report 함수
+    -------------------------
+    daily_reports(ColumnarLog 또는 DataFrame, 작업 하나당 한 행)를 Item당 한 행인 Daily_Report 테이블로 변환합니다.
+    Job 단위 공정(Printing, Washing, Drying, Packaging)은 JOB_ID로, Item 단위 공정(Post-Processing)은
+    (JOB_ID, ITEM_ID)로 pandas merge(hash join)하므로 기록 수에 비례하는 시간에 만들어집니다.
+    Item이 없는 Job은 ITEM_ID가 빈 값인 한 행으로 포함됩니다.
+    DAY는 Printing 시작 시각 기준 날짜(1부터)입니다.
+    """
+    frame = daily_reports.to_frame() if hasattr(daily_reports, "to_frame") else daily_reports
+    report = pd.DataFrame({"JOB_ID": pd.unique(frame["job_id"])})
+
+    for process, prefix, resource_column, id_column in REPORT_STAGES:
+        if process in ITEM_STAGES:
+            continue
+        table = _stage_table(frame, process, prefix, resource_column, id_column, ["JOB_ID"])
+        report = report.merge(table, on="JOB_ID", how="left")
+
+    # Item 단위 공정: Job 행을 Item 수만큼 펼침
+    items = None
+    for process, prefix, resource_column, id_column in REPORT_STAGES:
+        if process not in ITEM_STAGES:
+            continue
+        table = _stage_table(frame, process, prefix, resource_column, id_column, ["JOB_ID", "ITEM_ID"])
+        items = table if items is None else items.merge(table, on=["JOB_ID", "ITEM_ID"], how="outer")
+    report = report.merge(items, on="JOB_ID", how="left")
+
+    report["DAY"] = report["PRINTING_START"] // 24 + 1
+    id_columns = ["DAY", "JOB_ID", "ITEM_ID"] + [resource_column for _, _, resource_column, _ in REPORT_STAGES]
+    for column in id_columns:
+        # 기록이 없는 칸(-1 또는 NaN)은 빈 값으로 두고 정수 열로 유지
+        values = report[column].astype("Int64")
+        report[column] = values.mask((values < 0).fillna(False))
+    return report[REPORT_COLUMNS].sort_values(["JOB_ID", "ITEM_ID"], ignore_index=True)
+
+
+def write_daily_report(report, path="./Daily_Report.csv", parquet=False):
+    """
+    Daily_Report를 CSV로 저장하고, parquet=True이면 같은 이름의 .parquet 파일도 저장합니다.
+    Parquet 엔진(pyarrow 또는 fastparquet)이 설치되어 있지 않으면 경고(RuntimeWarning)를 내고 Parquet 파일은 건너뜁니다.
+    반환값: 저장한 파일 경로 리스트
+    """
+    report.to_csv(path, index=False)
+    paths = [path]
+    if parquet:
+        parquet_path = os.path.splitext(path)[0] + ".parquet"
+        try:
+            report.to_parquet(parquet_path, index=False)
+        except ImportError:
+            warnings.warn("Parquet export skipped: install pyarrow or fastparquet", RuntimeWarning, stacklevel=2)
+        else:
+            paths.append(parquet_path)
+    return paths
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build Daily_Report from a spilled daily_reports CSV log")
+    parser.add_argument("log", help="daily_reports CSV written with EVENT_SINK['SPILL_LOGS'] (e.g. events.daily_reports.csv)")
+    parser.add_argument("--out", default="Daily_Report.csv")
+    parser.add_argument("--parquet", action="store_true", help="also write a .parquet file (needs pyarrow or fastparquet)")
+    args = parser.parse_args()
+
+    report = build_daily_report(read_log(args.log))
+    paths = write_daily_report(report, args.out, args.parquet)
+    print(f"{len(report):,} rows -> {', '.join(paths)}")
@@ -1,58 +1,103 @@
+from heapq import heappop, heappush, nsmallest
+from itertools import count
+
+import simpy
+
+#### 디스패칭 규칙 ############################################################
+# 각 규칙은 job을 받아 정렬 키를 반환하는 함수이며, 키가 작은 job이 먼저 처리됩니다.
+# 키가 같으면 먼저 들어온 job이 먼저 처리됩니다.
+
+def job_build_time(job):
+    """job에 포함된 item들의 build_time 합 (build_time이 없으면 기본값 1)"""
+    return sum(item.build_time if item.build_time is not None else 1 for item in job.items)
+
+def job_due_date(job):
+    """job에 포함된 item 중 가장 이른 due_date (없으면 job 생성 시각)"""
+    due_dates = [item.due_date for item in job.items if item.due_date is not None]
+    return min(due_dates) if due_dates else job.create_time
+
+DISPATCHING_KEYS = {
+    "FIFO": lambda job: job.create_time,        # 먼저 생성된 job 우선
+    "LIFO": lambda job: -job.create_time,       # 나중에 생성된 job 우선
+    "SPT": job_build_time,                      # build_time이 짧은 job 우선
+    "LPT": lambda job: -job_build_time(job),    # build_time이 긴 job 우선
+    "EDD": job_due_date,                        # due_date가 이른 job 우선
+}
+
+def get_dispatching_key(dispatching_rule):
+    """
+    config_Simpy.DISPATCHING_RULE({"FIFO": False, "SPT": True, ...})에서
+    True로 설정된 규칙의 키 함수를 반환합니다. (True가 없으면 FIFO)
+    """
+    selected = [rule for rule, enabled in dispatching_rule.items() if enabled]
+    if len(selected) > 1:
+        raise ValueError(f"Only one dispatching rule can be enabled: {selected}")
+    rule = selected[0] if selected else "FIFO"
+    if rule not in DISPATCHING_KEYS:
+        raise ValueError(f"Unknown dispatching rule: {rule}")
+    return DISPATCHING_KEYS[rule]
+
+
 def FIFO(next_process_job):
-    n = len(next_process_job)
-    for job1 in range(n-1):
-        least = job1
-        for job2 in range(job1+1, n):
-            # 각 job 객체에 대해 create_time 속성을 비교
-            if next_process_job[job2].create_time < next_process_job[least].create_time:
-                # 최소 항목 갱신
-                least = job2
-        # create_time에 따라 job의 순서교환
-        next_process_job[job1], next_process_job[least] = next_process_job[least], next_process_job[job1]
+    next_process_job.sort(key=DISPATCHING_KEYS["FIFO"])
     return next_process_job
 
 def LIFO(next_process_job):
-    n = len(next_process_job)
-    for job1 in range(n - 1):
-        most = job1
-        for job2 in range(job1 + 1, n):
-            # 각 job 객체에 대해 create_time 속성을 비교하여
-            # 더 늦게 생성된 (create_time 값이 큰) job을 찾는다.
-            if next_process_job[job2].create_time > next_process_job[most].create_time:
-                most = job2
-        # create_time에 따라 job의 순서를 교환
-        next_process_job[job1], next_process_job[most] = next_process_job[most], next_process_job[job1]
+    next_process_job.sort(key=DISPATCHING_KEYS["LIFO"])
     return next_process_job
 
 def SPT(next_process_job):
     """Shortest Processing Time (build_time이 가장 짧은 순으로 정렬)"""
-    n = len(next_process_job)
-    for i in range(n - 1):
-        least = i
-        for j in range(i + 1, n):
-            if next_process_job[j].build_time < next_process_job[least].build_time:
-                least = j
-        next_process_job[i], next_process_job[least] = next_process_job[least], next_process_job[i]
+    next_process_job.sort(key=DISPATCHING_KEYS["SPT"])
     return next_process_job
 
 def LPT(next_process_job):
     """Longest Processing Time (build_time이 가장 긴 순으로 정렬)"""
-    n = len(next_process_job)
-    for i in range(n - 1):
-        most = i
-        for j in range(i + 1, n):
-            if next_process_job[j].build_time > next_process_job[most].build_time:
-                most = j
-        next_process_job[i], next_process_job[most] = next_process_job[most], next_process_job[i]
+    next_process_job.sort(key=DISPATCHING_KEYS["LPT"])
     return next_process_job
 
 def EDD(next_process_job):
     """Earliest Due Date (due_date가 가장 임박한 순으로 정렬)"""
-    n = len(next_process_job)
-    for i in range(n - 1):
-        earliest = i
-        for j in range(i + 1, n):
-            if next_process_job[j].due_date < next_process_job[earliest].due_date:
-                earliest = j
-        next_process_job[i], next_process_job[earliest] = next_process_job[earliest], next_process_job[i]
-    return next_process_job
\ No newline at end of file
+    next_process_job.sort(key=DISPATCHING_KEYS["EDD"])
+    return next_process_job
+
+
+class DispatchStore(simpy.Store):
+    """
+    DispatchStore 클래스
+    ---------------------
+    디스패칭 규칙의 키 함수 순서대로 job을 꺼내주는 SimPy Store
+    job을 넣을 때 (job.priority, 키, 입력 순번, job)을 힙에 저장하므로 put/get이 모두 O(log n)입니다.
+    job.priority가 작은 job(재작업 Job 등)은 디스패칭 규칙과 관계없이 먼저 꺼내집니다.
+    self.items에는 힙 항목(튜플)이 저장되며, 대기 중인 job 목록은 jobs()로 확인합니다.
+    """
+    def __init__(self, env, key=DISPATCHING_KEYS["FIFO"], capacity=float('inf')):
+        super().__init__(env, capacity)
+        self.key = key
+        self._sequence = count()
+
+    def _do_put(self, event):
+        if len(self.items) < self._capacity:
+            job = event.item
+            heappush(self.items, (job.priority, self.key(job), next(self._sequence), job))
+            event.succeed()
+        return None
+
+    def _do_get(self, event):
+        if self.items:
+            event.succeed(heappop(self.items)[-1])
+        return None
+
+    def peek(self, n=None):
+        """대기 중인 job 중 디스패칭 순서로 앞의 n개 (None이면 전부, 꺼내지 않음)"""
+        if n is None or n >= len(self.items):
+            return [entry[-1] for entry in sorted(self.items)]
+        return [entry[-1] for entry in nsmallest(n, self.items)]
+
+    def pop(self, n):
+        """디스패칭 순서로 앞의 n개 job을 바로 꺼냄 (대기 중인 get 요청 없이 여러 job을 한 번에 가져갈 때 사용)"""
+        return [heappop(self.items)[-1] for _ in range(min(n, len(self.items)))]
+
+    def jobs(self):
+        """대기 중인 job들을 디스패칭 순서대로 반환"""
+        return [entry[-1] for entry in sorted(self.items)]
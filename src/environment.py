@@ -1,9 +1,43 @@
+from collections import deque
+from heapq import heappop, heappush
+
 import simpy
 import numpy as np
-from config_Simpy import *  # 설정 파일 (JOB_TYPES, PRINTERS, PRINTERS_INVEN 등)
-from log_simpy import *  # 로그 파일 (DAILY_EVENTS 등)
+from config_Simpy import *  # 설정 파일 기본값 (실행 중에는 ctx.config 사용)
 from dispatching_method import *
+from log_simpy import *  # 이벤트 코드 (EV_*)
+from packing import fit_prefix, plate_dimensions
+from station_stats import ReworkStats, StationStats
 import time
+
+
+class DayBoundary(simpy.Timeout):
+    """
+    DayBoundary 클래스
+    --------------------
+    delay 시간 후에 URGENT 우선순위로 처리되는 Timeout (Display의 하루 경계 표시용)
+    simpy.Timeout과 같지만 NORMAL 대신 URGENT 우선순위로 예약되므로 같은 시각의 다른 이벤트보다 먼저 처리됩니다.
+    SimPy는 Timeout의 우선순위를 지정하는 공개 API가 없으므로 simpy 4.1.2의 Timeout.__init__ 초기화를 그대로 옮겨
+    우선순위만 바꿨습니다. (SimPy를 올릴 때는 Timeout.__init__이 설정하는 속성이 같은지 확인해야 하며,
+    이러한 내부 속성 접근은 이 클래스에만 둡니다)
+
+    매개변수:
+        env: SimPy 환경 객체
+        delay: 현재 시각부터 경계까지의 시간
+        value: 이벤트 값 (기본값 None)
+    """
+    def __init__(self, env, delay, value=None):
+        if delay < 0:
+            raise ValueError(f"Negative delay {delay}")
+        # simpy 4.1.2 Timeout.__init__과 같은 초기화 (Timeout.__init__은 NORMAL로 예약하므로 호출하지 않음)
+        self.env = env
+        self.callbacks = []
+        self._value = value
+        self._delay = delay
+        self._ok = True
+        env.schedule(self, simpy.events.URGENT, delay)
+
+
 # Display 클래스: 시뮬레이션 시간(일 단위)을 추적하고 일별 보고서를 기록
 # Display 클래스: 시뮬레이션 시간(일 단위)을 추적하고 일별 보고서를 기록
 class Display:
@@ -11,8 +45,10 @@ class Display:
     Display 클래스
     ----------------
     시뮬레이션 시간(일 단위)을 추적하고, 매일 발생하는 이벤트와 보고서를 daily_events 리스트에 기록하는 역할
+    하루가 끝날 때마다 등록된 day-end 훅(일별 출력, 비용 정산, 스냅샷 등)을 호출하므로,
+    하루 단위로 env.run()을 끊어 실행하지 않고 한 번의 env.run()으로 전체 기간을 실행할 수 있습니다.
     """
-    def __init__(self, env, daily_events):
+    def __init__(self, env, ctx):
         """
         __init__ 메서드 (생성자)
         -------------------------
@@ -21,26 +57,53 @@ class Display:
         
         매개변수:
             env: SimPy 환경 객체
-            daily_events: 일별 이벤트 로그 리스트
+            ctx: 실행 단위 상태(SimContext) 객체, ctx.daily_events를 일별 이벤트 로그로 사용
         """
         self.env = env
-        self.daily_events = daily_events
+        self.ctx = ctx
+        self.daily_events = ctx.daily_events
+        self.day = 0                  # 현재 진행 중인 일(day), track_days() 호출 시 1부터 시작
+        self.day_start_time = 0       # 현재 일이 시작된 시각
+        self.day_end_hooks = []       # 하루가 끝날 때 hook(day) 형태로 호출할 함수 목록
+
+    def add_day_end_hook(self, hook):
+        """하루가 끝날 때마다 hook(day)를 호출하도록 등록 (등록 순서대로 호출)"""
+        self.day_end_hooks.append(hook)
 
     def track_days(self):
         """
         track_days 메서드
         --------------------
-        현재 시뮬레이션 시간을 일(day) 단위로 계산하여, 매 24시간(1일)마다 일별 보고서 제목을 daily_events에 기록
+        1일차 보고서 제목을 daily_events에 기록하고, 첫 번째 일(day) 경계를 예약합니다.
         
         동작:
-            - 현재 시간을 24로 나누어 일(day)을 계산
-            - 계산된 day를 이용해 보고서 제목 문자열을 daily_events 리스트에 추가
-            - 24시간 후에 다시 실행되도록 대기(timeout)
+            - 별도의 SimPy 프로세스 없이 24시간마다 경계 이벤트를 URGENT 우선순위로 예약
+              (같은 시각의 다른 이벤트보다 먼저 처리되므로, 하루 단위로 run(until=...)하던 것과 같은 시점에 호출됨)
+            - 경계 이벤트에서 day-end 훅을 호출한 뒤 다음 일의 보고서 제목을 기록
         """
-        while True:
-            day = int(self.env.now // 24) + 1  # 현재 시뮬레이션 시간을 일 단위로 계산
-            self.daily_events.append(f"\n===== Day {day} Report: =====")  # 일별 보고서 제목 추가
-            yield self.env.timeout(24)  # 24시간(1일)마다 실행
+        self.day = int(self.env.now // 24) + 1  # 현재 시뮬레이션 시간을 일 단위로 계산
+        self.day_start_time = self.env.now
+        self.daily_events.record(EV_DAY_HEADER, self.env.now, self.day)  # 일별 보고서 제목 추가
+        self._schedule_boundary()
+
+    def _schedule_boundary(self):
+        DayBoundary(self.env, 24).callbacks.append(self._on_boundary)  # 24시간(1일) 후
+
+    def _on_boundary(self, event):
+        self._end_day()
+        self.day += 1
+        self.day_start_time = self.env.now
+        self.daily_events.record(EV_DAY_HEADER, self.env.now, self.day)  # 다음 일 보고서 제목 추가
+        self._schedule_boundary()
+
+    def _end_day(self):
+        for hook in self.day_end_hooks:
+            hook(self.day)
+
+    def finish(self):
+        """시뮬레이션이 하루 중간에 끝났을 때 마지막 (부분) 일에 대한 day-end 훅을 호출"""
+        if self.env.now > self.day_start_time:
+            self._end_day()
 
 
 # Job 클래스: 전문 job(작업)의 속성을 정의
@@ -49,8 +112,13 @@ class Job:
     Job 클래스
     ----------------
     전문 job(작업)의 속성을 정의하는 클래스
-    각 Job은 여러 Item(구 job)을 포함할 수 있으며, 생성 시점, 제작 시간(job_build_time), 그리고 워싱 시간(pallet_washing_time) 등을 설정
+    각 Job은 여러 Item(구 job)을 포함할 수 있으며, 생성 시점, 공정별 처리 시간(job_build_time, washing_time, drying_time, packaging_time), 현재 단계 등을 기록
+    대량의 Job을 다루기 위해 __slots__로 모든 속성을 미리 선언합니다. (인스턴스 __dict__ 없음)
     """
+    __slots__ = ("job_id", "items", "create_time", "build_time", "job_build_time", "washing_time",
+                 "drying_time", "completed_postprocessing", "packaging_time", "stage", "priority", "rework",
+                 "open_items")
+
     def __init__(self, job_id, items, create_time):
         """
         __init__ 메서드 (생성자)
@@ -58,8 +126,16 @@ class Job:
         self.job_id: Job의 고유 식별자(ID)입니다.
         self.items: 이 Job에 포함될 Item(구 Job)들의 리스트로, 초기에는 빈 리스트로 시작
         self.create_time: Job이 생성된 시점을 기록합니다.
-        self.job_build_time: Job의 인쇄(제작) 시간으로, 현재 고정값 1로 설정
-        self.pallet_washing_time: Job의 세척(워싱) 시간으로, JOB_TYPES["DEFAULT"]["WASHING_RANGE"] 내의 무작위 정수로 결정
+        self.build_time: 사용하지 않는 예약 속성 (None)
+        self.job_build_time: Job의 인쇄(제작) 시간으로, Proc_Build.seize에서 Item build_time의 합으로 설정
+        self.washing_time: Job의 세척(워싱) 시간으로, 세척 공정에서 설정 (생성 시 None)
+        self.drying_time: Job의 건조 시간으로, 건조 공정에서 설정 (생성 시 None)
+        self.completed_postprocessing: 후처리가 끝난 Item 수
+        self.packaging_time: Job의 포장 시간으로, 포장 공정에서 설정 (생성 시 None)
+        self.stage: 현재 공정 단계 (FlowTracker가 관리)
+        self.priority: printer_store 우선순위 (작을수록 먼저)
+        self.rework: 재작업 Job 여부
+        self.open_items: 고객 주문 Job의 Item 중 아직 포장(배송)되지 않은 Item 수 (Customer가 설정, 재작업 Job은 0)
         
         매개변수:
             job_id: 생성될 Job의 ID
@@ -69,11 +145,97 @@ class Job:
         self.job_id = job_id
         self.items = items  # 전문 job에 포함된 Item(구 Job) 리스트 (초기에는 빈 리스트)
         self.create_time = create_time  # 전문 job 생성 시점
-        self.build_time = None       
-        self.washing_time = None     
+        self.build_time = None
+        self.job_build_time = None  # Proc_Build.seize에서 item build_time 합으로 설정
+        self.washing_time = None
         self.drying_time = None
-        self.completed_postprocessing = 0  # 후처리 완료된 Item 수      
-        self.packaging_time = None 
+        self.completed_postprocessing = 0  # 후처리 완료된 Item 수
+        self.packaging_time = None
+        self.stage = None  # 현재 공정 단계 (FlowTracker가 관리)
+        self.priority = 0  # printer_store 우선순위 (작을수록 먼저, 재작업 Job은 REWORK_PRIORITY에 따라 -1)
+        self.rework = False  # 검사에서 불량 판정된 Item을 다시 인쇄하는 재작업 Job 여부
+        self.open_items = 0  # 아직 배송되지 않은 주문 Item 수 (0이 되면 Satisfication.deliver가 만족도 기록)
+
+
+class FlowTracker:
+    """
+    FlowTracker 클래스
+    -------------------
+    공정 안에 남아있는(in-flight) Job/Item 수를 단계별로 관리하는 객체
+    각 공정은 Job을 다음 단계로 넘길 때 move()를, 포장이 끝나면 leave()를 호출합니다.
+    Job 생성이 끝난(close_arrivals) 뒤 마지막 Job이 Proc_Packaging을 떠나는 순간 drained 이벤트가 발생하므로,
+    전체 파이프라인을 매일 훑지 않고도 정확한 종료 시점을 알 수 있습니다.
+    재작업 Job은 불량 Item을 모으는 동안 "Rework" 단계에 있으며, 모으는 중인 재작업 Job이 남아있으면 drained되지 않습니다.
+    """
+    STAGES = ("Customer", "Printing", "Washing", "Drying", "PostProcessing", "Packaging", "Rework")
+
+    def __init__(self, env):
+        self.env = env
+        self.jobs_in_flight = 0
+        self.items_in_flight = 0
+        self.jobs = {}                # 공정 안에 있는 Job (dict를 순서가 있는 집합으로 사용, 들어온 순서)
+        self.rework_jobs = {}         # 공정 안에 있는 재작업 Job (Item이 이전 Job들에서 옮겨오므로 따로 관리)
+        self.last_exit_time = 0       # 마지막으로 Job이 공정을 떠난 시각
+        self.stage_counts = dict.fromkeys(self.STAGES, 0)  # 단계별 Job 수
+        self.arrivals_closed = False
+        self.drained = env.event()   # 마지막 Job이 포장을 마치면 발생하는 이벤트
+
+    @property
+    def is_drained(self):
+        return self.drained.triggered
+
+    def enter(self, job, stage="Customer"):
+        """새 Job이 공정에 들어옴"""
+        self.jobs_in_flight += 1
+        self.items_in_flight += len(job.items)
+        self.jobs[job] = None
+        if job.rework:
+            self.rework_jobs[job] = None
+        job.stage = stage
+        self.stage_counts[stage] += 1
+
+    def move(self, job, stage):
+        """Job이 다음 공정 단계로 이동"""
+        self.stage_counts[job.stage] -= 1
+        job.stage = stage
+        self.stage_counts[stage] += 1
+
+    def leave(self, job):
+        """Job이 포장을 마치고 공정을 떠남"""
+        self.stage_counts[job.stage] -= 1
+        job.stage = None
+        self.jobs_in_flight -= 1
+        self.items_in_flight -= len(job.items)
+        del self.jobs[job]
+        self.rework_jobs.pop(job, None)
+        self.last_exit_time = self.env.now
+        self._check_drained()
+
+    def open_log_index(self):
+        """
+        아직 공정 안에 있는 Item 중 가장 작은 item_log 행 번호 (없으면 None)
+        이 행 번호보다 앞의 item_log 행은 더 이상 수정되지 않습니다.
+        재작업 Job의 Item은 나중에 생성된 Job에 들어있어도 행 번호가 작을 수 있으므로 함께 확인합니다.
+        """
+        open_index = None
+        for job in self.jobs:
+            if job.items and not job.rework:
+                open_index = min(item.log_index for item in job.items)
+                break
+        for job in self.rework_jobs:
+            for item in job.items:
+                if open_index is None or item.log_index < open_index:
+                    open_index = item.log_index
+        return open_index
+
+    def close_arrivals(self):
+        """더 이상 새 Job이 생성되지 않음"""
+        self.arrivals_closed = True
+        self._check_drained()
+
+    def _check_drained(self):
+        if self.arrivals_closed and self.jobs_in_flight == 0 and not self.drained.triggered:
+            self.drained.succeed(self.env.now)
 
 
 # Customer 클래스: 지속적으로 전문 job(작업)을 생성
@@ -85,7 +247,7 @@ class Customer:
     고객은 정해진 간격으로 Job을 생성하고, 각 Job에 대해 여러 Item을 추가하며,
     조건에 따라 생성된 Job들을 임시 리스트에 저장 후 일정 수가 쌓이면 printer_store에 전달
     """
-    def __init__(self, env, shortage_cost, daily_events, satisfication, printer_store):
+    def __init__(self, env, shortage_cost, ctx, satisfication, printer_store):
         """
         __init__ 메서드 (생성자)
         -------------------------
@@ -97,22 +259,33 @@ class Customer:
         self.satisfication: 고객 만족도 계산을 위한 객체
         self.printer_store: 생성된 Job들을 저장할 SimPy Store 객체
         self.temp_job_list: 생성된 Job들을 임시로 저장하는 리스트로, 일정 개수가 누적되면 printer_store에 전달
+        self.item_sampler: Item의 크기(높이, 너비, 깊이), 부피, 프린터 적합 여부를 블록 단위로 생성하는 샘플러
         
         매개변수:
             env: SimPy 환경 객체
             shortage_cost: 부족 비용 단위
-            daily_events: 일별 이벤트 로그 리스트
+            ctx: 실행 단위 상태(SimContext) 객체 (설정, 로그, Item 크기 난수 스트림 rng_streams["geometry"])
             satisfication: 고객 만족도 계산 객체
             printer_store: Job들을 저장할 SimPy Store 객체
         """
         self.env = env
-        self.daily_events = daily_events
+        self.ctx = ctx
+        self.daily_events = ctx.daily_events
         self.current_item_id = 0   # 새 Item(구 Job) ID 생성에 사용
         self.current_job_id = 0    # 새 전문 job(구 Order) ID 생성에 사용
         self.unit_shortage_cost = shortage_cost
         self.satisfication = satisfication
         self.printer_store = printer_store
         self.temp_job_list = []  # 누적된 전문 job들을 임시로 저장
+        # Item 크기를 블록 단위로 미리 뽑아두는 샘플러
+        self.item_sampler = ItemSampler(ctx.config.JOB_TYPES["DEFAULT"], ctx.config.PRINTERS_SIZE,
+                                        ctx.rng_streams["geometry"])
+
+    def next_job_id(self):
+        """새 전문 job의 ID를 발급 (재작업 Job도 같은 ID 체계를 사용)"""
+        job_id = self.current_job_id
+        self.current_job_id += 1
+        return job_id
 
     def create_jobs_continuously(self):
         """
@@ -125,72 +298,74 @@ class Customer:
             - 각 Job 생성 시, 현재 시간을 기반으로 일(day)을 계산하고, Job 생성 이벤트를 daily_events에 기록
             - 각 Job 내부에 CUSTOMER["ITEM_SIZE"] 만큼의 Item을 생성하고, 각 Item에 대해 사이즈 조건을 확인하여 적절히 할당하거나 부족 상황을 기록
             - 생성된 Job은 임시 리스트(temp_job_list)에 저장되며, 리스트 크기가 CUSTOMER["JOB_LIST_SIZE"]에 도달하면 printer_store에 일괄 전달한 후 리스트를 초기화
-            - 각 Job 생성 후 일정 간격(interval, 여기서는 5시간) 동안 대기
+            - 각 Job 생성 후 JOB_ARRIVAL_INTERVAL(기본 5시간) 동안 대기
         """
         while True:
-            if self.env.now >= SIM_TIME * 24:
+            if self.env.now >= self.ctx.config.SIM_TIME * 24:
+                # 시뮬레이션 기간이 끝나면 JOB_LIST_SIZE에 못 미쳐 남아있는 job도 printer_store에 넣음
+                # (남겨두면 잔여 작업 처리 루프가 끝나지 않음)
+                for job_obj in self.temp_job_list:
+                    self.ctx.flow.move(job_obj, "Printing")
+                    self.ctx.station_stats["Printing"].arrive(job_obj)
+                    self.printer_store.put(job_obj)
+                self.temp_job_list.clear()
+                self.ctx.flow.close_arrivals()
                 break
 
             day = int(self.env.now // 24) + 1
 
             # 고객이 전문 job 객체 생성 (빈 Item 리스트와 함께)
-            new_job = Job(self.current_job_id, [], self.env.now)
-            self.current_job_id += 1
-            self.daily_events.append(
-                f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Job {new_job.job_id} created at time {new_job.create_time:.2f}."
-            )
+            new_job = Job(self.next_job_id(), [], self.env.now)
+            self.daily_events.record(EV_JOB_CREATED, self.env.now, new_job.job_id)
 
             # 전문 job 내부에서 CUSTOMER["ITEM_SIZE"]만큼 Item 생성 후 추가
-            for _ in range(CUSTOMER["ITEM_SIZE"]):
-                item = Item(self.env, self.current_item_id, JOB_TYPES["DEFAULT"], job_id=new_job.job_id)
+            # (크기와 프린터 적합 여부는 ItemSampler가 미리 뽑아둔 값을 사용)
+            for height, width, depth, volume, fits_printer in self.item_sampler.take(self.ctx.config.CUSTOMER["ITEM_SIZE"]):
+                # 각 Item은 소속된 Job(new_job) 참조를 가짐
+                item = Item(self.current_item_id, self.env.now, height, width, depth, volume, job=new_job)
                 self.current_item_id += 1
-                item.job = new_job  # 각 Item이 소속된 Job 참조 추가
-
-                # JOB_LOG (이제 ITEM_LOG) 기록: 부모 전문 job의 ID와 생성된 Item의 ID 기록
-                ITEM_LOG.append({
-                    'day': day,
-                    'job_id': new_job.job_id,   # 전문 job의 ID
-                    'item_id': item.item_id,      # 생성된 Item의 ID
-                    'width': item.width,
-                    'height': item.height,
-                    'depth': item.depth,
-                    'create_time': item.create_time,
-                    'volume': item.volume,
-                    'build_time': item.build_time,
-                    'post_processing_time': item.post_processing_time,
-                })
-                
-                # ITEM 객체에 자신의 로그 인덱스 저장
-                item.log_index = len(ITEM_LOG) - 1
+
+                # JOB_LOG (이제 ctx.item_log) 기록: 부모 전문 job의 ID와 생성된 Item의 ID 기록
+                # ITEM 객체에 자신의 로그 인덱스(append가 반환한 행 번호) 저장
+                item.log_index = self.ctx.item_log.append(
+                    day=day,
+                    job_id=new_job.job_id,   # 전문 job의 ID
+                    item_id=item.item_id,      # 생성된 Item의 ID
+                    width=item.width,
+                    height=item.height,
+                    depth=item.depth,
+                    create_time=item.create_time,
+                    volume=item.volume,
+                    build_time=item.build_time,
+                    post_processing_time=item.post_processing_time,
+                )
 
                 # 생성된 Item이 프린터 크기 조건에 부합하면 Job에 추가, 아니면 부족 처리
-                if (item.width <= PRINTERS_SIZE["WIDTH"] and
-                    item.height <= PRINTERS_SIZE["HEIGHT"] and
-                    item.depth <= PRINTERS_SIZE["DEPTH"]):
+                if fits_printer:
                     new_job.items.append(item)
                 
                 else:
-                    self.daily_events.append(f"Item {item.item_id} could not be assigned: No suitable printer available (Item size: {item.volume:.2f})")
+                    self.daily_events.record(EV_ITEM_UNASSIGNED, self.env.now, item.item_id, item.volume)
                     item.shortage = 1
-                    if PRINT_SIM_COST:
-                        Cost.cal_cost(item, "Shortage cost")
-                    if PRINT_SATISFICATION:
-                        self.satisfication.cal_satisfication(item, self.env.now)
+                    if self.ctx.config.PRINT_SIM_COST:
+                        Cost.cal_cost(self.ctx, item, "Shortage cost")
+                    self.satisfication.cal_satisfication(item, self.env.now)
+            new_job.open_items = len(new_job.items)
             
             # 생성된 전문 job을 임시 리스트에 추가
             self.temp_job_list.append(new_job)
+            self.ctx.flow.enter(new_job)
 
             # 일정 수의 전문 job이 쌓이면 printer_store에 넣음
-            if len(self.temp_job_list) >= CUSTOMER["JOB_LIST_SIZE"]:
-                self.daily_events.append(
-                    f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - {len(self.temp_job_list)} jobs accumulated. Sending batch to printer."
-                )
+            if len(self.temp_job_list) >= self.ctx.config.CUSTOMER["JOB_LIST_SIZE"]:
+                self.daily_events.record(EV_JOBS_SENT, self.env.now, len(self.temp_job_list))
                 for job_obj in self.temp_job_list:
+                    self.ctx.flow.move(job_obj, "Printing")
+                    self.ctx.station_stats["Printing"].arrive(job_obj)
                     self.printer_store.put(job_obj)
                 self.temp_job_list.clear()
 
-            interval = 5
-            yield self.env.timeout(interval)
+            yield self.env.timeout(self.ctx.config.JOB_ARRIVAL_INTERVAL)
 
 # Printer 클래스: 프린터의 작업 처리
 class Proc_Build:
@@ -198,12 +373,14 @@ class Proc_Build:
     프린터 작업 처리 클래스
     전문 job을 받아서 세 단계(자원 할당/세팅 → 인쇄 → 마무리)로 처리한 후,
     워싱 머신으로 전달하는 역할.
+    PACKING["ENABLED"]이면 프린터가 작업을 시작할 때마다 대기 중인 Job들을 디스패칭 순서대로
+    빌드 플레이트 하나에 들어가는 만큼 함께 배치(packing.fit_prefix)하여 한 번에 인쇄합니다.
     """
-    def __init__(self, env, printing_cost, daily_events, printer_id, washing_machine, printer_store, washing_store):
+    def __init__(self, env, printing_cost, ctx, printer_id, washing_machine, printer_store, washing_store):
         """
         생성자 (__init__)
         env: SimPy 환경 객체 (시뮬레이션 시간 및 이벤트 관리)
-        daily_events: 일별 이벤트 로그 리스트 (이벤트 기록용)
+        ctx: 실행 단위 상태(SimContext) 객체 (설정, 로그)
         printer_id: 프린터의 고유 식별자
         washing_machine: 인쇄 완료 후 job을 전달할 워싱 머신 객체
         unit_printing_cost: 인쇄 비용 단위
@@ -211,51 +388,82 @@ class Proc_Build:
         washing_store: washing클래스에서 job을 받는 SimPy Store 객체체
         """
         self.env = env                          # SimPy 환경, 시간 관리
-        self.daily_events = daily_events        # 이벤트 로그 저장 리스트
+        self.ctx = ctx                          # 실행 단위 상태 (설정, 로그)
+        self.daily_events = ctx.daily_events    # 이벤트 로그 저장 리스트
         self.printer_id = printer_id            # 프린터 식별자
         self.is_busy = False                    # 프린터 사용 상태 (초기: 미사용)
         self.washing_machine = washing_machine  # 워싱 머신 객체 (인쇄 후 job 전달용)
         self.unit_printing_cost = printing_cost # 인쇄 비용 단위
         self.printer_store = printer_store      # printer job 저장 store
         self.washing_store = washing_store      # washing job 저장 store
-
+        self.stats = ctx.station_stats["Printing"]  # Printing 단계 KPI (모든 프린터가 공유)
+        self.packing = ctx.config.PACKING            # 빌드 플레이트 packing 설정
+        self.plate_size = plate_dimensions(ctx.config.PRINTERS_SIZE)
 
     def seize(self):
         """
         seize 메서드
         printer_store에서 전문 job을 받아서 delay 프로세스를 실행.
+        (PACKING["ENABLED"]이면 같은 플레이트에 함께 배치할 대기 Job들도 꺼내서 함께 인쇄)
         """
         while True:
             job = yield self.printer_store.get()
-            # 각 item의 build_time 합산하여 job.job_build_time으로 설정 (None이면 기본값 1 사용)
-            
-            total_build_time = 0
-            for item in job.items:
-                # 만약 item의 build_time이 None이 아니라면 해당 값을 사용합니다.
-                if item.build_time is not None:
-                    total_build_time += item.build_time
-                # build_time이 None이라면 기본값인 1을 더합니다.
-                else:
-                    item.build_time = 1
-                    total_build_time += item.build_time
-                    
-                # 저장해둔 log_index를 사용하여 ITEM_LOG 업데이트 (O(1) 접근)
-                if hasattr(item, 'log_index'):
-                    ITEM_LOG[item.log_index]['build_time'] = item.build_time
-
-            # 계산된 총 build_time을 job의 속성으로 할당합니다.
-            job.job_build_time = total_build_time
-            
-            
+            jobs = [job]
+            layout = None
+            if self.packing["ENABLED"]:
+                jobs, layout = self.pack_plate(job)
+
+            for job in jobs:
+                # 각 item의 build_time 합산하여 job.job_build_time으로 설정 (None이면 기본값 1 사용)
+                total_build_time = 0
+                for item in job.items:
+                    # 만약 item의 build_time이 None이 아니라면 해당 값을 사용합니다.
+                    if item.build_time is not None:
+                        total_build_time += item.build_time
+                    # build_time이 None이라면 기본값인 1을 더합니다.
+                    else:
+                        item.build_time = 1
+                        total_build_time += item.build_time
+
+                    # 저장해둔 log_index를 사용하여 ctx.item_log 업데이트 (O(1) 접근)
+                    self.ctx.item_log.update(item.log_index, 'build_time', item.build_time)
+
+                # 계산된 총 build_time을 job의 속성으로 할당합니다.
+                job.job_build_time = total_build_time
+
+            if layout is None:
+                build_time = jobs[0].job_build_time
+            else:
+                # 플레이트 인쇄 시간: 층마다 가장 긴 Item build_time의 합 (같은 층의 Item은 함께 인쇄됨)
+                build_times = [item.build_time for job in jobs for item in job.items]
+                build_time = float(layout.build_times(build_times).sum())
+                if layout.plates:
+                    self.stats.record_batch(float(layout.fill().mean()), 1)
+
             self.is_busy = True  # 주문 처리 시작
-              
-            yield self.env.process(self.delay(job))
-             
+            for job in jobs:
+                self.stats.start(job)
+            self.stats.acquire()
+
+            yield self.env.process(self.delay(jobs, build_time))
 
-    def delay(self, job):
+    def pack_plate(self, job):
         """
-        한 주문(Job)을 처리하는 프로세스.
-        주문 내 모든 Job의 build_time 합산값(order_build_time)만큼 대기하며 인쇄 작업을 모사.
+        pack_plate 메서드
+        job과 printer_store에서 대기 중인 Job들을 디스패칭 순서대로, 빌드 플레이트 하나에 들어가는 만큼 함께 배치합니다.
+        함께 배치된 대기 Job은 printer_store에서 꺼냅니다.
+        반환값: (함께 인쇄할 Job 리스트, packing.PlateLayout)
+        """
+        candidates = [job] + self.printer_store.peek(self.packing["MAX_JOBS"])
+        dims = [(item.height, item.width, item.depth) for candidate in candidates for item in candidate.items]
+        count, layout = fit_prefix(dims, [len(candidate.items) for candidate in candidates], self.plate_size,
+                                   self.packing["GAP"], self.packing["MAX_LAYERS"], self.packing["ROTATE"])
+        return [job] + self.printer_store.pop(count - 1), layout
+
+    def delay(self, jobs, build_time):
+        """
+        한 플레이트(Job 하나 또는 함께 배치된 여러 Job)를 처리하는 프로세스.
+        플레이트 인쇄 시간(build_time)만큼 대기하며 인쇄 작업을 모사.
         """
 
         """
@@ -269,11 +477,15 @@ class Proc_Build:
         """
         # Build 단계 (계산된 build_time 만큼 대기)
         start_time = self.env.now
-        self.daily_events.append(
-            f"{int(self.env.now % 24)}:{int((self.env.now % 1) * 60):02d} - Job {job.job_id} is printing on Printer {self.printer_id} for {job.job_build_time} time units."
-        )
-        yield self.env.timeout(job.job_build_time)
+        for job in jobs:
+            self.daily_events.record(EV_PRINT_START, self.env.now, job.job_id, self.printer_id, build_time)
+        yield self.env.timeout(build_time)
         end_time = self.env.now
+        # 플레이트 인쇄 시간을 Item 수 비율로 Job에 나누어 재작업 인쇄 시간 집계
+        plate_items = sum(len(job.items) for job in jobs)
+        for job in jobs:
+            share = len(job.items) / plate_items if plate_items else 0.0
+            self.ctx.rework_stats.record_print(build_time * share, job.rework)
         """
         # Closing 단계
         closing_start = self.env.now
@@ -283,11 +495,12 @@ class Proc_Build:
         yield self.env.timeout(1)
         closing_end = self.env.now
         """
-        if PRINT_SIM_COST:
-            Cost.cal_cost(job, "Printing cost")
+        if self.ctx.config.PRINT_SIM_COST:
+            # 인쇄 비용은 플레이트 인쇄 시간 기준 (Job 하나이면 job_build_time과 같음)
+            self.ctx.daily_cost_report["Printing cost"] += build_time * self.ctx.config.COST_TYPES[0]['PRINTING_COST']
 
         """
-        DAILY_REPORTS.append({
+        self.ctx.daily_reports.append({
             'order_id': job.job_id,  # job_id로 표기
             'printer_id': self.printer_id,
             'set_up_start': set_up_start,
@@ -299,26 +512,182 @@ class Proc_Build:
             'process': 'Printing'
         })
         """
-        DAILY_REPORTS.append({
-            'order_id': job.job_id,  # job_id로 표기
-            'printer_id': self.printer_id,
-            'start_time': start_time,
-            'end_time': end_time,
-            'process': 'Printing'
-        })
+        for job in jobs:
+            self.ctx.daily_reports.append(
+                process='Printing',
+                job_id=job.job_id,
+                printer_id=self.printer_id,
+                start_time=start_time,
+                end_time=end_time,
+            )
 
         # release 메서드를 호출하여 프린터 상태 해제 및 Washing 단계로 전달
-        self.release(job)
+        self.release(jobs)
         
-    def release(self, job):
+    def release(self, jobs):
         """
-        machine을 해제하고 washing_machine으로 job을 넘기는 작업.
+        machine을 해제하고 washing_machine으로 플레이트의 job들을 넘기는 작업.
         """
         self.is_busy = False
-        self.daily_events.append(
-            f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Printer {self.printer_id} is now available."
-        )
-        self.washing_store.put(job)
+        self.stats.release()
+        self.daily_events.record(EV_PRINTER_FREE, self.env.now, self.printer_id)
+        for job in jobs:
+            self.stats.finish(job)
+            self.ctx.flow.move(job, "Washing")
+            self.washing_store.put(job)
+
+class MachineIdSet:
+    """
+    가장 작은 머신 ID를 바로 꺼낼 수 있는 집합 (지연 삭제 방식의 최소 힙)
+    add/discard는 O(1) 또는 O(log n), first()는 분할 상환 O(log n)이며
+    힙에는 머신마다 최대 한 개의 항목만 존재합니다.
+    """
+    def __init__(self):
+        self.members = set()   # 현재 집합에 속한 머신 ID
+        self.heap = []         # 최소 힙 (삭제된 ID는 first() 호출 시 정리)
+        self.in_heap = set()   # 힙에 실제로 들어있는 머신 ID
+
+    def add(self, machine_id):
+        self.members.add(machine_id)
+        if machine_id not in self.in_heap:
+            self.in_heap.add(machine_id)
+            heappush(self.heap, machine_id)
+
+    def discard(self, machine_id):
+        self.members.discard(machine_id)
+
+    def first(self):
+        """가장 작은 머신 ID (비어있으면 None)"""
+        heap = self.heap
+        while heap and heap[0] not in self.members:
+            self.in_heap.discard(heappop(heap))
+        return heap[0] if heap else None
+
+
+class BatchMachineIndex:
+    """
+    BatchMachineIndex 클래스
+    -------------------------
+    Washing/Drying 머신들을 상태별로 분류해 두는 인덱스
+    - empty: busy가 아니고 배치가 비어있는 머신
+    - partial: busy가 아니고 배치가 진행 중(0 < 배치 크기 < capacity)인 머신
+    머신 상태(batch, is_busy)를 바꾼 뒤 update(machine_id)를 호출하면 분류가 갱신되므로,
+    머신을 모두 훑지 않고도 할당할 머신을 찾을 수 있습니다.
+    기존과 같이 조건을 만족하는 머신 중 ID가 가장 작은 머신이 선택됩니다.
+    """
+    def __init__(self, machines):
+        self.machines = machines
+        self.empty = MachineIdSet()
+        self.partial = MachineIdSet()
+        for machine_id in machines:
+            self.update(machine_id)
+
+    def update(self, machine_id):
+        """machines[machine_id]의 현재 상태에 맞게 분류를 갱신"""
+        machine = self.machines[machine_id]
+        size = len(machine["batch"])
+        self.empty.discard(machine_id)
+        self.partial.discard(machine_id)
+        if machine["is_busy"] or size >= machine["capacity"]:
+            return
+        if size == 0:
+            self.empty.add(machine_id)
+        else:
+            self.partial.add(machine_id)
+
+    def first_partial(self):
+        """배치가 진행 중인 머신 ID (없으면 None)"""
+        return self.partial.first()
+
+    def first_empty(self):
+        """배치가 비어있는 free 머신 ID (없으면 None)"""
+        return self.empty.first()
+
+
+class BatchTimerQueue:
+    """
+    BatchTimerQueue 클래스
+    -----------------------
+    Washing/Drying 스테이션의 배치 타임아웃 타이머를 관리하는 취소 가능한 타이머 큐
+    - 배치마다 SimPy 프로세스를 만드는 대신, 마감 시각(deadline)을 큐에 넣고
+      스테이션 전체에서 가장 이른 마감 시각에 대해서만 SimPy timeout 이벤트 하나를 예약합니다.
+    - 배치가 꽉 차서 먼저 출발하면 cancel()로 타이머를 취소하며,
+      취소된 타이머는 이벤트 큐에서 깨어나지 않고 건너뜁니다.
+    - 타임아웃 길이가 일정하므로 마감 시각은 항상 증가 순서로 들어오며, 큐는 deque로 충분합니다.
+
+    통계:
+        scheduled: 시작된 타이머 수
+        cancelled: 배치가 먼저 출발하여 취소된 타이머 수
+        expired: 마감 시각에 도달하여 on_expire가 호출된 타이머 수
+        wakeups: 실제로 예약된 SimPy timeout 이벤트 수
+        avoided_wakeups: 타이머마다 프로세스를 만들었을 때와 비교해 줄어든 깨어남 수
+    """
+    def __init__(self, env, timeout, on_expire):
+        self.env = env
+        self.timeout = timeout
+        self.on_expire = on_expire     # on_expire(machine_id): 타임아웃 시 호출
+        self.deadlines = deque()       # (마감 시각, machine_id, token)
+        self.active = {}               # machine_id -> 현재 유효한 타이머 token
+        self.armed = None              # 예약된 SimPy 이벤트가 담당하는 큐 항목
+        self.scheduled = 0
+        self.cancelled = 0
+        self.expired = 0
+        self.wakeups = 0
+
+    @property
+    def avoided_wakeups(self):
+        return self.scheduled - self.wakeups
+
+    def start(self, machine_id):
+        """machine_id의 새 배치에 대한 타이머 시작 (이전 타이머가 있으면 대체)"""
+        token = object()
+        self.active[machine_id] = token
+        self.deadlines.append((self.env.now + self.timeout, machine_id, token))
+        self.scheduled += 1
+        if self.armed is None:
+            self._arm()
+
+    def cancel(self, machine_id):
+        """machine_id의 타이머 취소 (배치가 꽉 차서 먼저 출발한 경우)"""
+        if self.active.pop(machine_id, None) is not None:
+            self.cancelled += 1
+
+    def _is_live(self, entry):
+        _, machine_id, token = entry
+        return self.active.get(machine_id) is token
+
+    def _arm(self):
+        """취소된 항목을 건너뛰고, 가장 이른 유효 마감 시각에 timeout 이벤트 하나를 예약"""
+        while self.deadlines and not self._is_live(self.deadlines[0]):
+            self.deadlines.popleft()
+        if not self.deadlines:
+            self.armed = None
+            return
+        self.armed = self.deadlines[0]
+        event = self.env.timeout(max(0, self.armed[0] - self.env.now))
+        event.callbacks.append(self._wake)
+        self.wakeups += 1
+
+    def _wake(self, event):
+        # 예약 시점의 마감 시각까지 도달한 타이머를 모두 처리 (같은 시각의 타이머는 한 번에 처리)
+        deadline = self.armed[0]
+        while self.deadlines and self.deadlines[0][0] <= deadline:
+            entry = self.deadlines.popleft()
+            if self._is_live(entry):
+                del self.active[entry[1]]
+                self.expired += 1
+                self.on_expire(entry[1])
+        self._arm()
+
+    def stats(self):
+        return {
+            "scheduled": self.scheduled,
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+            "wakeups": self.wakeups,
+            "avoided_wakeups": self.avoided_wakeups,
+        }
+
 
 class Proc_Washing:
     """
@@ -326,12 +695,14 @@ class Proc_Washing:
     - washing_store에 넣은 job들을 seize 프로세스에서 각 워싱 머신의 capacity(용량)만큼 꺼내어 배치(batch)를 구성.
     - 배치가 완성되면 delay 프로세스를 통해 한 번에 세척 작업을 진행하고, 세척 완료 후 Drying 단계로 job들을 전달.
     """
-    def __init__(self, env, washing_cost, daily_events, dry_machine, washing_store, drying_store, batch_timeout=BATCH_TIMEOUT):
+    STAGE = "Washing"
+
+    def __init__(self, env, washing_cost, ctx, dry_machine, washing_store, drying_store, batch_timeout=BATCH_TIMEOUT):
         """
         생성자 (__init__)
         :env: SimPy 환경 객체로, 시뮬레이션의 시간 흐름과 이벤트 스케줄링을 관리합니다.
         :washing_cost: 세척 비용 단위로, 비용 계산에 사용됩니다.
-        :daily_events: 일별 이벤트 로그 리스트로, 작업 진행 상황을 기록하는 데 사용됩니다.
+        :ctx: 실행 단위 상태(SimContext) 객체로, 설정값과 작업 진행 상황 로그(ctx.daily_events)를 제공합니다.
         :dry_machine: 세척 후 job들을 전달할 건조(Drying) 단계 객체입니다.
         :washing_store: Printer나 다른 프로세스에서 전달된 job들이 임시로 저장되는 Store로, 세척 작업을 위한 입력 버퍼 역할을 합니다.
         :drying_store: 건조 단계에서 사용될 Store 객체로, 세척 후 job을 전달하기 위한 별도의 저장 공간(여기서는 필요에 따라 사용 가능)
@@ -343,7 +714,8 @@ class Proc_Washing:
           - 모든 워싱 머신이 즉시 job 할당을 받지 못할 경우를 대비하여, 대기열(waiting_queue)을 초기화합니다.
         """
         self.env = env                                # SimPy 환경, 시간 관리
-        self.daily_events = daily_events              # 이벤트 로그 리스트
+        self.ctx = ctx                                # 실행 단위 상태 (설정, 로그)
+        self.daily_events = ctx.daily_events          # 이벤트 로그 리스트
         self.unit_washing_cost = washing_cost         # 세척 비용 단위
         self.dry_machine = dry_machine                # 건조 단계 객체
         self.washing_store = washing_store            # job을 저장하는 washing Store
@@ -353,15 +725,20 @@ class Proc_Washing:
         # 예를 들어, WASHING_MACHINE = { 0: {"WASHING_SIZE": 2}, 1: {"WASHING_SIZE": 2} }
         self.machines = {
             machine_id: {
-                "capacity": WASHING_MACHINE[machine_id]["WASHING_SIZE"],
+                "capacity": ctx.config.WASHING_MACHINE[machine_id]["WASHING_SIZE"],
                 "batch": [],           # 해당 머신에 할당된 job들의 리스트
                 "is_busy": False       # 현재 머신이 작업 중인지 여부
             }
-            for machine_id in WASHING_MACHINE.keys()
+            for machine_id in ctx.config.WASHING_MACHINE.keys()
         }
         
         # 모든 머신이 busy일 경우를 위한 대기열
-        self.waiting_queue = []
+        self.waiting_queue = deque()
+        # 빈 머신 / 배치가 진행 중인 머신을 바로 찾기 위한 인덱스
+        self.machine_index = BatchMachineIndex(self.machines)
+        # 배치 타임아웃 타이머 (배치가 먼저 출발하면 취소)
+        self.batch_timers = BatchTimerQueue(env, batch_timeout, self.on_batch_timeout)
+        self.stats = ctx.station_stats[self.STAGE]  # 단계 KPI (가동률, 대기열, 배치 채움 비율 등)
 
     def seize(self):
         """
@@ -371,57 +748,51 @@ class Proc_Washing:
         """
         while True:
             job = yield self.washing_store.get()
-            assigned = False
+            self.stats.arrive(job)
 
             # 먼저, 이미 배치가 진행 중인 머신에 할당 시도
-            for machine_id, machine in self.machines.items():
-                if not machine["is_busy"] and 0 < len(machine["batch"]) < machine["capacity"]:
-                    machine["batch"].append(job)
-                    self.daily_events.append(
-                        f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Job {job.job_id} assigned to Washing Machine {machine_id}. Batch: {[j.job_id for j in machine['batch']]}"
-                    )
-                    assigned = True
-                    # 배치가 꽉 찼으면 바로 처리
-                    if len(machine["batch"]) == machine["capacity"]:
-                        machine["is_busy"] = True
-                        current_batch = machine["batch"]
-                        machine["batch"] = []
-                        machine["batch_start_time"] = None
-                        self.env.process(self.delay(machine_id, current_batch))
-                    break
+            machine_id = self.machine_index.first_partial()
+            if machine_id is not None:
+                machine = self.machines[machine_id]
+                machine["batch"].append(job)
+                self.daily_events.record_batch(EV_BATCH_JOIN, self.env.now, "Washing", job.job_id, machine_id, jobs=machine["batch"])
+                # 배치가 꽉 찼으면 바로 처리
+                if len(machine["batch"]) == machine["capacity"]:
+                    machine["is_busy"] = True
+                    current_batch = machine["batch"]
+                    machine["batch"] = []
+                    machine["batch_start_time"] = None
+                    self.batch_timers.cancel(machine_id)
+                    self.env.process(self.delay(machine_id, current_batch))
+                self.machine_index.update(machine_id)
+                continue
 
             # 빈 배치인 머신에 할당
-            if not assigned:
-                for machine_id, machine in self.machines.items():
-                    if not machine["is_busy"] and len(machine["batch"]) == 0:
-                        machine["batch"].append(job)
-                        machine["batch_start_time"] = self.env.now
-                        self.daily_events.append(
-                            f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Job {job.job_id} started new batch on Washing Machine {machine_id}."
-                        )
-                        # 타임아웃 체크 프로세스 시작 (한 번만 시작)
-                        self.env.process(self.check_batch_timeout(machine_id))
-                        assigned = True
-                        break
+            machine_id = self.machine_index.first_empty()
+            if machine_id is not None:
+                machine = self.machines[machine_id]
+                machine["batch"].append(job)
+                machine["batch_start_time"] = self.env.now
+                self.daily_events.record(EV_BATCH_NEW, self.env.now, "Washing", job.job_id, machine_id)
+                # 배치 타임아웃 타이머 시작
+                self.batch_timers.start(machine_id)
+                self.machine_index.update(machine_id)
+                continue
+
             # 할당되지 않으면 대기열에 넣음
-            if not assigned:
-                self.waiting_queue.append(job)
-                self.daily_events.append(
-                    f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - All Washing Machines busy/full. Job {job.job_id} added to waiting queue."
-                )
+            self.waiting_queue.append(job)
+            self.daily_events.record(EV_BATCH_WAIT, self.env.now, "Washing", job.job_id)
     
-    def check_batch_timeout(self, machine_id):
-        """배치 시작 후 batch_timeout 시간이 지나면, 배치가 꽉 차지 않더라도 강제로 처리"""
-        yield self.env.timeout(self.batch_timeout)
+    def on_batch_timeout(self, machine_id):
+        """배치 시작 후 batch_timeout 시간이 지나면, 배치가 꽉 차지 않더라도 강제로 처리 (batch_timers에서 호출)"""
         machine = self.machines[machine_id]
         if not machine["is_busy"] and machine["batch"]:
-            self.daily_events.append(
-                f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Timeout reached on Washing Machine {machine_id}. Processing batch: {[j.job_id for j in machine['batch']]}"
-            )
+            self.daily_events.record_batch(EV_BATCH_TIMEOUT, self.env.now, "Washing", machine_id, jobs=machine["batch"])
             machine["is_busy"] = True
             current_batch = machine["batch"]
             machine["batch"] = []
             machine["batch_start_time"] = None
+            self.machine_index.update(machine_id)
             self.env.process(self.delay(machine_id, current_batch))
 
     def delay(self, machine_id, jobs_batch):
@@ -433,16 +804,26 @@ class Proc_Washing:
         """
         # 각 job에 washing_time이 없으면 기본값 1 할당
         for job in jobs_batch:
-            if not hasattr(job, "washing_time") or job.washing_time is None:
+            if job.washing_time is None:
                 job.washing_time = 1
         washing_time = sum(job.washing_time for job in jobs_batch)
-        self.daily_events.append(
-            f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Washing Machine {machine_id} starts processing batch {[job.job_id for job in jobs_batch]} for {washing_time} time units."
-        )
+        for job in jobs_batch:
+            self.stats.start(job)
+        self.stats.acquire()
+        self.stats.record_batch(len(jobs_batch), self.machines[machine_id]["capacity"])
+        self.daily_events.record_batch(EV_BATCH_START, self.env.now, "Washing", machine_id, washing_time, jobs=jobs_batch)
+        start_time = self.env.now
         yield self.env.timeout(washing_time)
-        self.daily_events.append(
-            f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Washing Machine {machine_id} finished processing batch."
-        )
+        self.daily_events.record(EV_BATCH_FINISH, self.env.now, "Washing", machine_id)
+        # 배치의 각 job에 대해 Washing 기록 (배치 전체가 같은 머신, 같은 시작/종료 시각)
+        for job in jobs_batch:
+            self.ctx.daily_reports.append(
+                process='Washing',
+                job_id=job.job_id,
+                machine_id=machine_id,
+                start_time=start_time,
+                end_time=self.env.now,
+            )
 
         # 처리 완료 후 release()를 호출하여 waiting_queue의 job 재할당 등 후처리 실행
         self.release(machine_id, jobs_batch)
@@ -459,22 +840,23 @@ class Proc_Washing:
         self.machines[machine_id]["is_busy"] = False
 
         # 세척 완료된 job들을 건조 단계로 전달
+        self.stats.release()
         for job in jobs_batch:
+            self.stats.finish(job)
+            self.ctx.flow.move(job, "Drying")
             self.drying_store.put(job)
 
         # 머신이 free이고 배치에 여유가 있을 때, waiting_queue에서 job을 가져와 배치에 추가
         while (self.waiting_queue and
             (not self.machines[machine_id]["is_busy"]) and
             (len(self.machines[machine_id]["batch"]) < self.machines[machine_id]["capacity"])):
-            waiting_job = self.waiting_queue.pop(0)
+            waiting_job = self.waiting_queue.popleft()
             self.machines[machine_id]["batch"].append(waiting_job)
-            self.daily_events.append(
-                f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - After processing, waiting Job {waiting_job.job_id} assigned to Washing Machine {machine_id}. Batch: {[j.job_id for j in self.machines[machine_id]['batch']]}"
-            )
+            self.daily_events.record_batch(EV_BATCH_REFILL, self.env.now, "Washing", waiting_job.job_id, machine_id, jobs=self.machines[machine_id]["batch"])
             # 만약 이 배치가 새로 시작되었거나 batch_start_time이 설정되지 않았다면 타이머 시작
             if self.machines[machine_id].get("batch_start_time") is None:
                 self.machines[machine_id]["batch_start_time"] = self.env.now
-                self.env.process(self.check_batch_timeout(machine_id))
+                self.batch_timers.start(machine_id)
         
         # 배치가 capacity에 도달하면 바로 처리
         if (not self.machines[machine_id]["is_busy"]) and (len(self.machines[machine_id]["batch"]) == self.machines[machine_id]["capacity"]):
@@ -483,8 +865,12 @@ class Proc_Washing:
             self.machines[machine_id]["batch"] = []
             # 배치 시작 시간 초기화 후 즉시 처리
             self.machines[machine_id]["batch_start_time"] = None
+            self.batch_timers.cancel(machine_id)
             self.env.process(self.delay(machine_id, current_batch))
 
+        # free 전환, 재할당 결과에 따라 머신 인덱스 갱신
+        self.machine_index.update(machine_id)
+
 # Drying Process 클래스: 건조 작업을 관리
 class Proc_Drying:
     """
@@ -493,12 +879,14 @@ class Proc_Drying:
     - 배치가 완성되면 delay() 메서드를 통해 한 번에 건조 작업을 진행하고,
       건조 완료 후 release()를 통해 각 job을 후속 단계(PostProcessing)로 전달하며, waiting_queue의 job들을 재할당합니다.
     """
-    def __init__(self, env, drying_cost, daily_events, post_processor, drying_store, batch_timeout=BATCH_TIMEOUT):
+    STAGE = "Drying"
+
+    def __init__(self, env, drying_cost, ctx, post_processor, drying_store, batch_timeout=BATCH_TIMEOUT):
         """
         생성자 (__init__)
         :env: SimPy 환경 객체로, 시뮬레이션의 시간 흐름과 이벤트 스케줄링을 관리합니다.
         :drying_cost: 건조 비용 단위로, 비용 계산에 사용됩니다.
-        :daily_events: 일별 이벤트 로그 리스트로, 작업 진행 상황을 기록하는 데 사용됩니다.
+        :ctx: 실행 단위 상태(SimContext) 객체로, 설정값과 작업 진행 상황 로그(ctx.daily_events)를 제공합니다.
         :post_processor: 건조 작업 완료 후 job들을 전달할 후처리(PostProcessing) 단계 객체입니다.
         :drying_store: Printer나 다른 프로세스에서 전달된 job들이 임시로 저장되는 Store로, 건조 작업을 위한 입력 버퍼 역할을 합니다.
         
@@ -509,7 +897,8 @@ class Proc_Drying:
           - 모든 건조 머신이 즉시 job 할당을 받지 못할 경우를 대비하여, 대기열(waiting_queue)을 초기화합니다.
         """
         self.env = env                                # SimPy 환경 객체
-        self.daily_events = daily_events              # 일별 이벤트 로그 리스트
+        self.ctx = ctx                                # 실행 단위 상태 (설정, 로그)
+        self.daily_events = ctx.daily_events          # 일별 이벤트 로그 리스트
         self.unit_drying_cost = drying_cost           # 건조 비용 단위
         self.post_processor = post_processor           # 후처리(PostProcessing) 객체
         self.drying_store = drying_store               # 건조 작업을 위한 입력 버퍼 역할 Store
@@ -519,15 +908,20 @@ class Proc_Drying:
         # 예: DRY_MACHINE = { 0: {"DRYING_SIZE": 3}, 1: {"DRYING_SIZE": 3} }
         self.machines = {
             machine_id: {
-                "capacity": DRY_MACHINE[machine_id]["DRYING_SIZE"],
+                "capacity": ctx.config.DRY_MACHINE[machine_id]["DRYING_SIZE"],
                 "batch": [],         # 해당 머신에 할당된 job들의 리스트
                 "is_busy": False     # 현재 머신이 작업 중인지 여부
             }
-            for machine_id in DRY_MACHINE.keys()
+            for machine_id in ctx.config.DRY_MACHINE.keys()
         }
         
         # 모든 건조 머신이 busy일 경우 대기시킬 job들을 위한 대기열
-        self.waiting_queue = []
+        self.waiting_queue = deque()
+        # 빈 머신 / 배치가 진행 중인 머신을 바로 찾기 위한 인덱스
+        self.machine_index = BatchMachineIndex(self.machines)
+        # 배치 타임아웃 타이머 (배치가 먼저 출발하면 취소)
+        self.batch_timers = BatchTimerQueue(env, batch_timeout, self.on_batch_timeout)
+        self.stats = ctx.station_stats[self.STAGE]  # 단계 KPI (가동률, 대기열, 배치 채움 비율 등)
 
     def seize(self):
         """
@@ -537,57 +931,51 @@ class Proc_Drying:
         """
         while True:
             job = yield self.drying_store.get()
-            assigned = False
+            self.stats.arrive(job)
 
             # 먼저, 이미 배치가 진행 중인 머신에 할당 시도
-            for machine_id, machine in self.machines.items():
-                if not machine["is_busy"] and 0 < len(machine["batch"]) < machine["capacity"]:
-                    machine["batch"].append(job)
-                    self.daily_events.append(
-                        f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Job {job.job_id} assigned to Drying Machine {machine_id}. Batch: {[j.job_id for j in machine['batch']]}"
-                    )
-                    assigned = True
-                    # 배치가 꽉 찼으면 바로 처리
-                    if len(machine["batch"]) == machine["capacity"]:
-                        machine["is_busy"] = True
-                        current_batch = machine["batch"]
-                        machine["batch"] = []
-                        machine["batch_start_time"] = None
-                        self.env.process(self.delay(machine_id, current_batch))
-                    break
+            machine_id = self.machine_index.first_partial()
+            if machine_id is not None:
+                machine = self.machines[machine_id]
+                machine["batch"].append(job)
+                self.daily_events.record_batch(EV_BATCH_JOIN, self.env.now, "Drying", job.job_id, machine_id, jobs=machine["batch"])
+                # 배치가 꽉 찼으면 바로 처리
+                if len(machine["batch"]) == machine["capacity"]:
+                    machine["is_busy"] = True
+                    current_batch = machine["batch"]
+                    machine["batch"] = []
+                    machine["batch_start_time"] = None
+                    self.batch_timers.cancel(machine_id)
+                    self.env.process(self.delay(machine_id, current_batch))
+                self.machine_index.update(machine_id)
+                continue
 
             # 빈 배치인 머신에 할당
-            if not assigned:
-                for machine_id, machine in self.machines.items():
-                    if not machine["is_busy"] and len(machine["batch"]) == 0:
-                        machine["batch"].append(job)
-                        machine["batch_start_time"] = self.env.now
-                        self.daily_events.append(
-                            f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Job {job.job_id} started new batch on Drying Machine {machine_id}."
-                        )
-                        # 타임아웃 체크 프로세스 시작 (한 번만 시작)
-                        self.env.process(self.check_batch_timeout(machine_id))
-                        assigned = True
-                        break
+            machine_id = self.machine_index.first_empty()
+            if machine_id is not None:
+                machine = self.machines[machine_id]
+                machine["batch"].append(job)
+                machine["batch_start_time"] = self.env.now
+                self.daily_events.record(EV_BATCH_NEW, self.env.now, "Drying", job.job_id, machine_id)
+                # 배치 타임아웃 타이머 시작
+                self.batch_timers.start(machine_id)
+                self.machine_index.update(machine_id)
+                continue
+
             # 할당되지 않으면 대기열에 넣음
-            if not assigned:
-                self.waiting_queue.append(job)
-                self.daily_events.append(
-                    f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - All Drying Machines busy/full. Job {job.job_id} added to waiting queue."
-                )
+            self.waiting_queue.append(job)
+            self.daily_events.record(EV_BATCH_WAIT, self.env.now, "Drying", job.job_id)
     
-    def check_batch_timeout(self, machine_id):
-        """배치 시작 후 batch_timeout 시간이 지나면, 배치가 꽉 차지 않더라도 강제로 처리"""
-        yield self.env.timeout(self.batch_timeout)
+    def on_batch_timeout(self, machine_id):
+        """배치 시작 후 batch_timeout 시간이 지나면, 배치가 꽉 차지 않더라도 강제로 처리 (batch_timers에서 호출)"""
         machine = self.machines[machine_id]
         if not machine["is_busy"] and machine["batch"]:
-            self.daily_events.append(
-                f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Timeout reached on Drying Machine {machine_id}. Processing batch: {[j.job_id for j in machine['batch']]}"
-            )
+            self.daily_events.record_batch(EV_BATCH_TIMEOUT, self.env.now, "Drying", machine_id, jobs=machine["batch"])
             machine["is_busy"] = True
             current_batch = machine["batch"]
             machine["batch"] = []
             machine["batch_start_time"] = None
+            self.machine_index.update(machine_id)
             self.env.process(self.delay(machine_id, current_batch))
 
     def delay(self, machine_id, jobs_batch):
@@ -599,16 +987,26 @@ class Proc_Drying:
         """
         # 각 job에 drying_time이 없으면 기본값 1 할당
         for job in jobs_batch:
-            if not hasattr(job, "drying_time") or job.drying_time is None:
+            if job.drying_time is None:
                 job.drying_time = 1
         drying_time = sum(job.drying_time for job in jobs_batch)
-        self.daily_events.append(
-            f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Drying Machine {machine_id} starts processing batch {[job.job_id for job in jobs_batch]} for {drying_time} time units."
-        )
+        for job in jobs_batch:
+            self.stats.start(job)
+        self.stats.acquire()
+        self.stats.record_batch(len(jobs_batch), self.machines[machine_id]["capacity"])
+        self.daily_events.record_batch(EV_BATCH_START, self.env.now, "Drying", machine_id, drying_time, jobs=jobs_batch)
+        start_time = self.env.now
         yield self.env.timeout(drying_time)
-        self.daily_events.append(
-            f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Drying Machine {machine_id} finished processing batch."
-        )
+        self.daily_events.record(EV_BATCH_FINISH, self.env.now, "Drying", machine_id)
+        # 배치의 각 job에 대해 Drying 기록 (배치 전체가 같은 머신, 같은 시작/종료 시각)
+        for job in jobs_batch:
+            self.ctx.daily_reports.append(
+                process='Drying',
+                job_id=job.job_id,
+                machine_id=machine_id,
+                start_time=start_time,
+                end_time=self.env.now,
+            )
         # 처리 완료 후 release()를 호출하여 후속 처리를 진행합니다.
         self.release(machine_id, jobs_batch)
 
@@ -624,22 +1022,23 @@ class Proc_Drying:
         self.machines[machine_id]["is_busy"] = False
 
         # 세척 완료된 job들을 건조 단계로 전달
+        self.stats.release()
         for job in jobs_batch:
+            self.stats.finish(job)
+            self.ctx.flow.move(job, "PostProcessing")
             self.post_processor.seize(job)
 
         # 머신이 free이고 배치에 여유가 있을 때, waiting_queue에서 job을 가져와 배치에 추가
         while (self.waiting_queue and
             (not self.machines[machine_id]["is_busy"]) and
             (len(self.machines[machine_id]["batch"]) < self.machines[machine_id]["capacity"])):
-            waiting_job = self.waiting_queue.pop(0)
+            waiting_job = self.waiting_queue.popleft()
             self.machines[machine_id]["batch"].append(waiting_job)
-            self.daily_events.append(
-                f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - After processing, waiting Job {waiting_job.job_id} assigned to Drying Machine {machine_id}. Batch: {[j.job_id for j in self.machines[machine_id]['batch']]}"
-            )
+            self.daily_events.record_batch(EV_BATCH_REFILL, self.env.now, "Drying", waiting_job.job_id, machine_id, jobs=self.machines[machine_id]["batch"])
             # 만약 이 배치가 새로 시작되었거나 batch_start_time이 설정되지 않았다면 타이머 시작
             if self.machines[machine_id].get("batch_start_time") is None:
                 self.machines[machine_id]["batch_start_time"] = self.env.now
-                self.env.process(self.check_batch_timeout(machine_id))
+                self.batch_timers.start(machine_id)
         
         # 배치가 capacity에 도달하면 바로 처리
         if (not self.machines[machine_id]["is_busy"]) and (len(self.machines[machine_id]["batch"]) == self.machines[machine_id]["capacity"]):
@@ -648,8 +1047,53 @@ class Proc_Drying:
             self.machines[machine_id]["batch"] = []
             # 배치 시작 시간 초기화 후 즉시 처리
             self.machines[machine_id]["batch_start_time"] = None
+            self.batch_timers.cancel(machine_id)
             self.env.process(self.delay(machine_id, current_batch))
 
+        # free 전환, 재할당 결과에 따라 머신 인덱스 갱신
+        self.machine_index.update(machine_id)
+
+class WorkerPool:
+    """
+    WorkerPool 클래스
+    ------------------
+    후처리/포장 작업자를 관리하는 작업 보존형(work-conserving) 작업자 풀
+    - free: 쉬고 있는 작업자 ID 스택 (처음에는 가장 작은 ID가 맨 위)
+    - queue: 작업자를 기다리는 작업(deque)
+    대기 중인 작업이 있으면 작업자가 풀려나는 즉시 다음 작업을 넘겨주므로,
+    대기열이 비어있지 않은 동안 쉬는 작업자는 없습니다. 할당과 해제는 모두 O(1)입니다.
+    """
+    def __init__(self, worker_ids, start):
+        """
+        worker_ids: 작업자 ID 목록
+        start: start(worker_id, task) 형태로 작업자에게 작업을 시작시키는 함수
+        """
+        self.worker_ids = list(worker_ids)
+        self.free = self.worker_ids[::-1]
+        self.queue = deque()
+        self.start = start
+
+    @property
+    def busy_count(self):
+        """작업 중인 작업자 수"""
+        return len(self.worker_ids) - len(self.free)
+
+    def request(self, task):
+        """쉬는 작업자가 있으면 바로 작업을 시작하고 True, 없으면 대기열에 넣고 False를 반환"""
+        if self.free:
+            self.start(self.free.pop(), task)
+            return True
+        self.queue.append(task)
+        return False
+
+    def release(self, worker_id):
+        """작업을 마친 작업자에게 대기 중인 다음 작업을 넘기고, 없으면 쉬는 작업자로 되돌림"""
+        if self.queue:
+            self.start(worker_id, self.queue.popleft())
+        else:
+            self.free.append(worker_id)
+
+
 # PostProcessing 클래스: 후처리 작업을 관리
 class Proc_PostProcessing:
     """
@@ -660,26 +1104,26 @@ class Proc_PostProcessing:
     - 사용 가능한 작업자(worker)가 있으면 즉시 후처리 프로세스(delay)를 실행합니다.
     - 모든 작업자가 바쁘면 해당 Item을 대기열(queue)에 저장합니다.
     - 각 Item의 후처리 완료 시, 소속 Job의 후처리 완료 카운트를 증가시키고,
-      모든 Item의 후처리가 완료되면 Job 전체를 Packaging 단계로 전달합니다.
+      모든 Item의 후처리가 완료되면 Job 전체를 검사(Inspection) 단계로 전달합니다.
     """
-    def __init__(self, env, post_processing_cost, daily_events, packaging):
+    def __init__(self, env, post_processing_cost, ctx, inspection):
         """
         생성자 (__init__)
         -------------------------
         매개변수:
             env: SimPy 환경 객체 (시뮬레이션 시간 및 이벤트 관리를 담당)
             post_processing_cost: 후처리 비용 단위 (비용 계산에 사용)
-            daily_events: 일별 이벤트 로그 리스트 (시뮬레이션 이벤트 기록용)
-            packaging: Packaging 단계 객체 참조 (후처리 완료된 Job 전달용)
+            ctx: 실행 단위 상태(SimContext) 객체 (설정, 이벤트 로그, 작업 기록)
+            inspection: Inspection 단계 객체 참조 (후처리 완료된 Job 전달용, 검사 후 Packaging으로 전달)
         """
         self.env = env
-        self.daily_events = daily_events
-        # 후처리 작업자를 관리하는 딕셔너리: 각 작업자는 사용 가능 여부(is_busy)로 관리
-        self.workers = {worker_id: {"is_busy": False} for worker_id in POST_PROCESSING_WORKER.keys()}
-        # 모든 작업자가 바쁠 경우 후처리할 Item을 저장할 대기열
-        self.queue = []
-        # Packaging 단계 객체 참조
-        self.packaging = packaging
+        self.ctx = ctx
+        self.daily_events = ctx.daily_events
+        # 후처리 작업자 풀: 쉬는 작업자 스택과, 모든 작업자가 바쁠 경우 후처리할 Item을 저장할 대기열(deque)
+        self.pool = WorkerPool(ctx.config.POST_PROCESSING_WORKER.keys(), self.start)
+        self.stats = ctx.station_stats["PostProcessing"]  # 후처리 단계 KPI (Item 단위)
+        # Inspection 단계 객체 참조
+        self.inspection = inspection
         self.unit_post_processing_cost = post_processing_cost
 
     def seize(self, job):
@@ -689,30 +1133,29 @@ class Proc_PostProcessing:
         drying 단계에서 전달된 Job 객체 내의 각 Item에 대해 후처리 작업을 할당합니다.
         
         동작:
-          - Job 객체에 포함된 각 Item에 대해, 사용 가능한 작업자(worker)를 탐색합니다.
-          - 사용 가능한 작업자가 있으면 해당 작업자를 busy 상태로 전환한 후, 후처리 프로세스(delay)를 시작합니다.
-          - 만약 모든 작업자가 바쁘다면, 해당 Item을 대기열(queue)에 추가하고 이벤트 로그에 기록합니다.
+          - Job 객체에 포함된 각 Item을 작업자 풀(pool)에 요청합니다.
+          - 쉬는 작업자가 있으면 해당 작업자가 바로 후처리 프로세스(delay)를 시작합니다.
+          - 만약 모든 작업자가 바쁘다면, 해당 Item은 풀의 대기열(queue)에 추가되고 이벤트 로그에 기록합니다.
         
         매개변수:
             job: 후처리할 Item들을 포함한 Job 객체
         """
+        # 후처리할 Item이 없는 Job은 바로 검사/포장 단계로 전달 (release가 호출되지 않으므로)
+        if not job.items:
+            self.daily_events.record(EV_PP_JOB_DONE, self.env.now, job.job_id)
+            self.inspection.seize(job)
+            return
+
         # Job에 포함된 각 Item 처리
         for item in job.items:
-            assigned = False  # 작업 할당 여부 플래그
-            for worker_id, worker in self.workers.items():
-                if not worker["is_busy"]:
-                    # 사용 가능한 작업자를 찾은 경우,
-                    # 작업자를 busy 상태로 전환하고 후처리 delay 프로세스 시작
-                    self.workers[worker_id]["is_busy"] = True
-                    self.env.process(self.delay(worker_id, item))
-                    assigned = True
-                    break  # 하나의 작업자 할당 후 바로 다음 Item 처리
-            if not assigned:
-                # 모든 작업자가 바쁜 경우, 해당 Item을 대기열에 추가
-                self.daily_events.append(
-                    f"{int(self.env.now % 24)}:{int((self.env.now % 1) * 60):02d} - All workers busy. Item {item.item_id} of Job {item.job_id} added to waiting queue."
-                )
-                self.queue.append(item)
+            self.stats.arrive(item)
+            if not self.pool.request(item):
+                # 모든 작업자가 바빠 대기열에 추가된 경우
+                self.daily_events.record(EV_PP_WAIT, self.env.now, item.item_id, item.job_id)
+
+    def start(self, worker_id, item):
+        """작업자 풀에서 호출: worker_id 작업자가 item의 후처리 delay 프로세스를 시작"""
+        self.env.process(self.delay(worker_id, item))
 
     def delay(self, worker_id, item):
         """
@@ -733,23 +1176,20 @@ class Proc_PostProcessing:
         """
         # 후처리 시작 시간 기록
         start_time = self.env.now
-        self.daily_events.append(
-            f"{int(self.env.now % 24)}:{int((self.env.now % 1) * 60):02d} - Item {item.item_id} of Job {item.job_id} is starting on Worker {worker_id} (Post-processing)"
-        )
+        self.stats.start(item)
+        self.stats.acquire()
+        self.daily_events.record(EV_PP_START, self.env.now, item.item_id, item.job_id, worker_id)
         # Item에 후처리 시간이 없으면 기본값 1 할당
-        if not hasattr(item, "post_processing_time") or item.post_processing_time is None:
+        if item.post_processing_time is None:
             item.post_processing_time = 1
-            
-        if hasattr(item, 'log_index'):
-            ITEM_LOG[item.log_index]['post_processing_time'] = item.post_processing_time
+
+        self.ctx.item_log.update(item.log_index, 'post_processing_time', item.post_processing_time)
         
         # 후처리 시간만큼 SimPy 환경에서 대기
         yield self.env.timeout(item.post_processing_time)
         # 후처리 완료 시각 기록
         end_time = self.env.now
-        self.daily_events.append(
-            f"{int(self.env.now % 24)}:{int((self.env.now % 1) * 60):02d} - Item {item.item_id} of Job {item.job_id} is finishing on Worker {worker_id} (Post-processing)"
-        )
+        self.daily_events.record(EV_PP_FINISH, self.env.now, item.item_id, item.job_id, worker_id)
         # 후처리 완료 후 release 메서드를 호출하여 후속 작업 처리
         self.release(worker_id, item, start_time, end_time)
 
@@ -760,14 +1200,12 @@ class Proc_PostProcessing:
         후처리 작업(delay)이 완료된 후 호출되어 다음 작업들을 수행합니다.
         
         작업 내용:
-          1. 후처리 작업 결과를 DAILY_REPORTS에 기록합니다.
+          1. 후처리 작업 결과를 ctx.daily_reports에 기록합니다.
           2. Cost.cal_cost()를 호출하여 후처리 비용을 계산합니다.
-          3. 해당 작업자를 사용 가능 상태로 해제합니다.
-          4. Item이 속한 Job의 후처리 완료 카운트를 1 증가시킵니다.
-          5. 만약 Job에 포함된 모든 Item이 후처리 완료되었으면,
-             Packaging 단계로 해당 Job 전체를 전달하고 이벤트 로그를 남깁니다.
-          6. Packaging 단계로 전달 (여기서는 assign_item() 메서드를 호출)합니다.
-          7. 대기열(queue)에 저장된 Item이 있다면, 사용 가능한 작업자에게 할당합니다.
+          3. Item이 속한 Job의 후처리 완료 카운트를 1 증가시킵니다.
+          4. 만약 Job에 포함된 모든 Item이 후처리 완료되었으면,
+             검사(Inspection) 단계로 해당 Job 전체를 전달하고 이벤트 로그를 남깁니다.
+          5. 작업자를 풀에 반환합니다. 대기열에 Item이 있으면 같은 작업자가 바로 다음 Item을 시작합니다.
         
         매개변수:
             worker_id: 후처리 작업을 수행한 작업자의 ID
@@ -775,51 +1213,146 @@ class Proc_PostProcessing:
             start_time: 해당 Item의 후처리 시작 시각
             end_time: 해당 Item의 후처리 완료 시각
         """
-        # 후처리 완료 이벤트를 DAILY_REPORTS에 기록
-        DAILY_REPORTS.append({
-            'job_id': item.job_id,
-            'item_id': item.item_id,
-            'worker_id': worker_id,
-            'start_time': start_time,
-            'end_time': end_time,
-            'process': 'Post-Processing'
-        })
+        # 후처리 완료 이벤트를 ctx.daily_reports에 기록
+        self.ctx.daily_reports.append(
+            process='Post-Processing',
+            job_id=item.job_id,
+            item_id=item.item_id,
+            worker_id=worker_id,
+            start_time=start_time,
+            end_time=end_time,
+        )
         # 후처리 비용 계산
-        Cost.cal_cost(item, "Post Processing cost")
-        # 해당 작업자를 사용 가능 상태로 전환 (busy 해제)
-        self.workers[worker_id]["is_busy"] = False
+        Cost.cal_cost(self.ctx, item, "Post Processing cost")
+        self.stats.release()
+        self.stats.finish(item)
 
         # Item이 속한 Job의 후처리 완료 카운트를 1 증가
         item.job.completed_postprocessing += 1
 
         # 만약 Job에 포함된 모든 Item이 후처리 완료되었다면,
-        # Packaging 단계로 해당 Job을 전달하는 이벤트 로그 기록
+        # 검사 단계로 해당 Job을 전달하는 이벤트 로그 기록
         if item.job.completed_postprocessing == len(item.job.items):
-            self.daily_events.append(
-                f"All items in Job {item.job_id} completed post-processing. Sending Job to Packaging."
-            )
+            self.daily_events.record(EV_PP_JOB_DONE, self.env.now, item.job_id)
 
-            # Packaging 단계로 후처리 완료된 Job 전달 (여기서는 assign_item() 메서드를 사용)
-            self.packaging.seize(item.job)
+            # 검사 단계로 후처리 완료된 Job 전달 (검사 후 양품 Item만 Packaging으로 전달됨)
+            self.inspection.seize(item.job)
+
+        # 작업자 반환 (대기열에 Item이 있으면 같은 작업자가 바로 다음 Item 후처리 시작)
+        self.pool.release(worker_id)
+
+# Inspection 클래스: 후처리 후 검사와 재작업 Job 구성
+class Proc_Inspection:
+    """
+    Inspection 클래스
+    ------------------
+    후처리를 마친 Job의 Item을 검사하여, 불량 Item을 재작업(rework) Job으로 묶어 프린터로 되돌려 보내는 단계
+    - 검사는 후처리 완료 시점에 즉시 수행되며(작업자/시간 없음), Job의 모든 Item의 불량 여부를
+      한 번의 벡터 연산(Bernoulli 샘플)으로 결정합니다.
+    - 불량 Item은 원래 Job에서 빠져 현재 모으는 중인 재작업 Job으로 옮겨지고, 양품 Item만 남은 Job은 포장 단계로 전달됩니다.
+      (모든 Item이 불량인 Job은 포장 없이 공정을 떠남)
+      Item은 주문 Job(item.order)을 계속 참조하므로, 고객 만족도는 재작업 Item까지 모두 포장된 시점에 주문 Job 단위로 기록됩니다.
+    - 재작업 Job은 여러 Job의 불량 Item이 REWORK_BATCH_SIZE개 모이거나, 첫 불량 Item 이후 REWORK_TIMEOUT 시간이 지나면
+      printer_store에 들어가며, REWORK_PRIORITY가 True이면 대기 중인 일반 Job보다 먼저 인쇄됩니다.
+    - 재작업 Job도 일반 Job과 같은 경로(Printing → ... → Inspection)를 거치므로 다시 불량이 날 수 있습니다.
+    """
+    def __init__(self, env, ctx, packaging, printer_store, customer):
+        """
+        매개변수:
+            env: SimPy 환경 객체
+            ctx: 실행 단위 상태(SimContext) 객체 (설정, 불량 판정 난수 스트림, 재작업 KPI)
+            packaging: Packaging 단계 객체 참조 (검사를 통과한 Job 전달용)
+            printer_store: 재작업 Job을 넣을 printer_store
+            customer: 재작업 Job ID를 발급할 Customer 객체
+        """
+        self.env = env
+        self.ctx = ctx
+        self.daily_events = ctx.daily_events
+        self.packaging = packaging
+        self.printer_store = printer_store
+        self.customer = customer
+        settings = ctx.config.INSPECTION
+        self.defect_rate = settings["DEFECT_RATE"]
+        self.rng = ctx.rng_streams["defects"]  # 불량 판정 전용 난수 스트림 (Item 크기 난수와 섞이지 않음)
+        self.rework_batch_size = settings["REWORK_BATCH_SIZE"]
+        self.rework_priority = -1 if settings["REWORK_PRIORITY"] else 0
+        self.rework_job = None  # 불량 Item을 모으는 중인 재작업 Job
+        # 재작업 Job 타임아웃 타이머 (Washing/Drying 배치와 같은 타이머 큐, 재작업 Job은 하나이므로 키는 0)
+        self.rework_timer = BatchTimerQueue(env, settings["REWORK_TIMEOUT"], self.on_rework_timeout)
+        self.stats = ctx.rework_stats
+
+    def seize(self, job):
+        """
+        후처리를 마친 Job을 검사합니다.
+        불량 Item은 재작업 Job으로 옮기고, 남은 Item이 있으면 Job을 포장 단계로 전달합니다.
+        """
+        defective = []
+        if self.defect_rate > 0 and job.items:
+            # Job의 모든 Item에 대해 한 번에 Bernoulli(DEFECT_RATE) 샘플
+            flags = self.rng.random(len(job.items)) < self.defect_rate
+            if flags.any():
+                defective = [item for item, flag in zip(job.items, flags.tolist()) if flag]
+                job.items = [item for item, flag in zip(job.items, flags.tolist()) if not flag]
+                self.ctx.flow.items_in_flight -= len(defective)
+                self.daily_events.record(EV_INSPECT_DEFECT, self.env.now, job.job_id, len(defective),
+                                         len(job.items) + len(defective), [item.item_id for item in defective])
+        self.stats.record_inspection(len(job.items) + len(defective), len(defective))
+        for item in defective:
+            self.add_rework(item)
+
+        if job.items or not defective:
+            self.release(job)
+        else:
+            # 모든 Item이 재작업으로 넘어간 Job은 포장 없이 공정을 떠남
+            self.ctx.flow.leave(job)
+
+    def add_rework(self, item):
+        """불량 Item을 재작업 Job에 추가하고, REWORK_BATCH_SIZE개가 모이면 프린터로 보냄"""
+        if self.rework_job is None:
+            self.rework_job = Job(self.customer.next_job_id(), [], self.env.now)
+            self.rework_job.rework = True
+            self.rework_job.priority = self.rework_priority
+            self.ctx.flow.enter(self.rework_job, "Rework")
+            self.rework_timer.start(0)
+        job = self.rework_job
+        item.job = job
+        item.job_id = job.job_id
+        job.items.append(item)
+        self.ctx.flow.items_in_flight += 1
+        if len(job.items) >= self.rework_batch_size:
+            self.send_rework()
+
+    def on_rework_timeout(self, key):
+        """첫 불량 Item 이후 REWORK_TIMEOUT 시간이 지나면 모인 Item만으로 재작업 Job을 보냄 (rework_timer에서 호출)"""
+        if self.rework_job is not None:
+            self.send_rework()
+
+    def send_rework(self):
+        """모으는 중인 재작업 Job을 printer_store에 넣음"""
+        job = self.rework_job
+        self.rework_job = None
+        self.rework_timer.cancel(0)
+        self.daily_events.record(EV_REWORK_SENT, self.env.now, job.job_id, len(job.items))
+        self.stats.record_rework(len(job.items))
+        self.ctx.flow.move(job, "Printing")
+        self.ctx.station_stats["Printing"].arrive(job)
+        self.printer_store.put(job)
+
+    def release(self, job):
+        """검사를 통과한 Job을 포장 단계로 전달"""
+        self.packaging.seize(job)
 
-        # 대기열에 대기 중인 Item이 있다면, 사용 가능한 작업자를 찾아 할당
-        if self.queue:
-            next_item = self.queue.pop(0)
-            for wid, worker in self.workers.items(): 
-                if not worker["is_busy"]:
-                    self.workers[wid]["is_busy"] = True
-                    self.env.process(self.delay(wid, next_item))
-                    break
 
 # Packaging 클래스: 포장 작업을 관리
 class Proc_Packaging:
-    def __init__(self, env, packaging_cost, daily_events, satisfication):
+    def __init__(self, env, packaging_cost, ctx, satisfication):
         self.env = env  # SimPy 환경 객체
-        self.daily_events = daily_events  # 일별 이벤트 로그 리스트
+        self.ctx = ctx  # 실행 단위 상태 (설정, 로그)
+        self.daily_events = ctx.daily_events  # 일별 이벤트 로그 리스트
         self.unit_packaging_cost = packaging_cost
-        # 포장 작업자를 관리하는 딕셔너리 (PACKAGING_MACHINE의 키 사용)
-        self.workers = {worker_id: {"is_busy": False} for worker_id in PACKAGING_MACHINE.keys()}
-        self.queue = []  # 대기 중인 전문 Job들을 저장할 큐
+        # 포장 작업자 풀 (PACKAGING_MACHINE의 키 사용, 대기 중인 전문 Job들은 풀의 대기열에 저장)
+        self.pool = WorkerPool(ctx.config.PACKAGING_MACHINE.keys(), self.start)
+        self.stats = ctx.station_stats["Packaging"]  # 포장 단계 KPI
         self.satisfication = satisfication
 
     def seize(self, job):
@@ -829,27 +1362,23 @@ class Proc_Packaging:
         
         동작:
           - Job에 packaging_time (예시: 1시간 고정)을 추가합니다.
-          - 사용 가능한 작업자가 있으면 즉시 delay 프로세스를 시작하고,
-            그렇지 않으면 대기열에 Job을 추가합니다.
+          - 작업자 풀에 요청하여 쉬는 작업자가 있으면 즉시 delay 프로세스를 시작하고,
+            그렇지 않으면 풀의 대기열에 Job을 추가합니다.
         
         매개변수:
             job: 포장할 Job 객체 (여러 Item을 포함)
         """
+        self.ctx.flow.move(job, "Packaging")
         # Job에 포장 시간 추가 (여기서는 고정 1시간으로 설정)
-        if not hasattr(job, "packaging_time") or job.packaging_time is None:
+        if job.packaging_time is None:
             job.packaging_time = 1
 
-        assigned = False
-        # 사용 가능한 포장 작업자 탐색
-        for worker_id, worker in self.workers.items():
-            if not worker["is_busy"]:
-                worker["is_busy"] = True
-                # 포장 프로세스(delay)를 시작 (job과 작업자 ID 전달)
-                self.env.process(self.delay(job, worker_id))
-                assigned = True
-                break
-        if not assigned:
-            self.queue.append(job)
+        self.stats.arrive(job)
+        self.pool.request(job)
+
+    def start(self, worker_id, job):
+        """작업자 풀에서 호출: worker_id 작업자가 job의 포장 프로세스(delay)를 시작"""
+        self.env.process(self.delay(job, worker_id))
 
     def delay(self, job, worker_id):
         """
@@ -864,15 +1393,13 @@ class Proc_Packaging:
             worker_id: 포장 작업을 수행할 작업자의 ID
         """
         start_time = self.env.now
-        self.daily_events.append(
-            f"{int(self.env.now % 24)}:{int((self.env.now % 1)*60):02d} - Job {job.job_id} starts Packaging on Worker {worker_id}."
-        )
+        self.stats.start(job)
+        self.stats.acquire()
+        self.daily_events.record(EV_PACK_START, self.env.now, job.job_id, worker_id)
         # Job의 포장 시간만큼 대기 (포장 작업 진행)
         yield self.env.timeout(job.packaging_time)
         end_time = self.env.now
-        self.daily_events.append(
-            f"{int(end_time % 24)}:{int((end_time % 1)*60):02d} - Job {job.job_id} finished Packaging on Worker {worker_id}."
-        )
+        self.daily_events.record(EV_PACK_FINISH, end_time, job.job_id, worker_id)
         # 포장 완료 후 후속 처리를 release 메서드를 통해 진행
         self.release(job, worker_id, start_time, end_time)
 
@@ -883,10 +1410,10 @@ class Proc_Packaging:
         포장 작업이 완료된 후 호출되어 다음 작업들을 수행합니다.
         
         작업 내용:
-          - 포장 완료 이벤트를 DAILY_REPORTS에 기록합니다.
+          - 포장 완료 이벤트를 ctx.daily_reports에 기록합니다.
           - 포장 비용 계산 및 비용 보고서 업데이트
           - 포장 완료 후 만족도 관련 처리 (필요시 구현)
-          - 사용한 작업자(worker)를 해제하고, 대기열에 있는 Job이 있다면 해당 작업자로 포장 작업을 재할당합니다.
+          - 사용한 작업자(worker)를 풀에 반환하고, 대기열에 있는 Job이 있다면 해당 작업자로 포장 작업을 재할당합니다.
         
         매개변수:
             job: 포장 작업이 완료된 Job 객체
@@ -894,47 +1421,55 @@ class Proc_Packaging:
             start_time: 포장 작업 시작 시각
             end_time: 포장 작업 완료 시각
         """
-        DAILY_REPORTS.append({
-            'job_id': job.job_id,
-            'worker_id': worker_id,
-            'start_time': start_time,
-            'end_time': end_time,
-            'process': 'Packaging'
-        })
-        if PRINT_SIM_COST:
+        self.ctx.daily_reports.append(
+            process='Packaging',
+            job_id=job.job_id,
+            worker_id=worker_id,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        if self.ctx.config.PRINT_SIM_COST:
             total_volume = sum(item.volume for item in job.items)
             if total_volume >= 25:
                 cost = 2 * self.unit_packaging_cost
             else:
                 cost = 1 * self.unit_packaging_cost
-            DAILY_COST_REPORT["Packaging cost"] += cost
+            self.ctx.daily_cost_report["Packaging cost"] += cost
 
-        if PRINT_SATISFICATION:
-            # 포장 완료 후 만족도 관련 추가 처리 (필요시 구현)
-            pass
+        # 포장된 Item을 주문 Job에 반영하고, 마지막 Item까지 배송된 주문 Job의 고객 만족도 기록 (리드타임이 짧을수록 큼)
+        self.satisfication.deliver(job, end_time)
 
-        # 포장 작업자 해제
-        self.workers[worker_id]["is_busy"] = False
-        # 대기열에 있는 Job이 있다면, 해당 작업자에게 Job 할당
-        if self.queue:
-            next_job = self.queue.pop(0)
-            for wid, worker in self.workers.items():
-                if not worker["is_busy"]:
-                    self.workers[worker_id]["is_busy"] = True
-                    self.env.process(self.delay(next_job, wid))
-                    break
+        self.stats.release()
+        self.stats.finish(job)
+        # Job이 공정을 떠남 (마지막 Job이면 flow.drained 이벤트 발생)
+        self.ctx.flow.leave(job)
+        # 포장 작업자 반환 (대기열에 Job이 있으면 같은 작업자가 바로 다음 Job 포장 시작)
+        self.pool.release(worker_id)
 
 # Job 클래스: Job의 속성을 정의
 class Item:
-    def __init__(self, env, item_id, config, job_id=None):
-        self.env = env
+    """
+    Item 클래스
+    ----------------
+    Job에 포함되는 개별 출력물(교정 장치)
+    백만 개 단위의 Item을 다루기 위해 __slots__로 모든 속성을 미리 선언합니다.
+    """
+    __slots__ = ("item_id", "job_id", "job", "order", "create_time", "height", "width", "depth", "volume",
+                 "build_time", "post_processing_time", "due_date", "log_index",
+                 "printing_cost", "post_processing_cost", "packaging_cost", "delivery_cost",
+                 "shortage_cost", "shortage")
+
+    def __init__(self, item_id, create_time, height, width, depth, volume, job=None):
         self.item_id = item_id
-        self.job_id = job_id
-        self.create_time = env.now
-        self.height = np.random.randint(*config["HEIGHT_RANGE"])
-        self.width = np.random.randint(*config["WIDTH_RANGE"])
-        self.depth = np.random.randint(*config["DEPTH_RANGE"])
-        self.volume = self.height * self.width * self.depth
+        self.job = job  # 소속된 Job 객체 (재작업 시 재작업 Job으로 바뀜)
+        self.order = job  # 고객이 주문한 원래 Job (재작업되어도 바뀌지 않음, 만족도 기록에 사용)
+        self.job_id = job.job_id if job is not None else None
+        self.create_time = create_time
+        # 크기와 부피는 ItemSampler에서 미리 뽑아둔 값을 전달받음
+        self.height = height
+        self.width = width
+        self.depth = depth
+        self.volume = volume
         
         # 각 단계별 처리 시간 (빌드, 후처리)
         self.build_time = None      
@@ -942,6 +1477,7 @@ class Item:
         
         # 기타 속성 (예: 비용, due date 등 필요시 추가)
         self.due_date = None
+        self.log_index = -1  # ctx.item_log에서의 행 번호 (Customer가 기록 후 설정)
         
         # 비용 항목 초기화
         self.printing_cost = 0
@@ -952,83 +1488,172 @@ class Item:
         self.shortage = 0
 
 
+class ItemSampler:
+    """
+    ItemSampler 클래스
+    -------------------
+    Item의 높이, 너비, 깊이를 block_size개씩 한 번의 벡터 연산으로 생성하고,
+    부피와 프린터 크기 적합 여부(fits_printer)도 블록 단위로 미리 계산해 두는 버퍼
+    Item마다 NumPy를 여러 번 호출하는 비용을 줄이기 위해 사용합니다.
+    """
+    def __init__(self, config, printers_size, rng, block_size=4096):
+        """
+        config: JOB_TYPES["DEFAULT"] (HEIGHT_RANGE, WIDTH_RANGE, DEPTH_RANGE 사용)
+        printers_size: PRINTERS_SIZE (HEIGHT, WIDTH, DEPTH 사용)
+        rng: numpy Generator (SimContext.rng_streams["geometry"])
+        block_size: 한 번에 생성할 Item 수
+        """
+        self.rng = rng
+        self.block_size = block_size
+        # 컬럼 순서: 높이, 너비, 깊이 (randint와 같이 상한값은 포함하지 않음)
+        self.low = np.array([config["HEIGHT_RANGE"][0], config["WIDTH_RANGE"][0], config["DEPTH_RANGE"][0]])
+        self.high = np.array([config["HEIGHT_RANGE"][1], config["WIDTH_RANGE"][1], config["DEPTH_RANGE"][1]])
+        self.printer_limit = np.array([printers_size["HEIGHT"], printers_size["WIDTH"], printers_size["DEPTH"]])
+        self.buffer = []
+        self.position = 0
+
+    def refill(self):
+        """block_size개의 Item 크기, 부피, 프린터 적합 여부를 한 번에 생성"""
+        dims = self.rng.integers(self.low, self.high, size=(self.block_size, 3))
+        volumes = dims.prod(axis=1)
+        fits = (dims <= self.printer_limit).all(axis=1)
+        # Python 객체로 한 번에 변환해 두어 Item 생성 시 NumPy 스칼라 접근을 피함
+        self.buffer = list(zip(*dims.T.tolist(), volumes.tolist(), fits.tolist()))
+        self.position = 0
+
+    def take(self, n):
+        """(높이, 너비, 깊이, 부피, 프린터 적합 여부) 튜플 n개를 반환"""
+        samples = []
+        while n > 0:
+            if self.position == len(self.buffer):
+                self.refill()
+            end = min(self.position + n, len(self.buffer))
+            samples.extend(self.buffer[self.position:end])
+            n -= end - self.position
+            self.position = end
+        return samples
+
+
 class Cost:
-    def cal_cost(instance, cost_type):
+    # 모든 메서드는 첫 번째 인자로 실행 단위 상태(ctx)를 받아 ctx.daily_cost_report에 비용을 누적합니다.
+    def cal_cost(ctx, instance, cost_type):
+        daily_cost_report = ctx.daily_cost_report
+        cost_types = ctx.config.COST_TYPES
         if cost_type == "Holding cost":
-            DAILY_COST_REPORT[cost_type] += instance.unit_holding_cost * instance.on_hand_inventory * (
+            daily_cost_report[cost_type] += instance.unit_holding_cost * instance.on_hand_inventory * (
                 instance.env.now - instance.holding_cost_last_updated)
         elif cost_type == "Printing cost":
-            DAILY_COST_REPORT[cost_type] += instance.job_build_time * COST_TYPES[0]['PRINTING_COST']
+            daily_cost_report[cost_type] += instance.job_build_time * cost_types[0]['PRINTING_COST']
         elif cost_type == "Post Processing cost":
-            DAILY_COST_REPORT[cost_type] += instance.post_processing_time * COST_TYPES[0]['POSTPROCESSING_COST']
+            daily_cost_report[cost_type] += instance.post_processing_time * cost_types[0]['POSTPROCESSING_COST']
         elif cost_type == "Delivery cost":
-            DAILY_COST_REPORT[cost_type] += 1
+            daily_cost_report[cost_type] += 1
         elif cost_type == "Packaging cost":
             if instance.volume >= 25:
-                DAILY_COST_REPORT[cost_type] += 2 * COST_TYPES[0]['PACKAGING_COST']
+                daily_cost_report[cost_type] += 2 * cost_types[0]['PACKAGING_COST']
             else:
-                DAILY_COST_REPORT[cost_type] += 1 * COST_TYPES[0]['PACKAGING_COST']
+                daily_cost_report[cost_type] += 1 * cost_types[0]['PACKAGING_COST']
         elif cost_type == "Shortage cost":
-            DAILY_COST_REPORT[cost_type] += instance.shortage * COST_TYPES[0]['SHORTAGE_COST']
+            daily_cost_report[cost_type] += instance.shortage * cost_types[0]['SHORTAGE_COST']
 
 
-    def update_cost_log():
-        COST_LOG.append(0)
-        for key in DAILY_COST_REPORT.keys():
-            COST_LOG[-1] += DAILY_COST_REPORT[key]
-        return COST_LOG[-1]
+    def update_cost_log(ctx):
+        ctx.cost_log.append(0)
+        for key in ctx.daily_cost_report.keys():
+            ctx.cost_log[-1] += ctx.daily_cost_report[key]
+        return ctx.cost_log[-1]
 
-    def clear_cost():
-        for key in DAILY_COST_REPORT.keys():
-            DAILY_COST_REPORT[key] = 0
+    def clear_cost(ctx):
+        for key in ctx.daily_cost_report.keys():
+            ctx.daily_cost_report[key] = 0
 
 class Satisfication:
-    def __init__(self, env, daily_events):
+    def __init__(self, env, ctx):
         self.env = env
-        self.daily_events = daily_events
+        self.ctx = ctx
+        self.daily_events = ctx.daily_events
         self.total_satisfication = 0
 
     def cal_satisfication(self, job, end_time):
         
-        """고객 만족도 계산 및 기록"""
+        """
+        고객 만족도 계산 및 기록
+        total_satisfication은 시뮬레이션 KPI이므로 항상 누적하고, 이벤트 로그 기록만 PRINT_SATISFICATION에 따름
+        """
+        record = self.ctx.config.PRINT_SATISFICATION
         if job.create_time is not None and end_time is not None and (job.create_time != end_time):
-            satisfication = SATISFICATION_TYPE["POSITIVE"] / (end_time - job.create_time)
+            satisfication = self.ctx.config.SATISFICATION_TYPE["POSITIVE"] / (end_time - job.create_time)
             self.total_satisfication += satisfication
-            self.daily_events.append(
-                f"Job {job.job_id}: Satisfication calculated as {satisfication:.4f}\nTotal Satisfication: {self.total_satisfication: .4f}"
-            )
+            if record:
+                self.daily_events.record(EV_SATISFICATION, end_time, job.job_id, satisfication, self.total_satisfication)
         
         elif job.create_time == end_time:
-            satisfication = SATISFICATION_TYPE["NEGATIVE"]
+            satisfication = self.ctx.config.SATISFICATION_TYPE["NEGATIVE"]
             self.total_satisfication += satisfication
-            self.daily_events.append(
-                f"Job {job.job_id}: No printer assigned, satisfication set to {satisfication:.4f}\nTotal Satisfication: {self.total_satisfication: .4f}"
-            )
+            if record:
+                self.daily_events.record(EV_SATISFICATION_NEGATIVE, end_time, job.job_id, satisfication, self.total_satisfication)
 
-        SATISFICATION_LOG.append(self.total_satisfication)
+        self.ctx.satisfication_log.append(self.total_satisfication)
+
+    def deliver(self, job, end_time):
+        """
+        포장이 끝난 Job의 Item을 각 주문 Job(item.order)의 배송 수에 반영하고,
+        모든 Item이 배송된 주문 Job의 만족도를 end_time 기준으로 기록
+        (재작업된 Item이 있으면 그 Item이 포장될 때까지 주문 Job의 리드타임이 늘어남)
+        """
+        if not job.items:
+            if not job.rework:
+                self.cal_satisfication(job, end_time)  # 프린터에 맞는 Item이 없던 주문 Job
+            return
+        for item in job.items:
+            order = item.order
+            order.open_items -= 1
+            if order.open_items == 0:
+                self.cal_satisfication(order, end_time)
 
 # 환경 생성 함수 (create_env)
-def create_env(daily_events):
+def create_env(ctx):
+    """
+    ctx(SimContext)를 중심으로 시뮬레이션 객체들을 생성합니다.
+    모든 객체는 전역 로그 대신 ctx의 설정과 로그를 사용합니다.
+    """
     simpy_env = simpy.Environment()
+    config = ctx.config
+    # 단계별 in-flight Job 수와 drained 이벤트 관리
+    ctx.flow = FlowTracker(simpy_env)
+    # 단계별 KPI 누적기 (가동률, 대기열, 배치 채움 비율, 대기/흐름 시간)
+    ctx.station_stats = {
+        "Printing": StationStats(simpy_env, "Printing", len(config.PRINTERS)),
+        "Washing": StationStats(simpy_env, "Washing", len(config.WASHING_MACHINE)),
+        "Drying": StationStats(simpy_env, "Drying", len(config.DRY_MACHINE)),
+        "PostProcessing": StationStats(simpy_env, "PostProcessing", len(config.POST_PROCESSING_WORKER)),
+        "Packaging": StationStats(simpy_env, "Packaging", len(config.PACKAGING_MACHINE)),
+    }
+    # 검사/재작업 루프 KPI (불량률, 재작업이 차지한 프린터 용량)
+    ctx.rework_stats = ReworkStats(simpy_env, len(config.PRINTERS))
+    daily_events = ctx.daily_events
 
     # 주문(order)을 위한 store (배치 단위로 들어갈 예정)
-    printer_store = simpy.Store(simpy_env)
+    # printer_store는 DISPATCHING_RULE에 따라 job을 꺼내주는 우선순위 Store
+    printer_store = DispatchStore(simpy_env, get_dispatching_key(config.DISPATCHING_RULE))
     washing_store = simpy.Store(simpy_env)
     drying_store = simpy.Store(simpy_env)
     
-    # Satisfication, Packaging, PostProcessing, Drying, Washing, Customer, Display 생성
-    satisfication = Satisfication(simpy_env, daily_events)
-    packaging = Proc_Packaging(simpy_env, COST_TYPES[0]['PACKAGING_COST'], daily_events, satisfication)
-    post_processor = Proc_PostProcessing(simpy_env, COST_TYPES[0]['POSTPROCESSING_COST'], daily_events, packaging)
-    dry_machine = Proc_Drying(simpy_env, COST_TYPES[0]['DRYING_COST'], daily_events, post_processor, drying_store, batch_timeout=BATCH_TIMEOUT)
-    washing_machine = Proc_Washing(simpy_env, COST_TYPES[0]['WASHING_COST'], daily_events, dry_machine, washing_store, drying_store, batch_timeout=BATCH_TIMEOUT)
-    customer = Customer(simpy_env, COST_TYPES[0]['SHORTAGE_COST'], daily_events, satisfication, printer_store)
-    display = Display(simpy_env, daily_events)
+    # Satisfication, Customer, Packaging, Inspection, PostProcessing, Drying, Washing, Display 생성
+    # (Inspection이 재작업 Job ID를 Customer에서 발급받으므로 Customer를 먼저 생성)
+    satisfication = Satisfication(simpy_env, ctx)
+    customer = Customer(simpy_env, config.COST_TYPES[0]['SHORTAGE_COST'], ctx, satisfication, printer_store)
+    packaging = Proc_Packaging(simpy_env, config.COST_TYPES[0]['PACKAGING_COST'], ctx, satisfication)
+    inspection = Proc_Inspection(simpy_env, ctx, packaging, printer_store, customer)
+    post_processor = Proc_PostProcessing(simpy_env, config.COST_TYPES[0]['POSTPROCESSING_COST'], ctx, inspection)
+    dry_machine = Proc_Drying(simpy_env, config.COST_TYPES[0]['DRYING_COST'], ctx, post_processor, drying_store, batch_timeout=config.BATCH_TIMEOUT)
+    washing_machine = Proc_Washing(simpy_env, config.COST_TYPES[0]['WASHING_COST'], ctx, dry_machine, washing_store, drying_store, batch_timeout=config.BATCH_TIMEOUT)
+    display = Display(simpy_env, ctx)
     
     # Printer 생성 시 order_store와 washing_machine (즉, Washing.assign_order 호출) 전달
     printers = [
-        Proc_Build(simpy_env, COST_TYPES[0]['PRINTING_COST'], daily_events, pid, washing_machine, printer_store, washing_store)
-        for pid in PRINTERS.keys()
+        Proc_Build(simpy_env, config.COST_TYPES[0]['PRINTING_COST'], ctx, pid, washing_machine, printer_store, washing_store)
+        for pid in config.PRINTERS.keys()
     ]
 
     return simpy_env, printer_store, washing_store, drying_store, packaging, dry_machine, washing_machine, post_processor, customer, display, printers, daily_events, satisfication
@@ -1039,16 +1664,16 @@ def simpy_event_processes(simpy_env, packaging, post_processor, customer, displa
     """
     시뮬레이션의 주요 프로세스를 스케줄링합니다.
     
-    - display.track_days(): 매일의 보고서를 기록합니다.
+    - display.track_days(): 매일의 보고서 제목을 기록하고 일(day) 경계마다 day-end 훅을 호출합니다.
     - customer.create_jobs_continuously(): 지속적으로 주문(Order)을 생성합니다.
     - 각 Printer의 seize(): printer_store에 들어온 주문을 인쇄(Printing) 처리합니다.
     - washing_machine.seize(): washing_store에 전달된 주문을 세척 작업으로 처리합니다.
     - dry_machine.seize(): drying_store에 전달된 주문을 건조 작업으로 처리합니다.
     
-    Drying 단계에서 PostProcessing, 그리고 PostProcessing에서 Packaging으로 주문이 자동 전달됩니다.
+    Drying 단계에서 PostProcessing, PostProcessing에서 Inspection, 그리고 Inspection에서 Packaging으로 주문이 자동 전달됩니다.
     """
-    # 날짜 추적 프로세스 실행 (매일 보고서 기록)
-    simpy_env.process(display.track_days())
+    # 날짜 추적 시작 (매일 보고서 제목 기록 및 day-end 훅 호출)
+    display.track_days()
     
     # Customer가 지속적으로 주문을 생성하는 프로세스 실행
     simpy_env.process(customer.create_jobs_continuously())
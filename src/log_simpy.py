@@ -1,8 +1,13 @@
-DAILY_EVENTS = []
-DAILY_REPORTS = []
-COST_LOG = []
-SATISFICATION_LOG = []
-ITEM_LOG = []
+import glob
+import gzip
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# 일별 이벤트, 일별 보고서, 비용/만족도/Item 로그는 실행마다 새로 만드는 SimContext
+# (simulation.py의 daily_events, daily_reports, cost_log, satisfication_log, item_log)에 저장됩니다.
 DAILY_COST_REPORT = {
     'Holding cost': 0,
     'Printing cost': 0,
@@ -12,4 +17,428 @@ DAILY_COST_REPORT = {
     'Packaging cost': 0,
     'Delivery cost': 0,
     'Shortage cost' : 0
-}
\ No newline at end of file
+}
+
+#### 이벤트 로그 ###############################################################
+# 이벤트는 (이벤트 코드, 발생 시각, 인자 튜플) 형태로만 저장하고,
+# 문자열 변환은 로그를 출력하거나 읽을 때(iter) 수행합니다.
+# EVENT_FORMATS의 {clock}은 "시:분", {time}은 발생 시각, {0}, {1}...은 인자를 의미합니다.
+EV_DAY_HEADER = 0
+EV_JOB_CREATED = 1
+EV_ITEM_UNASSIGNED = 2
+EV_JOBS_SENT = 3
+EV_PRINT_START = 4
+EV_PRINTER_FREE = 5
+EV_BATCH_JOIN = 6
+EV_BATCH_NEW = 7
+EV_BATCH_WAIT = 8
+EV_BATCH_TIMEOUT = 9
+EV_BATCH_START = 10
+EV_BATCH_FINISH = 11
+EV_BATCH_REFILL = 12
+EV_PP_WAIT = 13
+EV_PP_START = 14
+EV_PP_FINISH = 15
+EV_PP_JOB_DONE = 16
+EV_PACK_START = 17
+EV_PACK_FINISH = 18
+EV_SATISFICATION = 19
+EV_SATISFICATION_NEGATIVE = 20
+EV_INSPECT_DEFECT = 21
+EV_REWORK_SENT = 22
+
+EVENT_FORMATS = {
+    EV_DAY_HEADER: "\n===== Day {0} Report: =====",
+    EV_JOB_CREATED: "{clock} - Job {0} created at time {time:.2f}.",
+    EV_ITEM_UNASSIGNED: "Item {0} could not be assigned: No suitable printer available (Item size: {1:.2f})",
+    EV_JOBS_SENT: "{clock} - {0} jobs accumulated. Sending batch to printer.",
+    EV_PRINT_START: "{clock} - Job {0} is printing on Printer {1} for {2} time units.",
+    EV_PRINTER_FREE: "{clock} - Printer {0} is now available.",
+    # 배치 이벤트의 {0}은 공정 이름("Washing", "Drying")
+    EV_BATCH_JOIN: "{clock} - Job {1} assigned to {0} Machine {2}. Batch: {3}",
+    EV_BATCH_NEW: "{clock} - Job {1} started new batch on {0} Machine {2}.",
+    EV_BATCH_WAIT: "{clock} - All {0} Machines busy/full. Job {1} added to waiting queue.",
+    EV_BATCH_TIMEOUT: "{clock} - Timeout reached on {0} Machine {1}. Processing batch: {2}",
+    EV_BATCH_START: "{clock} - {0} Machine {1} starts processing batch {3} for {2} time units.",
+    EV_BATCH_FINISH: "{clock} - {0} Machine {1} finished processing batch.",
+    EV_BATCH_REFILL: "{clock} - After processing, waiting Job {1} assigned to {0} Machine {2}. Batch: {3}",
+    EV_PP_WAIT: "{clock} - All workers busy. Item {0} of Job {1} added to waiting queue.",
+    EV_PP_START: "{clock} - Item {0} of Job {1} is starting on Worker {2} (Post-processing)",
+    EV_PP_FINISH: "{clock} - Item {0} of Job {1} is finishing on Worker {2} (Post-processing)",
+    EV_PP_JOB_DONE: "All items in Job {0} completed post-processing. Sending Job to Packaging.",
+    EV_PACK_START: "{clock} - Job {0} starts Packaging on Worker {1}.",
+    EV_PACK_FINISH: "{clock} - Job {0} finished Packaging on Worker {1}.",
+    EV_SATISFICATION: "Job {0}: Satisfication calculated as {1:.4f}\nTotal Satisfication: {2: .4f}",
+    EV_SATISFICATION_NEGATIVE: "Job {0}: No printer assigned, satisfication set to {1:.4f}\nTotal Satisfication: {2: .4f}",
+    EV_INSPECT_DEFECT: "{clock} - Inspection of Job {0}: {1} of {2} items defective. Items {3} sent to rework.",
+    EV_REWORK_SENT: "{clock} - Rework Job {0} with {1} defective items sent to printers.",
+}
+
+# 이벤트 코드 <-> 이름 ("PRINT_START" 등, 파일 기록에 사용)
+EVENT_NAMES = {code: name[3:] for name, code in list(globals().items()) if name.startswith("EV_")}
+EVENT_CODES = {name: code for code, name in EVENT_NAMES.items()}
+
+
+def format_event(record):
+    """(코드, 시각, 인자) 이벤트 레코드를 기존 로그와 같은 형식의 문자열로 변환"""
+    code, now, args = record
+    clock = f"{int(now % 24)}:{int((now % 1) * 60):02d}"
+    return EVENT_FORMATS[code].format(*args, clock=clock, time=now)
+
+
+class EventLog:
+    """
+    EventLog 클래스
+    ----------------
+    일별 이벤트를 구조화된 레코드로 저장하는 로그
+    기록(record) 시점에는 튜플만 추가하고, 반복(iter)할 때 format_event()로 문자열을 만듭니다.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, code, now, *args):
+        self.records.append((code, now, args))
+
+    def record_batch(self, code, now, *args, jobs):
+        """배치 이벤트 기록: 기록 시점의 배치 구성(job ID 목록)을 마지막 인자로 함께 저장"""
+        self.records.append((code, now, args + ([job.job_id for job in jobs],)))
+
+    def __iter__(self):
+        return map(format_event, self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def clear(self):
+        self.records.clear()
+
+    def close(self):
+        pass
+
+
+class NullEventLog(EventLog):
+    """이벤트 기록을 끈 상태의 로그 (record 호출 시 아무것도 저장하지 않음)"""
+    enabled = False
+
+    def record(self, code, now, *args):
+        pass
+
+    def record_batch(self, code, now, *args, jobs):
+        pass
+
+
+class FileEventSink(EventLog):
+    """
+    FileEventSink 클래스
+    ---------------------
+    이벤트를 메모리에 쌓아두지 않고 NDJSON 파일로 내보내는 이벤트 로그 (EventLog와 같은 인터페이스)
+    - 레코드는 buffer_size개까지 메모리 버퍼에 모았다가 한 번에 기록합니다. (clear() 호출 시에도 기록)
+    - 파일이 max_bytes(압축 전 기준)를 넘으면 다음 번호의 파일로 넘어갑니다.
+    - EVENT_SINK["SPILL_LOGS"]를 켜면 item_log, daily_reports의 완료된 행도 하루마다 CSV로 내보냅니다. (LogSpill)
+      예: events.ndjson -> events.00000.ndjson, events.00001.ndjson, ...
+    - compress=True이면 gzip으로 압축하여 기록합니다. (파일 이름 끝에 .gz 추가)
+    메모리에는 버퍼만 남으므로 시뮬레이션 기간과 관계없이 메모리 사용량이 일정합니다.
+    반복(iter)하면 아직 파일로 기록되지 않은 버퍼의 이벤트만 반환하며,
+    전체 이벤트는 read_events()로 파일에서 다시 읽을 수 있습니다.
+
+    한 줄의 형식: {"time": 발생 시각, "event": 이벤트 이름, "args": [인자...]}
+    """
+    def __init__(self, path, max_bytes=64 * 2**20, compress=False, buffer_size=4096):
+        super().__init__()
+        root, ext = os.path.splitext(path)
+        self.root = root
+        self.ext = (ext or ".ndjson") + (".gz" if compress else "")
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.buffer_size = buffer_size
+        self.segment = 0
+        self.segment_bytes = 0
+        self.file = None
+        self.total_records = 0
+        self.paths = []
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def record(self, code, now, *args):
+        self.records.append((code, now, args))
+        if len(self.records) >= self.buffer_size:
+            self.flush()
+
+    def record_batch(self, code, now, *args, jobs):
+        self.record(code, now, *args, [job.job_id for job in jobs])
+
+    def _open_segment(self):
+        path = f"{self.root}.{self.segment:05d}{self.ext}"
+        self.file = gzip.open(path, "wt", encoding="utf-8") if self.compress else open(path, "w", encoding="utf-8")
+        self.paths.append(path)
+        self.segment_bytes = 0
+
+    def flush(self):
+        """버퍼의 레코드를 파일에 한 번에 기록"""
+        if not self.records:
+            return
+        names = EVENT_NAMES
+        data = "".join(
+            json.dumps({"time": now, "event": names[code], "args": args}, separators=(",", ":")) + "\n"
+            for code, now, args in self.records
+        )
+        if self.file is None:
+            self._open_segment()
+        elif self.segment_bytes >= self.max_bytes:
+            self.file.close()
+            self.segment += 1
+            self._open_segment()
+        self.file.write(data)
+        self.segment_bytes += len(data)
+        self.total_records += len(self.records)
+        self.records.clear()
+
+    def __len__(self):
+        return self.total_records + len(self.records)
+
+    def clear(self):
+        """하루가 끝날 때 호출: 버퍼의 이벤트를 파일에 기록하고 메모리에서 비움"""
+        self.flush()
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def read_events(path):
+    """
+    FileEventSink가 기록한 파일들(path의 모든 번호 파일, .gz 포함)에서
+    (이벤트 코드, 발생 시각, 인자 튜플) 레코드를 기록 순서대로 반환(yield)합니다.
+    format_event()로 기존 로그와 같은 문자열을 만들 수 있습니다.
+    """
+    root, ext = os.path.splitext(path)
+    for segment in sorted(glob.glob(f"{glob.escape(root)}.[0-9][0-9][0-9][0-9][0-9]{ext or '.ndjson'}*")):
+        opener = gzip.open if segment.endswith(".gz") else open
+        with opener(segment, "rt", encoding="utf-8") as f:
+            for line in f:
+                event = json.loads(line)
+                yield EVENT_CODES[event["event"]], event["time"], tuple(event["args"])
+
+
+class LogSpill:
+    """
+    LogSpill 클래스
+    ----------------
+    ColumnarLog.spill()로 메모리에서 내보낸 행을 CSV 파일(compress=True이면 gzip)에 이어서 기록합니다.
+    기록된 전체 로그는 read_log()로 DataFrame으로 다시 읽을 수 있습니다.
+    """
+    def __init__(self, path, compress=False):
+        self.path = path + (".gz" if compress else "")
+        self.compress = compress
+        self.rows = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def write(self, frame):
+        opener = gzip.open if self.compress else open
+        with opener(self.path, "at", encoding="utf-8", newline="") as f:
+            frame.to_csv(f, index=False, header=self.rows == 0)
+        self.rows += len(frame)
+
+
+def read_log(path):
+    """LogSpill이 기록한 CSV(.gz) 파일을 DataFrame으로 읽기"""
+    return pd.read_csv(path)
+
+
+def make_log_spills(config):
+    """
+    EVENT_SINK["SPILL_LOGS"]가 True이면 item_log, daily_reports를 내보낼 LogSpill을 생성합니다.
+    파일 이름은 EVENT_SINK["PATH"]를 기준으로 정합니다. (예: events.item_log.csv, events.daily_reports.csv)
+    """
+    sink = config.EVENT_SINK
+    if not (sink["PATH"] and sink["SPILL_LOGS"]):
+        return {}
+    root = os.path.splitext(sink["PATH"])[0]
+    return {name: LogSpill(f"{root}.{name}.csv", sink["COMPRESS"]) for name in ("item_log", "daily_reports")}
+
+
+def make_event_log(config):
+    """
+    설정에 맞는 이벤트 로그를 생성합니다.
+    - EVENT_SINK["PATH"]가 지정되면 FileEventSink (파일로 기록)
+    - 아니면 PRINT_SIM_EVENTS가 True일 때 EventLog (메모리), False일 때 NullEventLog (기록 안 함)
+    """
+    sink = config.EVENT_SINK
+    if sink["PATH"]:
+        return FileEventSink(sink["PATH"], sink["MAX_BYTES"], sink["COMPRESS"], sink["BUFFER_SIZE"])
+    return EventLog() if config.PRINT_SIM_EVENTS else NullEventLog()
+
+
+#### 컬럼 기반 작업 기록 ########################################################
+# ITEM_LOG, DAILY_REPORTS와 같이 같은 키를 반복하는 dict 리스트 대신
+# 컬럼별 NumPy 배열에 기록합니다. 값이 없는 칸은 정수 컬럼은 -1, 실수 컬럼은 NaN입니다.
+# 공정 이름과 같은 문자열 컬럼은 (카테고리 목록) 튜플로 정의하며 정수 코드로 저장합니다.
+PROCESS_NAMES = ("Printing", "Washing", "Drying", "Post-Processing", "Packaging")
+
+ITEM_LOG_COLUMNS = {
+    'day': np.int32,
+    'job_id': np.int64,
+    'item_id': np.int64,
+    'width': np.int32,
+    'height': np.int32,
+    'depth': np.int32,
+    'create_time': np.float64,
+    'volume': np.int64,
+    'build_time': np.float64,
+    'post_processing_time': np.float64,
+}
+
+DAILY_REPORT_COLUMNS = {
+    'process': PROCESS_NAMES,
+    'job_id': np.int64,
+    'item_id': np.int64,
+    'printer_id': np.int32,
+    'worker_id': np.int32,
+    'machine_id': np.int32,
+    'start_time': np.float64,
+    'end_time': np.float64,
+}
+
+
+class ColumnarLog:
+    """
+    ColumnarLog 클래스
+    -------------------
+    고정된 컬럼 정의(columns)에 따라 행(row)을 컬럼별 NumPy 배열에 추가하는 기록기
+    배열이 가득 차면 크기를 두 배로 늘려(amortized O(1)) 추가하고,
+    append()가 반환한 행 번호로 특정 칸을 O(1)에 수정할 수 있습니다.
+    spill()로 앞쪽의 완료된 행을 파일로 내보내면 메모리에는 나머지 행만 남으며,
+    append()가 반환한 행 번호는 그대로 유효합니다. (offset: 내보낸 행 수)
+    column(), to_frame(), 반복(iter)은 메모리에 남아있는 행만 대상으로 합니다.
+    """
+    def __init__(self, columns, capacity=1024):
+        self.names = tuple(columns)
+        self.categories = {}       # 컬럼 이름 -> {카테고리: 코드}
+        self.category_names = {}   # 컬럼 이름 -> 카테고리 튜플
+        self.dtypes = {}
+        for name, dtype in columns.items():
+            if isinstance(dtype, tuple):
+                self.categories[name] = {category: code for code, category in enumerate(dtype)}
+                self.category_names[name] = dtype
+                dtype = np.int8
+            self.dtypes[name] = np.dtype(dtype)
+        self.size = 0
+        self.offset = 0
+        self.capacity = capacity
+        self.columns = {name: self._empty(name, capacity) for name in self.names}
+
+    def _empty(self, name, capacity):
+        dtype = self.dtypes[name]
+        fill = np.nan if dtype.kind == 'f' else -1
+        return np.full(capacity, fill, dtype=dtype)
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name, old in self.columns.items():
+            new = self._empty(name, capacity)
+            new[:self.size] = old[:self.size]
+            self.columns[name] = new
+        self.capacity = capacity
+
+    def append(self, **row):
+        """행을 추가하고 행 번호(index)를 반환 (지정하지 않은 컬럼은 빈 값으로 남음)"""
+        if self.size == self.capacity:
+            self._grow()
+        index = self.size
+        columns = self.columns
+        for name, value in row.items():
+            if value is None:
+                continue
+            if name in self.categories:
+                value = self.categories[name][value]
+            columns[name][index] = value
+        self.size = index + 1
+        return self.offset + index
+
+    def update(self, index, name, value):
+        """append()가 반환한 행 번호의 컬럼 값을 수정"""
+        index -= self.offset
+        if index < 0:
+            raise IndexError(f"row {index + self.offset} has already been spilled")
+        if name in self.categories:
+            value = self.categories[name][value]
+        self.columns[name][index] = np.nan if value is None else value
+
+    def column(self, name):
+        """기록된 구간의 컬럼 배열(view)을 반환"""
+        return self.columns[name][:self.size]
+
+    def to_frame(self):
+        """
+        기록을 pandas DataFrame으로 반환
+        숫자 컬럼은 내부 배열의 view를 그대로 사용하므로 복사가 일어나지 않습니다.
+        (이후 추가/수정된 기록은 DataFrame에 반영되지 않을 수 있으므로 실행 종료 후 호출)
+        """
+        data = {}
+        for name in self.names:
+            values = self.column(name)
+            if name in self.categories:
+                values = pd.Categorical.from_codes(values, categories=list(self.category_names[name]))
+            data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+    @property
+    def end(self):
+        """지금까지 추가된 전체 행 수 (다음 append()가 반환할 행 번호)"""
+        return self.offset + self.size
+
+    def spill(self, upto, writer):
+        """
+        행 번호 upto 이전의 행들을 writer.write(DataFrame)로 내보내고 메모리에서 제거합니다.
+        내보낸 행 수를 반환합니다.
+        """
+        count = min(upto - self.offset, self.size)
+        if count <= 0:
+            return 0
+        writer.write(self.to_frame().iloc[:count])
+        for name, column in self.columns.items():
+            column[:self.size - count] = column[count:self.size]
+            column[self.size - count:self.size] = np.nan if self.dtypes[name].kind == 'f' else -1
+        self.size -= count
+        self.offset += count
+        return count
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return self._row(index)
+
+    def _row(self, index):
+        row = {}
+        for name in self.names:
+            value = self.columns[name][index].item()
+            if name in self.category_names:
+                value = self.category_names[name][value] if value >= 0 else None
+            row[name] = value
+        return row
+
+    def __iter__(self):
+        """행 단위 dict로 순회 (출력용)"""
+        lists = [self.column(name).tolist() for name in self.names]
+        for values in zip(*lists):
+            row = dict(zip(self.names, values))
+            for name, names in self.category_names.items():
+                row[name] = names[row[name]] if row[name] >= 0 else None
+            yield row
+
+    def clear(self):
+        self.size = 0
+        self.offset = 0
+        for name in self.names:
+            self.columns[name].fill(np.nan if self.dtypes[name].kind == 'f' else -1)
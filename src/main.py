@@ -1,119 +1,106 @@
 from config_Simpy import *  # 시뮬레이션 설정 및 구성 정보
 import environment as env  # 환경 생성 및 프로세스 정의 (수정된 create_env와 simpy_event_processes 포함)
-from log_simpy import *  # 로그 및 이벤트 기록
-import pandas as pd  # 데이터 분석 및 저장
+from simulation import SimContext, register_day_hooks, run_until_drained  # 실행 단위 상태 (설정, 로그, 비용 보고서)
+from daily_report import build_daily_report, load_daily_reports, write_daily_report  # Item별 공정 기록 내보내기
 import visualization
 
+# Step 0: 실행 단위 상태 생성 (설정 및 로그는 모두 ctx에 저장됨)
+ctx = SimContext()
+ITEM_LOG = ctx.item_log
+DAILY_REPORTS = ctx.daily_reports
+DAILY_COST_REPORT = ctx.daily_cost_report
+
 # Step 1: 환경 및 객체 초기화
 # 수정된 create_env는 아래 순서대로 반환합니다.
 # (simpy_env, packaging, dry_machine, washing_machine, post_processor, customer, display, printers, daily_events, satisfication)
 (simpy_env, printer_store, washing_store, drying_store, packaging, dry_machine, washing_machine, post_processor, 
- customer, display, printers, daily_events, satisfication) = env.create_env(DAILY_EVENTS)
-
-# Step 2: SimPy 이벤트 프로세스 설정
-# (PostProcessing는 Drying에서 호출되고, Packaging는 PostProcessing 내부로 전달되므로 별도 실행은 필요하지 않습니다.)
-env.simpy_event_processes(simpy_env, packaging, post_processor, customer, display, printers, washing_machine, dry_machine, daily_events)
+ customer, display, printers, daily_events, satisfication) = env.create_env(ctx)
 
-# Step 3: 시뮬레이션 실행 (하루 단위)
-for day in range(SIM_TIME):
-    simpy_env.run(until=simpy_env.now + 24)
-
-    if PRINT_SIM_EVENTS:
-        print(f"\n===== Daily Event Log for Day {day + 1} =====")
-        for log in daily_events:
-            print(log)
-    if PRINT_SIM_COST:
-        print(f"\n===== Daily Cost Report for Day {day + 1} =====")
-        for cost_type, cost_value in DAILY_COST_REPORT.items():
-            print(f"{cost_type}: ${cost_value:.2f}")
-    print(f"\n===== ITEM LOG for Day {day + 1} =====")
-    for item in ITEM_LOG:
-        if item['day'] == day + 1:
-            print(f"Item {item['job_id']}-{item['item_id']} | Width: {item['width']} x Height: {item['height']} x Depth: {item['depth']} = Volume: {item['volume']:.2f} | "
-                  f"Creation Time: {item['create_time']:.4f} | "
-                  f"Build Time: {item['build_time']} | Post-Processing Time: {item['post_processing_time']}")
+# Step 2: 일(day) 경계마다 호출할 훅 등록 (일별 출력 → 스냅샷, 비용 정산, 이벤트 로그 비우기)
+def report_day(day):
+    if day <= SIM_TIME:
+        if PRINT_SIM_EVENTS:
+            print(f"\n===== Daily Event Log for Day {day} =====")
+            for log in daily_events:
+                print(log)
+        if PRINT_SIM_COST:
+            print(f"\n===== Daily Cost Report for Day {day} =====")
+            for cost_type, cost_value in DAILY_COST_REPORT.items():
+                print(f"{cost_type}: ${cost_value:.2f}")
+        print(f"\n===== ITEM LOG for Day {day} =====")
+        for item in ITEM_LOG:
+            if item['day'] == day:
+                print(f"Item {item['job_id']}-{item['item_id']} | Width: {item['width']} x Height: {item['height']} x Depth: {item['depth']} = Volume: {item['volume']:.2f} | "
+                      f"Creation Time: {item['create_time']:.4f} | "
+                      f"Build Time: {item['build_time']:g} | Post-Processing Time: {item['post_processing_time']:g}")
+    else:
+        # 추가 작업 처리 기간: SIM_TIME 이후 아직 공정에 남아있는 Job을 처리하는 날
+        if PRINT_SIM_EVENTS:
+            print(f"\n===== Additional Daily Event Log for Day {day} =====")
+            for log in daily_events:
+                print(log)
+        if PRINT_SIM_COST:
+            print(f"\n===== Additional Cost Report for Day {day} =====")
+            for cost_type, cost_value in DAILY_COST_REPORT.items():
+                print(f"{cost_type}: ${cost_value:.2f}")
     if PRINT_SATISFICATION:
-        print(f"\n===== Total Satisfication for Day {day + 1}: {satisfication.total_satisfication:.4f} =====\n")
-
-    daily_events.clear()
-    env.Cost.clear_cost()
-
-# 추가 작업 처리: 아직 처리 중인 주문이나 대기열이 있다면 (예: Customer의 temp_item_list, printer_store, Washing의 washing_store, waiting_queue, Drying의 drying_store, waiting_queue, Packaging의 queue)
-day = SIM_TIME + 1
-while (
-    customer.temp_job_list or 
-    printer_store.items or
-    any(printer.is_busy for printer in printers) or 
-    washing_store.items or 
-    drying_store.items or 
-    washing_machine.waiting_queue or 
-    any(len(machine["batch"]) > 0 for machine in washing_machine.machines.values()) or
-    dry_machine.waiting_queue or 
-    any(len(machine["batch"]) > 0 for machine in dry_machine.machines.values()) or
-    post_processor.queue or 
-    any(worker["is_busy"] for worker in post_processor.workers.values()) or
-    packaging.queue or 
-    any(worker["is_busy"] for worker in packaging.workers.values())
-):
+        print(f"\n===== Total Satisfication for Day {day}: {satisfication.total_satisfication:.4f} =====\n")
 
-    simpy_env.run(until=simpy_env.now + 24)
 
-    if PRINT_SIM_EVENTS:
-        print(f"\n===== Additional Daily Event Log for Day {day} =====")
-        for log in daily_events:
-            print(log)
-    if PRINT_SIM_COST:
-        print(f"\n===== Additional Cost Report for Day {day} =====")
-        for cost_type, cost_value in DAILY_COST_REPORT.items():
-            print(f"{cost_type}: ${cost_value:.2f}")
+display.add_day_end_hook(report_day)
+register_day_hooks(ctx, display)
 
-    if PRINT_SATISFICATION:
-        print(f"\n===== Total Satisfication for Day {day}: {satisfication.total_satisfication:.4f} =====\n")
+# Step 3: SimPy 이벤트 프로세스 설정
+# (PostProcessing는 Drying에서 호출되고, Packaging는 PostProcessing 내부로 전달되므로 별도 실행은 필요하지 않습니다.)
+env.simpy_event_processes(simpy_env, packaging, post_processor, customer, display, printers, washing_machine, dry_machine, daily_events)
 
-    daily_events.clear()
-    env.Cost.clear_cost()
-    day += 1
+# Step 4: 시뮬레이션 실행 (한 번의 env.run으로 SIM_TIME 동안 Job을 생성하고, 마지막 Job의 포장이 끝날 때까지 진행)
+# 일별 출력과 비용 정산은 위에서 등록한 day-end 훅에서 처리됩니다.
+run_until_drained(simpy_env, ctx.flow)
+display.finish()
+daily_events.close()  # 파일 이벤트 로그(EVENT_SINK)를 사용하는 경우 남은 버퍼를 기록하고 파일을 닫음
 
 # 시뮬레이션 종료 후 전체 item_LOG 출력
 print("\n============= Final ITEM LOG =============")
+if ctx.log_spills:
+    # EVENT_SINK["SPILL_LOGS"] 사용 시 완료된 행은 파일에 기록되어 있음
+    print(f"(spilled to {ctx.log_spills['item_log'].path})")
 for item in ITEM_LOG:
     print(f"Day {item['day']} | Item {item['job_id']}-{item['item_id']} | Volume: {item['volume']:.2f} | "
-          f"Build Time: {item['build_time']} | Post-Processing Time: {item['post_processing_time']}")
-"""
-# DAILY_REPORTS 데이터를 DataFrame으로 변환 및 CSV 파일로 저장
-print(DAILY_REPORTS)
-export_Daily_Report = []
-for record in DAILY_REPORTS:
-    if record['process'] == 'Printing':
-        export_Daily_Report.append({
-            "DAY": int(record['start_time'] // 24) + 1,
-            "item_ID": record['item_id'],
-            "ASSIGNED_PRINTER": record.get('printer_id', None),
-            "PRINTING_START": record['start_time'],
-            "PRINTING_FINISH": record['end_time'],
-            "ASSIGNED_POSTPROCESS_WORKER": None,
-            "POSTPROCESSING_START": None,
-            "POSTPROCESSING_FINISH": None,
-            "ASSIGNED_PACKAGING_WORKER": None,
-            "PACKAGING_START": None,
-            "PACKAGING_FINISH": None
-        })
-    elif record['process'] == 'Post-Processing':
-        for item in export_Daily_Report:
-            if item['item_ID'] == record['item_id']:
-                item["ASSIGNED_POSTPROCESS_WORKER"] = record.get('worker_id', None)
-                item["POSTPROCESSING_START"] = record['start_time']
-                item["POSTPROCESSING_FINISH"] = record['end_time']
-    elif record['process'] == 'Packaging':
-        for item in export_Daily_Report:
-            if item['item_ID'] == record['item_id']:
-                item["ASSIGNED_PACKAGING_WORKER"] = record.get('worker_id', None)
-                item["PACKAGING_START"] = record['start_time']
-                item["PACKAGING_FINISH"] = record['end_time']
+          f"Build Time: {item['build_time']:g} | Post-Processing Time: {item['post_processing_time']:g}")
+
+# 배치 타임아웃 타이머 통계 (배치가 먼저 출발하여 취소된 타이머는 깨어나지 않음)
+print("\n============= Batch Timeout Timers =============")
+for station, machine in (("Washing", washing_machine), ("Drying", dry_machine)):
+    stats = machine.batch_timers.stats()
+    print(f"{station}: scheduled {stats['scheduled']} | cancelled {stats['cancelled']} | expired {stats['expired']} | "
+          f"wakeups {stats['wakeups']} | avoided wakeups {stats['avoided_wakeups']}")
+
+# 단계별 KPI (시뮬레이션 중 누적된 시간 가중 가동률, 대기열 길이, 대기/흐름 시간)
+print("\n============= Station KPIs =============")
+for station, stats in ctx.station_stats.items():
+    summary = stats.summary()
+    line = (f"{station}: utilization {summary['utilization']:.1%} | mean queue {summary['queue_mean']:.2f} "
+            f"(max {summary['queue_max']}) | waiting {summary['waiting_mean']:.2f}h | flow {summary['flow_mean']:.2f}h")
+    if "batch_fill_mean" in summary:
+        line += f" | batch fill {summary['batch_fill_mean']:.1%}"
+    print(line)
 
-daily_reports = pd.DataFrame(export_Daily_Report)
-daily_reports.to_csv("./Daily_Report.csv", index=False)
+# 검사/재작업 KPI (재작업 Job이 차지한 프린터 용량)
+print("\n============= Inspection / Rework =============")
+rework = ctx.rework_stats.summary()
+print(f"Inspected {rework['inspected_items']} items | defective {rework['defective_items']} ({rework['defect_rate']:.1%}) | "
+      f"rework jobs {rework['rework_jobs']} ({rework['rework_items']} items)")
+print(f"Rework printing {rework['rework_print_hours']:.2f}h of {rework['print_hours']:.2f}h "
+      f"({rework['rework_print_share']:.1%} of printing, {rework['rework_capacity_share']:.1%} of printer capacity)")
 
-if VISUALIZATION != False:
-    visualization.visualization(export_Daily_Report)
-"""
\ No newline at end of file
+# Item별 전체 공정(Printing → Washing → Drying → Post-Processing → Packaging) 기록을 CSV/Parquet으로 저장하고
+# Gantt 차트를 파일로 그림 (DAILY_REPORT 설정, 기본값은 둘 다 끔)
+gantt_path = DAILY_REPORT["GANTT"] if VISUALIZATION != False else None
+if DAILY_REPORT["PATH"] or gantt_path:
+    daily_report = build_daily_report(load_daily_reports(ctx))
+    if DAILY_REPORT["PATH"]:
+        paths = write_daily_report(daily_report, DAILY_REPORT["PATH"], DAILY_REPORT["PARQUET"])
+        print(f"\nDaily report ({len(daily_report)} rows) saved to {', '.join(paths)}")
+    if gantt_path:
+        print(f"Gantt chart saved to {visualization.visualization(daily_report, gantt_path)}")
@@ -0,0 +1,363 @@
+import math
+import os
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from queueing_model import estimate
+from replication import iter_chunked, replication_seeds, simulate, t_critical
+from sweep import expand_grid, parse_grid, point_config
+
+#### 자원 구성 최적화 ##########################################################
+# 만족도 제약 E[total_satisfication] >= target을 지키는 가장 싼 자원 구성(프린터, 세척기, 건조기, 후처리 작업자, 포장 작업자 수)을
+# 시뮬레이션으로 찾습니다. 구성의 비용(RESOURCE_COST)은 확정값이고 만족도만 확률적이므로,
+#   1) 실현 가능성 판정(feasibility check): 후보를 비용 오름차순으로 열어 두고, 각 후보의 replication 합
+#      Σ(Y_j - target)이 삼각형 연속 영역 ±max(0, h²S²/(2ε) - εr/2)를 벗어나면 가능/불가능으로 판정
+#      (Andradóttir & Kim의 fully sequential feasibility check, 허용 오차 ε, 후보 수로 Bonferroni 보정)
+#      가능한 후보가 나오면 그보다 비싼 후보는 더 실행하지 않음
+#   2) 선택(selection): 가장 싼 비용의 가능한 후보가 여러 개이면 KN 절차로 만족도가 가장 큰 후보를 선택 (무차별 구간 δ)
+# 모든 후보가 같은 replication 시드를 사용하므로(common random numbers) 후보 간 비교의 분산이 줄어듭니다.
+
+# 최적화할 knob -> 자원 설정 이름 (RESOURCE_COST의 키)
+RESOURCE_KNOBS = {
+    "printers": "PRINTERS",
+    "washing_machines": "WASHING_MACHINE",
+    "drying_machines": "DRY_MACHINE",
+    "post_processing_workers": "POST_PROCESSING_WORKER",
+    "packaging_workers": "PACKAGING_MACHINE",
+}
+# 기본 탐색 공간 (knob -> 후보 값)
+DEFAULT_SPACE = {
+    "printers": list(range(1, 7)),
+    "washing_machines": [1, 2, 3],
+    "drying_machines": [1, 2, 3],
+    "post_processing_workers": list(range(1, 7)),
+    "packaging_workers": [1, 2, 3],
+}
+
+
+def resource_cost(config):
+    """설정의 자원 구성 비용: RESOURCE_COST 단위 비용 × 자원 수의 합"""
+    return sum(unit_cost * len(getattr(config, name)) for name, unit_cost in config.RESOURCE_COST.items())
+
+
+def boundary_h2(n0, alpha):
+    """
+    sequential 절차의 연속 영역 상수 h² (Kim & Nelson, c = 1)
+    n0: 분산 추정에 쓰는 첫 replication 수, alpha: 비교 하나의 오류 확률
+    """
+    return (n0 - 1) * ((2 * alpha) ** (-2 / (n0 - 1)) - 1)
+
+
+def continuation(h2, variance, tolerance, r):
+    """r번째 replication에서 합 Σ(차이)의 연속 영역 반폭: max(0, h²S²/(2ε) - εr/2)"""
+    return max(0.0, h2 * variance / (2 * tolerance) - tolerance * r / 2)
+
+
+class Candidate:
+    """
+    Candidate 클래스
+    -----------------
+    탐색 공간의 자원 구성 하나
+    - point: knob 딕셔너리, config: point를 적용한 설정 객체, cost: resource_cost()
+    - values: replication 순서의 total_satisfication
+    - status: "open"(판정 중), "feasible", "infeasible", "screened"(분석 모델로 제외), "pruned"(더 싼 가능한 구성이 있어 실행 안 함),
+              "selected", "eliminated"(선택 단계에서 탈락), "undecided"(예산 소진)
+    - decided_at: 판정(또는 탈락)한 replication 수
+    """
+    def __init__(self, candidate_id, point, config, cost):
+        self.candidate_id = candidate_id
+        self.point = point
+        self.config = config
+        self.cost = cost
+        self.values = []
+        self.status = "open"
+        self.decided_at = None
+
+    @property
+    def n(self):
+        return len(self.values)
+
+    def mean(self):
+        return float(np.mean(self.values)) if self.values else math.nan
+
+    def half_width(self, confidence=0.95):
+        if self.n < 2:
+            return math.inf
+        return t_critical(self.n - 1, confidence) * float(np.std(self.values, ddof=1)) / math.sqrt(self.n)
+
+    def check_feasibility(self, target, tolerance, h2, n0):
+        """
+        지금까지의 replication으로 실현 가능성을 판정합니다. (판정되면 status를 바꾸고 True 반환)
+        분산 S²는 첫 n0개 replication으로 추정하고, r = n0부터 순서대로 연속 영역을 벗어나는지 확인합니다.
+        """
+        if self.n < n0:
+            return False
+        values = np.asarray(self.values, dtype=float)
+        variance = float(values[:n0].var(ddof=1))
+        sums = np.cumsum(values - target)
+        for r in range(n0, self.n + 1):
+            bound = continuation(h2, variance, tolerance, r)
+            if sums[r - 1] >= bound:
+                self.status, self.decided_at = "feasible", r
+                return True
+            if sums[r - 1] <= -bound:
+                self.status, self.decided_at = "infeasible", r
+                return True
+        return False
+
+
+class OptimizationResult:
+    """
+    OptimizationResult 클래스
+    ---------------------------
+    optimize()의 결과
+    - best: 선택된 Candidate (가능한 구성이 없으면 None)
+    - candidates: 탐색 공간의 모든 Candidate
+    - guaranteed: 예산 안에 모든 판정이 절차로 끝났고, best 이하 비용의 후보가 분석 모델로 제외(screened)되지 않았으면 True
+      (이때 확률 1 - alpha 이상으로 best는 E[만족도] >= target - ε이고, best보다 싼 구성은 모두 E[만족도] < target + ε,
+       같은 비용의 가능한 구성 중 best의 만족도는 최대값 - δ 이상)
+    - cpu_s: 모든 replication의 CPU 시간 합, replications: 실행한 replication 수
+    """
+    def __init__(self, best, candidates, target, guaranteed, alpha, cpu_s, replications):
+        self.best = best
+        self.candidates = candidates
+        self.target = target
+        self.guaranteed = guaranteed
+        self.alpha = alpha
+        self.cpu_s = cpu_s
+        self.replications = replications
+
+    def to_frame(self):
+        """후보마다 한 행인 DataFrame (knob 열, cost, status, n, decided_at, satisfication_mean, satisfication_half_width), 비용 순"""
+        rows = [
+            {**candidate.point, "cost": candidate.cost, "status": candidate.status, "n": candidate.n,
+             "decided_at": candidate.decided_at, "satisfication_mean": candidate.mean(),
+             "satisfication_half_width": candidate.half_width()}
+            for candidate in self.candidates
+        ]
+        return pd.DataFrame(rows).sort_values(["cost", "satisfication_mean"], ascending=[True, False], ignore_index=True)
+
+    def __repr__(self):
+        if self.best is None:
+            found = "no feasible configuration"
+        else:
+            found = (f"best={self.best.point}, cost={self.best.cost:g}, "
+                     f"total_satisfication={self.best.mean():.4f} ± {self.best.half_width():.4f} (n={self.best.n})")
+        return (f"OptimizationResult({found}, target={self.target:g}, guaranteed={self.guaranteed} "
+                f"(1 - alpha = {1 - self.alpha:.0%}), replications={self.replications}, cpu={self.cpu_s:.1f} s)")
+
+
+def run_candidate_chunk(tasks, cache_path=None):
+    """
+    프로세스 풀 작업자에서 실행되는 함수
+    tasks: (후보 번호, 설정 객체, replication 번호, seed) 튜플 리스트
+    반환값: (후보 번호, replication 번호, total_satisfication, CPU 시간) 튜플 리스트
+    """
+    rows = []
+    for candidate_id, config, replication, seed in tasks:
+        start = time.process_time()
+        result = simulate(config, seed, cache_path)
+        rows.append((candidate_id, replication, result.total_satisfication, time.process_time() - start))
+    return rows
+
+
+def optimize(target, space=None, base_config=None, fixed=None, tolerance=None, delta=None, alpha=0.05, n0=5, batch=5,
+             budget=600.0, workers=None, window=None, max_utilization=0.95, base_seed=0, cache_path=None, on_stage=None):
+    """
+    optimize 함수
+    ---------------
+    E[total_satisfication] >= target을 만족하는 가장 싼 자원 구성을 sequential ranking-and-selection으로 찾습니다.
+    매 단계마다 판정 중인 후보(비용이 가장 싼 window개)에 replication을 batch개씩 추가하여 프로세스 풀에서 함께 실행하고,
+    모든 replication의 CPU 시간 합이 budget초를 넘으면 멈춥니다.
+
+    매개변수:
+        target: 만족도 목표 (SIM_TIME 동안의 total_satisfication)
+        space: {knob: 후보 값 리스트} (RESOURCE_KNOBS의 knob, None이면 DEFAULT_SPACE)
+        base_config: 모든 후보에 공통으로 적용할 overrides 딕셔너리 (SIM_TIME 등)
+        fixed: 모든 후보에 공통으로 적용할 sweep knob 딕셔너리 (예: {"defect_rate": 0.1})
+        tolerance: 실현 가능성 판정의 허용 오차 ε (None이면 target의 2%)
+        delta: 선택 단계의 무차별 구간 δ (None이면 tolerance)
+        alpha: 전체 오류 확률 (절반은 실현 가능성 판정, 절반은 선택 단계)
+        n0: 분산 추정에 쓰는 첫 replication 수, batch: 단계마다 추가하는 replication 수
+        budget: CPU 시간 예산 (초, 모든 작업자의 합)
+        workers: 프로세스 수 (iter_chunked()와 같음), window: 동시에 판정하는 후보 수 (None이면 작업자 수 × 2)
+        max_utilization: 분석 모델(queueing_model.estimate)의 병목 가동률이 이 값 이상인 후보는 실행하지 않음 (None이면 사용 안 함)
+            제외된 후보가 best 이하 비용이면 guaranteed는 False
+        base_seed: replication 시드를 생성할 기준 시드
+        cache_path: 결과 캐시 SQLite 파일 경로
+        on_stage: 단계가 끝날 때마다 (단계 번호, 판정 중인 후보 수, 누적 CPU 시간)으로 호출할 함수
+    반환값: OptimizationResult
+    """
+    base_config = {"PRINT_SIM_EVENTS": False, **(base_config or {})}
+    space = space or DEFAULT_SPACE
+    for knob in space:
+        if knob not in RESOURCE_KNOBS:
+            raise KeyError(f"Unknown resource knob: {knob}")
+    if n0 < 2:
+        raise ValueError("n0 must be at least 2 to estimate the variance")
+    tolerance = tolerance if tolerance is not None else 0.02 * abs(target) or 1e-6
+    delta = delta if delta is not None else tolerance
+    window = window or 2 * (workers or os.cpu_count() or 1)
+
+    candidates = []
+    for candidate_id, point in enumerate(expand_grid(space)):
+        config = point_config({**(fixed or {}), **point}, base_config)
+        candidate = Candidate(candidate_id, point, config, resource_cost(config))
+        if max_utilization is not None:
+            line = estimate(config)
+            if max(stage.utilization for stage in line.stages.values()) >= max_utilization:
+                candidate.status = "screened"
+        candidates.append(candidate)
+    by_id = {candidate.candidate_id: candidate for candidate in candidates}
+
+    opened = sorted((candidate for candidate in candidates if candidate.status == "open"),
+                    key=lambda candidate: (candidate.cost, candidate.candidate_id))
+    h2_feasibility = boundary_h2(n0, alpha / 2 / max(len(opened), 1))
+    cpu_s = 0.0
+    replications = 0
+    stage = 0
+
+    def run_stage(targets):
+        """targets: (Candidate, 목표 replication 수) 리스트 -> 모자란 replication을 실행"""
+        nonlocal cpu_s, replications, stage
+        seeds = replication_seeds(max(count for _, count in targets), base_seed)
+        tasks = [
+            (candidate.candidate_id, candidate.config, replication, seeds[replication])
+            for candidate, count in targets
+            for replication in range(candidate.n, count)
+        ]
+        results = {}
+        for candidate_id, replication, value, cpu in iter_chunked(
+                partial(run_candidate_chunk, cache_path=cache_path), tasks, workers):
+            results[candidate_id, replication] = value
+            cpu_s += cpu
+        # replication 순서대로 추가 (완료 순서와 관계없이 합 Σ(Y_j - target)이 같은 순서를 따르도록)
+        for (candidate_id, replication), value in sorted(results.items()):
+            by_id[candidate_id].values.append(value)
+        replications += len(tasks)
+        stage += 1
+
+    # 1) 실현 가능성 판정: 가장 싼 가능한 구성의 비용 이하인 후보만 판정
+    budget_exhausted = False
+    while True:
+        best_cost = min((candidate.cost for candidate in opened if candidate.status == "feasible"), default=math.inf)
+        active = [candidate for candidate in opened if candidate.status == "open" and candidate.cost <= best_cost][:window]
+        if not active:
+            break
+        if cpu_s >= budget:
+            budget_exhausted = True
+            break
+        run_stage([(candidate, candidate.n + (n0 if candidate.n == 0 else batch)) for candidate in active])
+        for candidate in active:
+            candidate.check_feasibility(target, tolerance, h2_feasibility, n0)
+        if on_stage is not None:
+            on_stage(stage, len(active), cpu_s)
+
+    best_cost = min((candidate.cost for candidate in opened if candidate.status == "feasible"), default=math.inf)
+    for candidate in opened:
+        if candidate.status == "open":
+            candidate.status = "pruned" if candidate.cost > best_cost else "undecided"
+
+    # 2) 선택: 가장 싼 비용의 가능한 구성 중 만족도가 가장 큰 구성 (KN 절차, CRN)
+    survivors = [candidate for candidate in opened if candidate.status == "feasible" and candidate.cost == best_cost]
+    if len(survivors) > 1:
+        h2_selection = boundary_h2(n0, alpha / 2 / (len(survivors) - 1))
+        run_stage([(candidate, max(c.n for c in survivors)) for candidate in survivors])
+        r = survivors[0].n
+        while len(survivors) > 1:
+            values = np.array([candidate.values[:r] for candidate in survivors], dtype=float)
+            totals = values.sum(axis=1)
+            eliminated = set()
+            open_pairs = False  # 연속 영역이 남은 쌍이 없으면 남은 후보는 모두 δ 안이므로 평균이 가장 큰 후보 선택
+            for i in range(len(survivors)):
+                for l in range(len(survivors)):
+                    if i == l:
+                        continue
+                    variance = float((values[i, :n0] - values[l, :n0]).var(ddof=1))
+                    bound = continuation(h2_selection, variance, delta, r)
+                    open_pairs = open_pairs or bound > 0
+                    if totals[i] - totals[l] < -bound:
+                        eliminated.add(i)
+                        break
+            for i in eliminated:
+                survivors[i].status, survivors[i].decided_at = "eliminated", r
+            survivors = [candidate for i, candidate in enumerate(survivors) if i not in eliminated]
+            if len(survivors) <= 1 or not open_pairs:
+                break
+            if cpu_s >= budget:
+                budget_exhausted = True
+                break
+            r += batch
+            run_stage([(candidate, r) for candidate in survivors])
+            if on_stage is not None:
+                on_stage(stage, len(survivors), cpu_s)
+
+    best = max(survivors, key=lambda candidate: candidate.mean()) if survivors else None
+    if best is not None:
+        best.status = "selected"
+        for candidate in survivors:
+            if candidate is not best:
+                candidate.status = "eliminated"
+    guaranteed = not budget_exhausted and not any(candidate.status == "undecided" for candidate in opened)
+    # 분석 모델로 제외한 후보는 실행하지 않았으므로, best 이하 비용의 후보가 제외되었으면 보장이 성립하지 않음
+    if any(candidate.status == "screened" and (best is None or candidate.cost <= best.cost) for candidate in candidates):
+        guaranteed = False
+    return OptimizationResult(best, candidates, target, guaranteed, alpha, cpu_s, replications)
+
+
+def parse_space(specs):
+    """["printers=1:6", "washing_machines=1,2"] 형태의 문자열을 탐색 공간 딕셔너리로 변환 (a:b는 a부터 b까지의 정수)"""
+    space = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if ":" in values:
+            low, high = (int(value) for value in values.split(":"))
+            space[name.strip()] = list(range(low, high + 1))
+        else:
+            space.update(parse_grid([spec]))
+    return space
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Find the cheapest resource mix that meets a satisfaction target")
+    parser.add_argument("--target", type=float, required=True, help="minimum expected total_satisfication")
+    parser.add_argument("--space", nargs="+", default=[], metavar="KNOB=LOW:HIGH",
+                        help=f"candidate values per resource (default {DEFAULT_SPACE}); knobs: {', '.join(RESOURCE_KNOBS)}")
+    parser.add_argument("--sim-time", type=int, default=30, help="SIM_TIME of every replication (days)")
+    parser.add_argument("--fixed", nargs="+", default=[], metavar="KNOB=VALUE",
+                        help="sweep knobs applied to every candidate, e.g. defect_rate=0.1")
+    parser.add_argument("--tolerance", type=float, default=None, help="feasibility tolerance (default 2%% of target)")
+    parser.add_argument("--delta", type=float, default=None, help="indifference zone for ties in cost")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--n0", type=int, default=5, help="first-stage replications per candidate")
+    parser.add_argument("--batch", type=int, default=5, help="replications added per candidate per stage")
+    parser.add_argument("--budget", type=float, default=600.0, help="CPU seconds summed over all workers")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--window", type=int, default=None, help="candidates checked at the same time")
+    parser.add_argument("--max-utilization", type=float, default=0.95,
+                        help="skip candidates whose analytical bottleneck utilization is at or above this")
+    parser.add_argument("--no-screen", action="store_true", help="simulate every candidate (no analytical pre-screen)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", default=None, help="SQLite file for cached results of (config, seed) runs")
+    parser.add_argument("--out", default="optimizer_results.csv", help="per-candidate table (CSV)")
+    args = parser.parse_args()
+
+    space = {**DEFAULT_SPACE, **parse_space(args.space)} if args.space else DEFAULT_SPACE
+    start = time.perf_counter()
+    result = optimize(
+        args.target, space, {"SIM_TIME": args.sim_time},
+        {name: values[0] for name, values in parse_grid(args.fixed).items()}, args.tolerance, args.delta, args.alpha, args.n0, args.batch,
+        args.budget, args.workers, args.window, None if args.no_screen else args.max_utilization,
+        args.seed, args.cache,
+        on_stage=lambda stage, active, cpu: print(f"stage {stage}: {active} candidates | cpu {cpu:.1f} s"),
+    )
+    table = result.to_frame()
+    table.to_csv(args.out, index=False)
+    print(table[table["n"] > 0].to_string(index=False))
+    print(f"\n{table['status'].value_counts().to_dict()}")
+    print(f"{result}\nwall {time.perf_counter() - start:.1f} s -> {args.out}")
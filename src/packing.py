@@ -0,0 +1,203 @@
+import numpy as np
+
+#### 빌드 플레이트 packing ######################################################
+# Item 크기 배열(높이, 너비, 깊이 순서, ItemSampler와 같은 열 순서)을 프린터 빌드 볼륨(PRINTERS_SIZE)에 배치합니다.
+# 배치는 shelf(NFDH, Next-Fit Decreasing Height) 방식입니다.
+#   - Item을 깊이 내림차순으로 정렬한 뒤 너비 방향으로 한 줄(row)씩 채우고,
+#   - 줄을 깊이 방향으로 쌓아 한 층(layer)을 채우고, 층을 높이 방향으로 쌓아 플레이트를 채웁니다.
+# 한 줄에 들어갈 Item 수는 누적 너비에 대한 searchsorted로 한 번에 구하므로,
+# Python 루프는 Item 수가 아니라 줄 수만큼만 돕니다. (수만 개의 Item도 수 ms 안에 배치)
+
+
+class PlateLayout:
+    """
+    PlateLayout 클래스
+    -------------------
+    pack_items()의 결과 (모든 배열은 입력 Item 순서)
+    - plate: Item이 배치된 플레이트 번호 (0부터)
+    - layer: 플레이트 안의 층 번호 (0부터)
+    - x, y, z: Item 배치 위치 (너비, 깊이, 높이 방향, mm)
+    - dims: 배치된 방향의 Item 크기 (높이, 너비, 깊이)
+    - plates: 사용한 플레이트 수
+    - plate_size: (높이, 너비, 깊이)
+    """
+    def __init__(self, plate, layer, x, y, z, dims, plates, plate_size):
+        self.plate = plate
+        self.layer = layer
+        self.x = x
+        self.y = y
+        self.z = z
+        self.dims = dims
+        self.plates = plates
+        self.plate_size = plate_size
+
+    def fill(self):
+        """플레이트별 바닥 면적 사용률 (Item 바닥 면적 합 / 플레이트 면적, 층이 여러 개면 1을 넘을 수 있음)"""
+        _, width, depth = self.plate_size
+        footprint = self.dims[:, 1] * self.dims[:, 2]
+        return np.bincount(self.plate, weights=footprint, minlength=self.plates) / (width * depth)
+
+    def build_times(self, item_build_times):
+        """
+        플레이트별 인쇄 시간: 한 층의 Item은 함께 인쇄되므로 층마다 가장 긴 Item build_time을 더한 값
+        item_build_times: 입력 Item 순서의 build_time 배열
+        """
+        if not len(self.plate):
+            return np.zeros(self.plates)
+        layer_key = self.plate * (int(self.layer.max()) + 1) + self.layer
+        layer_time = np.zeros(int(layer_key.max()) + 1)
+        np.maximum.at(layer_time, layer_key, np.asarray(item_build_times, dtype=float))
+        layer_plate = np.arange(len(layer_time)) // (int(self.layer.max()) + 1)
+        return np.bincount(layer_plate, weights=layer_time, minlength=self.plates)
+
+
+def plate_dimensions(printers_size):
+    """PRINTERS_SIZE 딕셔너리 -> (높이, 너비, 깊이)"""
+    return (printers_size["HEIGHT"], printers_size["WIDTH"], printers_size["DEPTH"])
+
+
+def orient_items(dims, plate_size):
+    """
+    Item을 가장 넓은 면이 바닥에 닿도록 눕힌 방향(높이 = 가장 짧은 변, 너비 = 가장 긴 변)으로 돌립니다.
+    눕힌 방향이 플레이트에 맞지 않는 Item은 원래 방향을 유지합니다.
+    """
+    dims = np.asarray(dims, dtype=float).reshape(-1, 3)
+    flat = np.sort(dims, axis=1)[:, [0, 2, 1]]
+    fits = (flat <= np.asarray(plate_size, dtype=float)).all(axis=1)
+    return np.where(fits[:, None], flat, dims)
+
+
+def pack_items(dims, plate_size, gap=0.0, max_layers=None, rotate=True):
+    """
+    pack_items 함수
+    -----------------
+    Item들을 shelf(NFDH) 방식으로 필요한 만큼의 플레이트에 배치합니다.
+
+    매개변수:
+        dims: Item 크기 배열 (n × 3, 높이/너비/깊이, mm)
+        plate_size: 플레이트 크기 (높이, 너비, 깊이), plate_dimensions(PRINTERS_SIZE)
+        gap: Item 사이 간격 (mm)
+        max_layers: 플레이트 하나에 쌓을 최대 층 수 (None이면 높이가 허용하는 만큼)
+        rotate: True이면 orient_items()로 Item을 눕혀서 배치
+    반환값: PlateLayout
+    """
+    plate_height, plate_width, plate_depth = plate_size
+    dims = np.asarray(dims, dtype=float).reshape(-1, 3)
+    if rotate:
+        dims = orient_items(dims, plate_size)
+    n = len(dims)
+    plate = np.zeros(n, dtype=np.int64)
+    layer = np.zeros(n, dtype=np.int64)
+    x = np.zeros(n)
+    y = np.zeros(n)
+    z = np.zeros(n)
+    if n == 0:
+        return PlateLayout(plate, layer, x, y, z, dims, 0, plate_size)
+
+    # 간격은 Item 크기에 더하고, 플레이트 끝에서는 간격 하나만큼 여유를 둠
+    order = np.argsort(-dims[:, 2], kind="stable")
+    heights = dims[order, 0] + gap
+    widths = dims[order, 1] + gap
+    depths = dims[order, 2] + gap
+    cum_width = np.concatenate(([0.0], np.cumsum(widths)))
+    width_limit, depth_limit, height_limit = plate_width + gap, plate_depth + gap, plate_height + gap
+
+    plates, layers = 0, 0            # 현재 플레이트 번호, 현재 플레이트의 층 번호
+    layer_z, layer_height = 0.0, 0.0  # 현재 층의 바닥 높이, 현재 층에서 가장 높은 Item
+    row_y = 0.0                      # 현재 층에서 다음 줄의 깊이 방향 위치
+    start = 0
+    while start < n:
+        # 한 줄: 누적 너비가 플레이트 너비를 넘지 않는 데까지
+        end = int(np.searchsorted(cum_width, cum_width[start] + width_limit, side="right")) - 1
+        end = max(end, start + 1)
+        row_depth = depths[start]  # 깊이 내림차순이므로 첫 Item이 줄의 깊이
+        row_height = heights[start:end].max()
+
+        if row_y + row_depth > depth_limit:
+            # 층이 꽉 참: 다음 층 (최대 층 수나 높이를 넘으면 다음 플레이트)
+            layer_z += layer_height
+            layers += 1
+            row_y, layer_height = 0.0, 0.0
+        if (max_layers is not None and layers >= max_layers) or layer_z + row_height > height_limit:
+            if layer_z > 0 or row_y > 0:
+                plates += 1
+            layers, layer_z, row_y, layer_height = 0, 0.0, 0.0, 0.0
+
+        index = order[start:end]
+        plate[index] = plates
+        layer[index] = layers
+        x[index] = cum_width[start:end] - cum_width[start]
+        y[index] = row_y
+        z[index] = layer_z
+        row_y += row_depth
+        layer_height = max(layer_height, row_height)
+        start = end
+
+    return PlateLayout(plate, layer, x, y, z, dims, plates + 1, plate_size)
+
+
+def fit_prefix(dims, counts, plate_size, gap=0.0, max_layers=None, rotate=True):
+    """
+    fit_prefix 함수
+    -----------------
+    Job 순서(디스패칭 순서)를 유지하면서 플레이트 하나에 함께 배치할 수 있는 가장 긴 앞쪽 Job 수를 구합니다.
+    Job 수에 대해 이분 탐색하므로 pack_items()를 약 log2(Job 수)번만 호출합니다.
+    (첫 Job 하나가 플레이트 하나를 넘더라도 최소 1을 반환)
+
+    매개변수:
+        dims: 모든 Job의 Item 크기를 Job 순서대로 이어 붙인 배열 (n × 3)
+        counts: Job별 Item 수
+    반환값: (Job 수, 그 Job들의 PlateLayout)
+    """
+    dims = np.asarray(dims, dtype=float).reshape(-1, 3)
+    ends = np.cumsum(counts, dtype=np.int64)
+
+    def layout(k):
+        return pack_items(dims[:ends[k - 1]], plate_size, gap, max_layers, rotate)
+
+    best_k, best = 1, layout(1)
+    if best.plates > 1:
+        return best_k, best
+
+    # 바닥 면적 합이 플레이트 면적 × 층 수를 넘는 Job 수는 확인하지 않음 (탐색 상한)
+    plate_height, plate_width, plate_depth = plate_size
+    oriented = orient_items(dims, plate_size) if rotate else dims
+    area = np.cumsum((oriented[:, 1] + gap) * (oriented[:, 2] + gap))
+    layers = max_layers if max_layers is not None else max(1, int(plate_height // max(oriented[:, 0].min(), 1)))
+    capacity = (plate_width + gap) * (plate_depth + gap) * layers
+    within = np.searchsorted(area, capacity, side="right")  # 면적 기준으로 들어갈 수 있는 Item 수
+    low, high = 1, max(1, int(np.searchsorted(ends, within, side="right")))
+
+    while low < high:
+        middle = (low + high + 1) // 2
+        candidate = layout(middle)
+        if candidate.plates <= 1:
+            low, best_k, best = middle, middle, candidate
+        else:
+            high = middle - 1
+    return best_k, best
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from config_Simpy import JOB_TYPES, PACKING, PRINTERS_SIZE
+
+    parser = argparse.ArgumentParser(description="Pack random aligner parts onto build plates and time the heuristic")
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = JOB_TYPES["DEFAULT"]
+    low = [config["HEIGHT_RANGE"][0], config["WIDTH_RANGE"][0], config["DEPTH_RANGE"][0]]
+    high = [config["HEIGHT_RANGE"][1], config["WIDTH_RANGE"][1], config["DEPTH_RANGE"][1]]
+    dims = np.random.default_rng(args.seed).integers(low, high, size=(args.items, 3))
+    plate_size = plate_dimensions(PRINTERS_SIZE)
+
+    start = time.perf_counter()
+    result = pack_items(dims, plate_size, PACKING["GAP"], PACKING["MAX_LAYERS"], PACKING["ROTATE"])
+    elapsed = time.perf_counter() - start
+    fill = result.fill()
+    print(f"{args.items:,} items -> {result.plates} plates in {elapsed * 1000:.1f} ms | "
+          f"items per plate {args.items / result.plates:,.0f} | mean footprint fill {fill.mean():.1%}")
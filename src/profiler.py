@@ -0,0 +1,285 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import pandas as pd
+import simpy
+
+# 구간 시간을 측정할 공정 클래스 메서드
+PROFILED_METHODS = ("seize", "delay", "release")
+# 구간 시간을 측정할 로그 기록 메서드: (ctx 속성 이름, 메서드 이름)
+PROFILED_LOGS = (
+    ("daily_events", "record"),
+    ("daily_events", "record_batch"),
+    ("daily_reports", "append"),
+    ("item_log", "append"),
+)
+
+
+class SimProfiler:
+    """
+    SimProfiler 클래스
+    -------------------
+    시뮬레이션 실행 한 번의 실행 시간이 어디에 쓰이는지 측정하는 프로파일러 (run_simulation(profiler=...)로 사용)
+    - 구간(section) 시간: Proc_* 객체의 seize/delay/release, 로그 기록, SimPy env.step()마다 호출 수와 실행 시간
+      구간은 중첩되어 측정되며, self 시간은 안쪽 구간의 시간을 뺀 값입니다.
+      (simpy.step의 self 시간 = SimPy 스케줄링과 측정하지 않은 콜백에 쓰인 시간)
+      SimPy 프로세스(제너레이터) 메서드는 재개(resume)될 때마다 한 구간으로 측정하고, 호출 수는 프로세스 생성 수입니다.
+    - 이벤트 수: env.step()에서 처리한 이벤트 수 (이벤트 종류별)
+    - 대기열 길이: sample_interval(시뮬레이션 시간)마다 printer_store, Washing/Drying waiting_queue,
+      PostProcessing/Packaging 작업자 대기열 길이를 기록 (이벤트를 추가하지 않고 env.step()에서 기록)
+    - cProfile: cprofile=True이면 실행 전체를 cProfile로 함께 측정 (구간 시간에 cProfile 부하가 포함됨)
+
+    write(out_dir)로 profile.prof(cProfile), profile.txt, stacks.collapsed(flamegraph.pl/speedscope 입력 형식),
+    sections.csv, events.csv, queues.csv를 저장합니다.
+    """
+    def __init__(self, sample_interval=1.0, cprofile=True):
+        self.sample_interval = sample_interval
+        self.cprofile = cProfile.Profile() if cprofile else None
+        self.stack = ["run"]
+        self.child_time = [0.0]
+        self.self_time = defaultdict(float)   # 구간 경로(튜플) -> self 시간(초)
+        self.calls = defaultdict(int)         # 구간 이름 -> 호출 수
+        self.total_time = defaultdict(float)  # 구간 이름 -> 포함(inclusive) 시간(초)
+        self.event_counts = defaultdict(int)  # 이벤트 종류 -> 처리 수
+        self.queue_samples = []
+        self.queue_probes = {}
+        self.next_sample = 0.0
+        self.wall_time = 0.0
+        self.env = None
+
+    def _enter(self, name):
+        self.stack.append(name)
+        self.child_time.append(0.0)
+        return time.perf_counter()
+
+    def _exit(self, start):
+        elapsed = time.perf_counter() - start
+        child = self.child_time.pop()
+        self.self_time[tuple(self.stack)] += elapsed - child
+        self.total_time[self.stack.pop()] += elapsed
+        self.child_time[-1] += elapsed
+
+    def timed(self, name, function):
+        """function 호출을 name 구간으로 측정하는 wrapper"""
+        def wrapper(*args, **kwargs):
+            self.calls[name] += 1
+            start = self._enter(name)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._exit(start)
+        return wrapper
+
+    def timed_process(self, name, function):
+        """SimPy 프로세스(제너레이터) 함수의 재개(resume)마다 name 구간으로 측정하는 wrapper"""
+        def wrapper(*args, **kwargs):
+            self.calls[name] += 1
+            generator = function(*args, **kwargs)
+            value, error = None, None
+            while True:
+                start = self._enter(name)
+                try:
+                    target = generator.send(value) if error is None else generator.throw(error)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    self._exit(start)
+                try:
+                    value, error = (yield target), None
+                except BaseException as exc:
+                    value, error = None, exc
+        return wrapper
+
+    def instrument(self, obj):
+        """obj(Proc_* 객체)의 seize/delay/release를 인스턴스 속성으로 감싸서 측정"""
+        class_name = type(obj).__name__
+        for method_name in PROFILED_METHODS:
+            method = getattr(obj, method_name, None)
+            if method is None:
+                continue
+            wrap = self.timed_process if _is_generator_function(method) else self.timed
+            setattr(obj, method_name, wrap(f"{class_name}.{method_name}", method))
+
+    def attach(self, simpy_env, ctx, printer_store, printers, washing_machine, dry_machine, post_processor, packaging):
+        """
+        create_env()로 만든 객체들을 측정 대상으로 등록합니다.
+        simpy_event_processes()보다 먼저 호출해야 프로세스 제너레이터도 측정됩니다.
+        """
+        self.env = simpy_env
+        for obj in (*printers, washing_machine, dry_machine, post_processor, post_processor.inspection, packaging):
+            self.instrument(obj)
+        for log_name, method_name in PROFILED_LOGS:
+            log = getattr(ctx, log_name)
+            setattr(log, method_name, self.timed(f"log.{log_name}.{method_name}", getattr(log, method_name)))
+
+        self.queue_probes = {
+            "printer_store": lambda: len(printer_store.items),
+            "washing_queue": lambda: len(washing_machine.waiting_queue),
+            "drying_queue": lambda: len(dry_machine.waiting_queue),
+            "post_processing_queue": lambda: len(post_processor.pool.queue),
+            "packaging_queue": lambda: len(packaging.pool.queue),
+        }
+        self.next_sample = simpy_env.now
+
+        step = simpy_env.step
+
+        def profiled_step():
+            next_time = simpy_env.peek()
+            if next_time != float("inf"):
+                # 다음 이벤트 시각 이전의 샘플 시각마다 현재 대기열 길이 기록
+                while self.next_sample <= next_time:
+                    self.sample_queues(self.next_sample)
+                    self.next_sample += self.sample_interval
+                self.event_counts[_next_event_type(simpy_env)] += 1
+            self.calls["simpy.step"] += 1
+            start = self._enter("simpy.step")
+            try:
+                step()
+            finally:
+                self._exit(start)
+
+        simpy_env.step = profiled_step
+
+    def sample_queues(self, now):
+        self.queue_samples.append((now, *(probe() for probe in self.queue_probes.values())))
+
+    @contextmanager
+    def running(self):
+        """실행 구간: 실행 시간(wall time)을 재고 cProfile을 켭니다."""
+        start = time.perf_counter()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+        try:
+            yield self
+        finally:
+            if self.cprofile is not None:
+                self.cprofile.disable()
+            self.wall_time += time.perf_counter() - start
+
+    @property
+    def total_events(self):
+        return sum(self.event_counts.values())
+
+    def sections(self):
+        """구간별 호출 수, 포함 시간, self 시간, 호출당 평균 시간(µs) DataFrame (self 시간 내림차순)"""
+        self_by_name = defaultdict(float)
+        for path, seconds in self.self_time.items():
+            self_by_name[path[-1]] += seconds
+        rows = [
+            {
+                "section": name,
+                "calls": self.calls[name],
+                "total_s": self.total_time[name],
+                "self_s": self_by_name[name],
+                "mean_us": self.total_time[name] / self.calls[name] * 1e6 if self.calls[name] else 0.0,
+            }
+            for name in self.total_time
+        ]
+        frame = pd.DataFrame(rows, columns=["section", "calls", "total_s", "self_s", "mean_us"])
+        return frame.sort_values("self_s", ascending=False, ignore_index=True)
+
+    def collapsed_stacks(self):
+        """flamegraph 입력 형식(collapsed stacks)의 줄 리스트: "run;simpy.step;Proc_Washing.delay <µs>" """
+        lines = []
+        for path, seconds in sorted(self.self_time.items()):
+            microseconds = int(round(seconds * 1e6))
+            if microseconds > 0:
+                lines.append(f"{';'.join(path)} {microseconds}")
+        outside = int(round((self.wall_time - self.total_time["simpy.step"]) * 1e6))
+        if outside > 0:
+            lines.append(f"run {outside}")
+        return lines
+
+    def queues(self):
+        """시뮬레이션 시각별 대기열 길이 샘플 DataFrame"""
+        return pd.DataFrame(self.queue_samples, columns=["time", *self.queue_probes])
+
+    def summary(self, top=15):
+        """실행 시간, 이벤트 처리 속도, 구간별 시간 비율, 대기열 최대/평균 길이 요약 문자열"""
+        lines = [
+            f"wall time {self.wall_time:.3f} s | events {self.total_events:,} | "
+            f"{self.total_events / self.wall_time if self.wall_time else 0:,.0f} events/s"
+            + (" (cProfile on)" if self.cprofile is not None else ""),
+            "",
+            f"{'section':<40}{'calls':>10}{'total s':>10}{'self s':>10}{'self %':>8}{'mean µs':>10}",
+        ]
+        for row in self.sections().head(top).itertuples():
+            share = row.self_s / self.wall_time * 100 if self.wall_time else 0.0
+            lines.append(f"{row.section:<40}{row.calls:>10,}{row.total_s:>10.3f}{row.self_s:>10.3f}"
+                         f"{share:>7.1f}%{row.mean_us:>10.1f}")
+        queues = self.queues()
+        if len(queues):
+            lines.append("")
+            lines.append("queue length: " + " | ".join(
+                f"{name} mean {queues[name].mean():.2f} max {queues[name].max()}" for name in self.queue_probes))
+        return "\n".join(lines)
+
+    def write(self, out_dir):
+        """측정 결과 파일을 out_dir에 저장하고 파일 경로 리스트를 반환"""
+        os.makedirs(out_dir, exist_ok=True)
+        paths = []
+
+        def path(name):
+            paths.append(os.path.join(out_dir, name))
+            return paths[-1]
+
+        if self.cprofile is not None:
+            self.cprofile.dump_stats(path("profile.prof"))
+            text = io.StringIO()
+            pstats.Stats(self.cprofile, stream=text).sort_stats("cumulative").print_stats(40)
+            with open(path("profile.txt"), "w", encoding="utf-8") as f:
+                f.write(text.getvalue())
+        with open(path("stacks.collapsed"), "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
+        self.sections().to_csv(path("sections.csv"), index=False)
+        pd.DataFrame(sorted(self.event_counts.items()), columns=["event", "count"]).to_csv(path("events.csv"), index=False)
+        self.queues().to_csv(path("queues.csv"), index=False)
+        return paths
+
+
+def _is_generator_function(method):
+    code = getattr(getattr(method, "__func__", method), "__code__", None)
+    return code is not None and bool(code.co_flags & 0x20)  # CO_GENERATOR
+
+
+def _next_event_type(simpy_env):
+    """
+    다음에 처리될 이벤트의 클래스 이름
+    SimPy는 다음 이벤트 객체를 공개 API로 제공하지 않으므로(peek()는 시각만 반환) 내부 이벤트 큐를 직접 읽습니다.
+    큐 항목 형식 (time, priority, eid, event)은 simpy 4.1.2 기준이며, 이 함수 밖에서는 _queue에 접근하지 않습니다.
+    다른 버전에서 큐가 없거나 형식이 달라 이벤트를 찾지 못하면 "unknown"으로 셉니다. (총 이벤트 수는 그대로 정확함)
+    """
+    queue = getattr(simpy_env, "_queue", None)
+    try:
+        event = queue[0][-1]
+    except (TypeError, IndexError, KeyError):
+        return "unknown"
+    return type(event).__name__ if isinstance(event, simpy.events.Event) else "unknown"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from simulation import build_config, run_simulation
+
+    parser = argparse.ArgumentParser(description="Profile one simulation run")
+    parser.add_argument("--sim-time", type=int, default=None, help="SIM_TIME override (days)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="queue sampling interval (simulated hours)")
+    parser.add_argument("--no-cprofile", action="store_true", help="section timings only (lower overhead)")
+    parser.add_argument("--out", default="profile_output")
+    args = parser.parse_args()
+
+    overrides = {"PRINT_SIM_EVENTS": False, "PRINT_SIM_COST": False}
+    if args.sim_time is not None:
+        overrides["SIM_TIME"] = args.sim_time
+    profiler = SimProfiler(args.sample_interval, cprofile=not args.no_cprofile)
+    result = run_simulation(build_config(overrides), args.seed, profiler=profiler)
+    print(result)
+    print(profiler.summary())
+    print("\n" + "\n".join(profiler.write(args.out)))
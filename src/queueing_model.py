@@ -0,0 +1,374 @@
+import math
+
+from simulation import build_config
+
+# 분석 모델에서 사용하는 공정 단계 (StationStats 이름과 같은 순서)
+STAGES = ("Printing", "Washing", "Drying", "PostProcessing", "Packaging")
+
+# Item build_time, post_processing_time과 Job washing/drying/packaging 시간이 없을 때 공정에서 사용하는 기본값 (시간)
+DEFAULT_TIME = 1.0
+
+
+#### 대기행렬 근사식 ###########################################################
+
+def erlang_c(servers, load):
+    """M/M/c에서 도착한 작업이 기다려야 할 확률 (load = 도착률 × 평균 서비스 시간)"""
+    if load <= 0:
+        return 0.0
+    if load >= servers:
+        return 1.0
+    term, total = 1.0, 1.0
+    for k in range(1, servers):
+        term *= load / k
+        total += term
+    term *= load / servers
+    last = term / (1 - load / servers)
+    return last / (total + last)
+
+
+def ggc_wait(rate, service, servers, ca2, cs2):
+    """Allen-Cunneen 근사: G/G/c 평균 대기 시간 = (ca² + cs²) / 2 × M/M/c 평균 대기 시간"""
+    if rate <= 0 or service <= 0:
+        return 0.0
+    load = rate * service
+    if load >= servers:
+        return math.inf
+    return (ca2 + cs2) / 2 * erlang_c(servers, load) * service / (servers - load)
+
+
+def departure_scv(utilization, servers, ca2, cs2):
+    """
+    G/G/c 출발 간격의 변동계수 제곱 (Hopp-Spearman linking equation)
+    (서버가 여러 개이면 도착과 처리가 모두 일정해도 0보다 커지므로, 도착/처리 SCV 중 큰 값을 넘지 않도록 제한)
+    """
+    utilization = min(utilization, 1.0)
+    scv = 1 + (1 - utilization ** 2) * (ca2 - 1) + utilization ** 2 * (cs2 - 1) / math.sqrt(servers)
+    return min(max(scv, 0.0), max(ca2, cs2))
+
+
+def group_wait(group, servers, service):
+    """
+    같은 시각에 도착한 group개의 작업이 servers개의 빈 서버에서 차례로 시작할 때의 평균 대기 시간
+    (i번째 작업은 floor(i / servers)번의 서비스 시간을 기다림)
+    """
+    group = max(int(round(group)), 1)
+    if group <= servers:
+        return 0.0
+    rounds, remainder = divmod(group, servers)
+    waits = servers * rounds * (rounds - 1) / 2 + remainder * rounds
+    return service * waits / group
+
+
+def burst_wait(rate, group, servers, service, ca2):
+    """
+    작업이 group개씩 같은 시각에 도착할 때의 평균 대기 시간
+    - 그룹 안의 대기: group_wait
+    - 그룹 사이의 혼잡: 동시에 처리할 수 있는 그룹 수(floor(servers / group))만큼의 서버가 있고,
+      그룹 하나를 서버 여러 개가 나누어 처리하는 고객으로 보고 G/G/c 근사 (ca2는 그룹 도착 간격 SCV)
+    """
+    group = max(group, 1.0)
+    concurrent = max(int(servers // group), 1)
+    group_service = max(group * concurrent / servers, 1.0) * service
+    return group_wait(group, servers, service) + ggc_wait(rate / group, group_service, concurrent, ca2, 0.0)
+
+
+def fit_probability(job_type, printers_size):
+    """ItemSampler가 만드는 Item(각 변이 [MIN, MAX) 균등 정수)이 프린터 크기에 맞을 확률"""
+    probability = 1.0
+    for range_key, size_key in (("HEIGHT_RANGE", "HEIGHT"), ("WIDTH_RANGE", "WIDTH"), ("DEPTH_RANGE", "DEPTH")):
+        low, high = job_type[range_key]
+        probability *= min(max((printers_size[size_key] - low + 1) / (high - low), 0.0), 1.0)
+    return probability
+
+
+#### 공정 라인 모델 ###########################################################
+
+class StageEstimate:
+    """
+    StageEstimate 클래스
+    ---------------------
+    한 공정 단계의 근사 KPI (StationStats.summary()와 같은 이름 사용)
+    - throughput: 단계 처리율 (단위 시간당 Job 또는 Item 수, unit 참고)
+    - utilization: 서버(프린터, 머신, 작업자) 가동률
+    - waiting_mean: 도착부터 작업 시작까지의 평균 시간 (배치 구성 대기 포함)
+    - flow_mean: 도착부터 단계를 떠날 때까지의 평균 시간 (lead time)
+    - wip: 단계 안의 평균 Job/Item 수 (Little의 법칙, throughput × flow_mean)
+    """
+    __slots__ = ("stage", "unit", "servers", "throughput", "utilization", "waiting_mean", "service_mean",
+                 "flow_mean", "wip", "batch_size")
+
+    def __init__(self, stage, unit, servers, throughput, utilization, waiting_mean, service_mean, batch_size=None):
+        self.stage = stage
+        self.unit = unit
+        self.servers = servers
+        self.throughput = throughput
+        self.utilization = utilization
+        self.waiting_mean = waiting_mean
+        self.service_mean = service_mean
+        self.flow_mean = waiting_mean + service_mean
+        self.wip = throughput * self.flow_mean
+        self.batch_size = batch_size
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class LineEstimate:
+    """
+    LineEstimate 클래스
+    --------------------
+    estimate()의 결과: 단계별 StageEstimate와 라인 전체 KPI
+    - stable: 모든 단계의 가동률이 1 미만이면 True (아니면 대기열이 끝없이 늘어남)
+    - bottleneck: 가동률이 가장 높은 단계
+    - throughput: 라인 처리율 (Job/시간, 불안정하면 병목 단계의 처리 능력)
+    - lead_time: Job 하나가 Printing 도착부터 포장 완료까지 걸리는 평균 시간 (단계 flow_mean의 합)
+    - wip: 라인 전체의 평균 Job 수 (Little의 법칙)
+    """
+    def __init__(self, stages, job_rate):
+        self.stages = {stage.stage: stage for stage in stages}
+        self.stable = all(stage.utilization < 1 for stage in stages)
+        self.bottleneck = max(stages, key=lambda stage: stage.utilization).stage
+        utilization = self.stages[self.bottleneck].utilization
+        self.throughput = job_rate if self.stable else job_rate / utilization
+        self.lead_time = sum(stage.flow_mean for stage in stages) if self.stable else math.inf
+        self.wip = self.throughput * self.lead_time
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame([stage.as_dict() for stage in self.stages.values()])
+
+    def __repr__(self):
+        return (f"LineEstimate(stable={self.stable}, bottleneck={self.bottleneck}, "
+                f"throughput={self.throughput:.4f}/h, lead_time={self.lead_time:.2f}h, wip={self.wip:.2f})")
+
+
+def line_parameters(config):
+    """
+    설정 객체(build_config()/sweep.point_config()의 결과)에서 분석 모델에 필요한 값을 꺼냅니다.
+    estimate()를 많이 호출할 때는 이 딕셔너리를 직접 만들거나 수정해서 넘기면 설정 복사 비용이 없습니다.
+    """
+    packing = getattr(config, "PACKING", {"ENABLED": False})
+    inspection = getattr(config, "INSPECTION", {"DEFECT_RATE": 0.0, "REWORK_BATCH_SIZE": 1, "REWORK_TIMEOUT": 0})
+    return {
+        "arrival_interval": float(config.JOB_ARRIVAL_INTERVAL),
+        "job_list_size": config.CUSTOMER["JOB_LIST_SIZE"],
+        "item_size": config.CUSTOMER["ITEM_SIZE"],
+        "fit_probability": fit_probability(config.JOB_TYPES["DEFAULT"], config.PRINTERS_SIZE),
+        "printers": len(config.PRINTERS),
+        "washing_machines": len(config.WASHING_MACHINE),
+        "washing_size": sum(m["WASHING_SIZE"] for m in config.WASHING_MACHINE.values()) / max(len(config.WASHING_MACHINE), 1),
+        "drying_machines": len(config.DRY_MACHINE),
+        "drying_size": sum(m["DRYING_SIZE"] for m in config.DRY_MACHINE.values()) / max(len(config.DRY_MACHINE), 1),
+        "batch_timeout": config.BATCH_TIMEOUT,
+        "post_processing_workers": len(config.POST_PROCESSING_WORKER),
+        "packaging_workers": len(config.PACKAGING_MACHINE),
+        "packing": bool(packing["ENABLED"]),
+        "plate_layers": packing.get("MAX_LAYERS") or 1,
+        "defect_rate": inspection["DEFECT_RATE"],
+        "rework_batch_size": inspection["REWORK_BATCH_SIZE"],
+        "rework_timeout": inspection["REWORK_TIMEOUT"],
+    }
+
+
+def _batch_stage(stage, job_rate, group, ca2, machines, capacity, timeout, job_time):
+    """
+    Washing/Drying 배치 단계 근사
+    - 같은 시각에 도착한 group개의 Job으로 배치가 시작되고, capacity개가 차거나 timeout이 지나면 출발
+    - 배치 처리 시간은 배치 안 Job 처리 시간의 합 (Proc_Washing.delay와 같음)
+    반환값: (StageEstimate, 다음 단계 도착 group 크기, 출발 간격 SCV)
+    """
+    if job_rate <= 0 or machines == 0:
+        return StageEstimate(stage, "job", machines, 0.0, math.inf if job_rate > 0 else 0.0, 0.0, 0.0), group, ca2
+    if group >= capacity:
+        batch = capacity
+        forming = 0.0
+    else:
+        # timeout 동안 합류하는 Job 수: 도착이 규칙적이면(ca2 = 0) floor(λτ), 포아송(ca2 >= 1)이면 λτ 사이를 보간
+        joining = job_rate * timeout
+        regularity = min(ca2, 1.0)
+        batch = min(capacity, group + regularity * joining + (1 - regularity) * math.floor(joining))
+        # 먼저 도착한 group은 배치 출발까지 기다리고, 뒤에 합류한 Job은 평균 절반만 기다림
+        formation_time = min(timeout, (capacity - group) / job_rate)
+        forming = formation_time * (group + (batch - group) / 2) / batch
+    batch_service = batch * job_time
+    batch_rate = job_rate / batch
+    utilization = job_rate * job_time / machines
+    batches_per_group = math.ceil(group / capacity)
+    queueing = group_wait(batches_per_group, machines, batch_service) + ggc_wait(batch_rate, batch_service, machines, ca2, 0.0)
+    estimate = StageEstimate(stage, "job", machines, job_rate, utilization, forming + queueing, batch_service, batch)
+    return estimate, batch, departure_scv(utilization, machines, ca2, 0.0)
+
+
+def estimate(config=None, params=None):
+    """
+    estimate 함수
+    ---------------
+    Printing → Washing → Drying → PostProcessing → Packaging 라인의 정상 상태 KPI를 대기행렬 근사식으로 계산합니다.
+    SimPy 실행 없이 설정 하나당 수십 µs 안에 계산되므로, 시뮬레이션 전에 많은 후보 설정을 걸러내는 데 사용합니다.
+
+    근사 방법:
+    - 도착: JOB_ARRIVAL_INTERVAL마다 Job 하나, JOB_LIST_SIZE개씩 묶여서 printer_store에 들어감
+      (같은 시각에 도착한 묶음은 group_wait로, 묶음 사이 변동은 Allen-Cunneen G/G/c 근사로 대기 시간 계산)
+    - 서비스: 모든 공정 시간은 DEFAULT_TIME(1시간) 고정 (Printing은 Job의 Item 수 × 1시간, PACKING이면 플레이트 층 수 × 1시간)
+    - Washing/Drying: 배치 구성 대기(BATCH_TIMEOUT, 용량) + 배치 단위 G/G/c 대기, 배치 처리 시간은 Job 시간의 합
+    - 재작업(INSPECTION): 불량 Item이 REWORK_BATCH_SIZE개씩 재작업 Job으로 다시 인쇄되므로 모든 단계의 부하가 1 / (1 - DEFECT_RATE)배
+    - 단계 사이 출발 간격 변동은 linking equation으로 다음 단계 도착 변동으로 전달
+
+    매개변수:
+        config: 설정 객체 또는 overrides 딕셔너리 (None이면 config_Simpy.py 기본값)
+        params: line_parameters()의 결과 (주어지면 config 대신 사용)
+    반환값: LineEstimate
+    """
+    if params is None:
+        if config is None or isinstance(config, dict):
+            config = build_config(config)
+        params = line_parameters(config)
+    p = params
+
+    job_rate = 1.0 / p["arrival_interval"]
+    group = p["job_list_size"]
+    items_per_job = p["item_size"] * p["fit_probability"]
+
+    # 재작업: 불량 Item은 다시 인쇄되므로 Item 처리량이 1 / (1 - 불량률)배가 됨
+    defect_rate = min(p["defect_rate"], 0.999)
+    item_rate = job_rate * items_per_job / (1 - defect_rate)
+    rework_item_rate = item_rate * defect_rate
+    rework_jobs = 0.0
+    rework_size = 0.0
+    if rework_item_rate > 0:
+        rework_size = min(p["rework_batch_size"], 1 + rework_item_rate * p["rework_timeout"])
+        rework_jobs = rework_item_rate / rework_size
+    print_rate = job_rate + rework_jobs
+
+    # Printing: Job 하나를 프린터 하나가 처리 (Item 수 × 1시간), PACKING이면 같은 시각에 도착한 Job들을 플레이트 하나로 인쇄
+    printers = p["printers"]
+    if p["packing"]:
+        plate_time = p["plate_layers"] * DEFAULT_TIME
+        plate_rate = print_rate / group
+        utilization = plate_rate * plate_time / printers if printers else math.inf
+        waiting = ggc_wait(plate_rate, plate_time, printers, 0.0, 0.0) if printers else math.inf
+        printing = StageEstimate("Printing", "job", printers, print_rate, utilization, waiting, plate_time, group)
+        ca2 = departure_scv(utilization, max(printers, 1), 0.0, 0.0)
+    else:
+        service = item_rate / print_rate * DEFAULT_TIME if print_rate else 0.0
+        # 일반 Job과 재작업 Job의 처리 시간이 다르므로 혼합 분포의 SCV 사용
+        second_moment = (job_rate * (items_per_job * DEFAULT_TIME) ** 2
+                         + rework_jobs * (rework_size * DEFAULT_TIME) ** 2) / print_rate
+        cs2 = max(second_moment / service ** 2 - 1, 0.0) if service else 0.0
+        utilization = print_rate * service / printers if printers else math.inf
+        waiting = group_wait(group, printers, service) + ggc_wait(print_rate, service, printers, 0.0, cs2) if printers else math.inf
+        printing = StageEstimate("Printing", "job", printers, print_rate, utilization, waiting, service)
+        ca2 = departure_scv(utilization, max(printers, 1), 0.0, cs2)
+        group = min(group, printers)
+
+    washing, group, ca2 = _batch_stage("Washing", print_rate, group, ca2, p["washing_machines"], p["washing_size"],
+                                       p["batch_timeout"], DEFAULT_TIME)
+    drying, group, ca2 = _batch_stage("Drying", print_rate, group, ca2, p["drying_machines"], p["drying_size"],
+                                      p["batch_timeout"], DEFAULT_TIME)
+
+    # PostProcessing: 배치 하나의 모든 Item이 같은 시각에 도착
+    workers = p["post_processing_workers"]
+    item_group = group * item_rate / print_rate if print_rate else 0.0
+    utilization = item_rate * DEFAULT_TIME / workers if workers else math.inf
+    waiting = burst_wait(item_rate, item_group, workers, DEFAULT_TIME, ca2) if workers else math.inf
+    post_processing = StageEstimate("PostProcessing", "item", workers, item_rate, utilization, waiting, DEFAULT_TIME)
+    ca2 = departure_scv(utilization, max(workers, 1), ca2, 0.0)
+    # Job은 모든 Item의 후처리가 끝나야 포장으로 넘어감: 작업자가 충분하면 배치 단위로 함께 도착
+    group = max(1.0, min(group, workers / max(items_per_job, 1)))
+
+    # Packaging: 검사를 통과한 Job (재작업 Job 포함)
+    packers = p["packaging_workers"]
+    utilization = print_rate * DEFAULT_TIME / packers if packers else math.inf
+    waiting = burst_wait(print_rate, group, packers, DEFAULT_TIME, ca2) if packers else math.inf
+    packaging = StageEstimate("Packaging", "job", packers, print_rate, utilization, waiting, DEFAULT_TIME)
+
+    return LineEstimate([printing, washing, drying, post_processing, packaging], job_rate)
+
+
+def screen(points, base_config=None, max_utilization=0.95, max_lead_time=None):
+    """
+    screen 함수
+    -------------
+    sweep point(knob 딕셔너리) 리스트를 분석 모델로 평가하여, 조건을 만족하는 point만 시뮬레이션 후보로 남깁니다.
+    - 모든 단계의 가동률이 max_utilization 미만
+    - max_lead_time이 주어지면 추정 lead time이 그 이하
+    반환값: 모든 point의 추정치 DataFrame (knob 열, stable, bottleneck, throughput, lead_time, wip,
+            utilization_<단계>, keep)
+    """
+    import pandas as pd
+    from sweep import point_config
+
+    rows = []
+    for point in points:
+        line = estimate(point_config(point, base_config))
+        row = {**point, "stable": line.stable, "bottleneck": line.bottleneck, "throughput": line.throughput,
+               "lead_time": line.lead_time, "wip": line.wip}
+        for stage in STAGES:
+            row[f"utilization_{stage}"] = line.stages[stage].utilization
+        row["keep"] = (max(row[f"utilization_{stage}"] for stage in STAGES) < max_utilization
+                       and (max_lead_time is None or line.lead_time <= max_lead_time))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def validate(points, n_replications=3, base_config=None, base_seed=0, metrics=("utilization", "waiting_mean", "flow_mean")):
+    """
+    validate 함수
+    ---------------
+    point마다 분석 모델의 추정치와 시뮬레이션(n_replications번 평균)의 단계별 KPI를 비교합니다.
+    반환값: point, 단계, 지표마다 한 행인 DataFrame (knob 열, stage, metric, model, simulation, abs_error, rel_error)
+    """
+    import pandas as pd
+    from replication import replication_seeds
+    from simulation import run_simulation
+    from sweep import point_config
+
+    rows = []
+    seeds = replication_seeds(n_replications, base_seed)
+    for point_index, point in enumerate(points):
+        config = point_config(point, base_config)
+        line = estimate(config)
+        results = [run_simulation(config, seed) for seed in seeds]
+        for stage in STAGES:
+            for metric in metrics:
+                model = getattr(line.stages[stage], metric)
+                simulated = sum(result.station_stats[stage][metric] for result in results) / len(results)
+                rows.append({
+                    "point": point_index, **point, "stage": stage, "metric": metric,
+                    "model": model, "simulation": simulated,
+                    "abs_error": abs(model - simulated),
+                    "rel_error": abs(model - simulated) / abs(simulated) if simulated else math.nan,
+                })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from sweep import expand_grid, parse_grid
+
+    parser = argparse.ArgumentParser(description="Analytical queueing-network estimate of the print farm line")
+    parser.add_argument("--grid", nargs="+", default=[], metavar="NAME=V1,V2", help="sweep knobs (see sweep.py)")
+    parser.add_argument("--max-utilization", type=float, default=0.95)
+    parser.add_argument("--max-lead-time", type=float, default=None)
+    parser.add_argument("--validate", action="store_true", help="compare the estimates against the simulator")
+    parser.add_argument("-n", "--replications", type=int, default=3)
+    parser.add_argument("--sim-time", type=int, default=60, help="SIM_TIME (days) for --validate")
+    parser.add_argument("--out", default=None, help="CSV file for the screening or validation table")
+    args = parser.parse_args()
+
+    points = expand_grid(parse_grid(args.grid)) if args.grid else [{}]
+    if args.validate:
+        report = validate(points, args.replications, {"SIM_TIME": args.sim_time, "PRINT_SIM_EVENTS": False})
+        print(report.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+        summary = report.groupby("metric")["rel_error"].median()
+        print("\nmedian relative error: " + " | ".join(f"{metric} {error:.1%}" for metric, error in summary.items()))
+    else:
+        start = time.perf_counter()
+        report = screen(points, max_utilization=args.max_utilization, max_lead_time=args.max_lead_time)
+        elapsed = time.perf_counter() - start
+        print(report.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+        print(f"\n{len(points)} configurations screened in {elapsed * 1000:.1f} ms, {int(report['keep'].sum())} kept")
+    if args.out:
+        report.to_csv(args.out, index=False)
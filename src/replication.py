@@ -0,0 +1,208 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from statistics import NormalDist
+
+import numpy as np
+
+from result_cache import cached_run_simulation
+from simulation import run_simulation
+
+# 복제(replication)마다 수집하는 요약 KPI
+KPI_NAMES = ("total_cost", "total_satisfication", "makespan")
+
+
+def replication_seeds(n_replications, base_seed=0):
+    """base_seed의 SeedSequence에서 서로 독립적인 n개의 정수 시드를 생성합니다."""
+    children = np.random.SeedSequence(base_seed).spawn(n_replications)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def result_kpis(result):
+    """SimResult에서 KPI_NAMES의 값을 뽑아 딕셔너리로 반환합니다."""
+    return {kpi: getattr(result, kpi) for kpi in KPI_NAMES}
+
+
+def simulate(config, seed, cache_path=None):
+    """cache_path(SQLite 파일)가 주어지면 결과 캐시를 거쳐, 아니면 바로 시뮬레이션을 실행합니다."""
+    if cache_path is None:
+        return run_simulation(config, seed)
+    return cached_run_simulation(config, seed, cache_path)
+
+
+def run_replication_chunk(config, tasks, cache_path=None):
+    """
+    프로세스 풀 작업자에서 실행되는 함수
+    tasks: (replication 번호, seed) 튜플 리스트
+    각 replication의 KPI 딕셔너리 리스트를 반환합니다.
+    """
+    results = []
+    for replication, seed in tasks:
+        result = simulate(config, seed, cache_path)
+        results.append({"replication": replication, "seed": seed, **result_kpis(result)})
+    return results
+
+
+def iter_chunked(function, tasks, workers=None, chunksize=None):
+    """
+    iter_chunked 함수
+    -------------------
+    tasks를 chunksize개씩 묶어 function(chunk)를 프로세스 풀에서 실행하고,
+    각 chunk가 반환한 결과 리스트의 원소를 완료 순서대로 하나씩 반환(yield)합니다.
+    function은 모듈 최상위 함수(또는 그 partial)여야 합니다. (프로세스 간 전달을 위해 pickle 가능해야 함)
+
+    매개변수:
+        workers: 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스에서 순차 실행)
+        chunksize: 작업자에게 한 번에 넘길 task 수 (None이면 자동 결정)
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for task in tasks:
+            yield from function([task])
+        return
+
+    # 한 task가 짧으므로 여러 개를 묶어 프로세스 간 통신 비용을 줄임
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(tasks) / (workers * 4)))
+    chunks = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(function, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def iter_replications(n_replications, config=None, base_seed=0, workers=None, chunksize=None, cache_path=None):
+    """
+    iter_replications 함수
+    -------------------------
+    n개의 독립적인 시드로 시뮬레이션을 프로세스 풀에서 병렬 실행하고,
+    replication이 끝나는 대로(완료 순서) KPI 딕셔너리를 하나씩 반환(yield)합니다.
+
+    매개변수:
+        n_replications: 실행할 replication 수
+        config: 설정 overrides 딕셔너리 (모든 replication에 동일하게 적용)
+        base_seed: replication 시드를 생성할 기준 시드
+        workers: 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스에서 순차 실행)
+        chunksize: 작업자에게 한 번에 넘길 replication 수 (None이면 자동 결정)
+        cache_path: 결과 캐시 SQLite 파일 경로 (None이면 캐시 사용 안 함)
+    """
+    tasks = list(enumerate(replication_seeds(n_replications, base_seed)))
+    yield from iter_chunked(partial(run_replication_chunk, config, cache_path=cache_path), tasks, workers, chunksize)
+
+
+# 이 자유도까지는 t 분포 CDF를 정확히 계산하여 임계값을 구하고, 그보다 크면 Cornish-Fisher 전개를 사용
+# (전개의 오차는 자유도 30에서 95% 임계값 기준 1e-4 미만이지만, 자유도 1에서는 12.706 대신 9.711로 크게 틀림)
+T_EXACT_MAX_DF = 30
+
+
+def _t_cdf(t, df):
+    """
+    정수 자유도 df인 Student t 분포의 CDF (닫힌 형태, θ = atan(t / √df))
+    - df 홀수: 1/2 + (θ + sinθ·cosθ·(1 + 2/3·cos²θ + 2·4/(3·5)·cos⁴θ + ...)) / π
+    - df 짝수: 1/2 + sinθ/2 · (1 + 1/2·cos²θ + 1·3/(2·4)·cos⁴θ + ...)
+    """
+    theta = math.atan(t / math.sqrt(df))
+    sin, cos2 = math.sin(theta), math.cos(theta) ** 2
+    if df % 2 == 1:
+        term, total = 1.0, 1.0 if df > 1 else 0.0
+        for k in range(1, (df - 1) // 2):
+            term *= cos2 * (2 * k) / (2 * k + 1)
+            total += term
+        return 0.5 + (theta + sin * math.cos(theta) * total) / math.pi
+    term, total = 1.0, 1.0
+    for k in range(1, df // 2):
+        term *= cos2 * (2 * k - 1) / (2 * k)
+        total += term
+    return 0.5 + sin / 2 * total
+
+
+def t_critical(df, confidence=0.95):
+    """
+    Student t 분포의 양측 임계값 (scipy.stats.t.ppf(0.5 + confidence / 2, df)와 같은 값)
+    자유도 T_EXACT_MAX_DF 이하에서는 정확한 CDF(_t_cdf)를 이분법으로 풀어 계산하고 (오차 1e-10 미만),
+    그보다 큰 자유도에서는 Cornish-Fisher 전개 근사를 사용합니다. (scipy 없이 계산)
+    """
+    if df <= 0:
+        return math.inf
+    probability = 0.5 + confidence / 2
+    if df <= T_EXACT_MAX_DF and float(df).is_integer():
+        df = int(df)
+        low, high = 0.0, 1.0
+        while _t_cdf(high, df) < probability:
+            high *= 2
+        for _ in range(200):
+            middle = (low + high) / 2
+            if _t_cdf(middle, df) < probability:
+                low = middle
+            else:
+                high = middle
+            if high - low < 1e-12 * high:
+                break
+        return (low + high) / 2
+    z = NormalDist().inv_cdf(probability)
+    return (z
+            + (z ** 3 + z) / (4 * df)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3))
+
+
+def summarize(results, confidence=0.95, kpis=KPI_NAMES):
+    """
+    replication KPI들의 평균, 표준편차, 신뢰구간을 계산합니다.
+    반환값: {KPI 이름: {"mean", "std", "half_width", "ci_low", "ci_high", "n"}}
+    """
+    summary = {}
+    for kpi in kpis:
+        values = np.array([result[kpi] for result in results], dtype=float)
+        n = len(values)
+        mean = float(values.mean()) if n else math.nan
+        std = float(values.std(ddof=1)) if n > 1 else 0.0
+        half_width = t_critical(n - 1, confidence) * std / math.sqrt(n) if n > 1 else math.inf
+        summary[kpi] = {
+            "mean": mean,
+            "std": std,
+            "half_width": half_width,
+            "ci_low": mean - half_width,
+            "ci_high": mean + half_width,
+            "n": n,
+        }
+    return summary
+
+
+def run_replications(n_replications, config=None, base_seed=0, workers=None, confidence=0.95, on_result=None,
+                     cache_path=None):
+    """
+    run_replications 함수
+    ------------------------
+    iter_replications()로 모든 replication을 실행하고 (KPI 리스트, 요약 통계)를 반환합니다.
+    on_result가 주어지면 각 replication이 끝날 때마다 해당 KPI 딕셔너리로 호출합니다.
+    """
+    results = []
+    for result in iter_replications(n_replications, config, base_seed, workers, cache_path=cache_path):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    results.sort(key=lambda result: result["replication"])
+    return results, summarize(results, confidence)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Monte Carlo replications of the 3D print farm simulation")
+    parser.add_argument("-n", "--replications", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--cache", default=None, help="SQLite file for cached results of (config, seed) runs")
+    args = parser.parse_args()
+
+    # 대량 실행 시 이벤트 출력은 필요 없으므로 끔
+    _, summary = run_replications(args.replications, {"PRINT_SIM_EVENTS": False}, args.seed,
+                                  args.workers, args.confidence, cache_path=args.cache)
+    for kpi, stats in summary.items():
+        print(f"{kpi}: {stats['mean']:.4f} ± {stats['half_width']:.4f} "
+              f"({args.confidence:.0%} CI, n={stats['n']})")
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+import zlib
+
+from simulation import build_config, run_simulation
+
+# 결과에 영향을 주는 시뮬레이터 소스 파일 (내용이 바뀌면 캐시 키가 바뀜)
+SOURCE_FILES = ("environment.py", "simulation.py", "dispatching_method.py", "log_simpy.py", "station_stats.py", "packing.py")
+
+_source_version = None
+
+
+def source_version():
+    """시뮬레이터 소스 파일들의 SHA-256 해시 (프로세스마다 한 번만 계산)"""
+    global _source_version
+    if _source_version is None:
+        digest = hashlib.sha256()
+        src_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in SOURCE_FILES:
+            with open(os.path.join(src_dir, name), "rb") as f:
+                digest.update(name.encode())
+                digest.update(f.read())
+        _source_version = digest.hexdigest()
+    return _source_version
+
+
+def config_fingerprint(config):
+    """설정 객체를 키 순서에 관계없는 JSON 문자열로 변환 (딕셔너리의 정수 키는 문자열로 변환됨)"""
+    return json.dumps(vars(config), sort_keys=True, default=repr, separators=(",", ":"))
+
+
+def cache_key(config, seed):
+    """(실제 적용된 설정, 시드, 소스 버전)의 해시"""
+    digest = hashlib.sha256()
+    digest.update(config_fingerprint(config).encode())
+    digest.update(f"|seed={seed}|".encode())
+    digest.update(source_version().encode())
+    return digest.hexdigest()
+
+
+class CachedResult:
+    """
+    CachedResult 클래스
+    --------------------
+    캐시에 저장되는 시뮬레이션 결과 요약 (SimResult의 KPI 속성과 같은 이름 사용)
+    store_logs=True로 저장한 경우 item_log, daily_reports DataFrame도 포함합니다.
+    """
+    SUMMARY_FIELDS = ("seed", "total_cost", "total_satisfication", "makespan", "end_time",
+                      "daily_costs", "station_stats", "timer_stats", "rework_stats")
+
+    def __init__(self, summary, logs=None, from_cache=False):
+        for field in self.SUMMARY_FIELDS:
+            setattr(self, field, summary.get(field))
+        self.logs = logs or {}
+        self.from_cache = from_cache
+
+    @classmethod
+    def from_result(cls, result, store_logs=False):
+        summary = {field: getattr(result, field) for field in cls.SUMMARY_FIELDS}
+        logs = None
+        if store_logs:
+            logs = {
+                "item_log": result.ctx.item_log.to_frame(),
+                "daily_reports": result.ctx.daily_reports.to_frame(),
+            }
+        return cls(summary, logs)
+
+    def summary(self):
+        return {field: getattr(self, field) for field in self.SUMMARY_FIELDS}
+
+    @property
+    def item_log(self):
+        return self.logs.get("item_log")
+
+    @property
+    def daily_reports(self):
+        return self.logs.get("daily_reports")
+
+    def __repr__(self):
+        return (f"CachedResult(seed={self.seed}, total_cost={self.total_cost:.2f}, "
+                f"total_satisfication={self.total_satisfication:.4f}, makespan={self.makespan:.2f}, "
+                f"from_cache={self.from_cache})")
+
+
+class ResultCache:
+    """
+    ResultCache 클래스
+    -------------------
+    SQLite 파일 하나에 시뮬레이션 결과를 저장하는 내용 주소(content-addressed) 캐시
+    - 키: cache_key(설정, 시드) (설정이나 시뮬레이터 소스가 바뀌면 새 키)
+    - 값: KPI 요약(JSON)과 선택적으로 압축된 컬럼형 로그(DataFrame pickle + zlib)
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    여러 프로세스가 같은 파일을 사용할 수 있습니다. (WAL 모드)
+    """
+    def __init__(self, path, max_bytes=256 * 2**20):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " key TEXT PRIMARY KEY, summary TEXT NOT NULL, logs BLOB,"
+            " size INTEGER NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS runs_last_used ON runs (last_used)")
+        self.connection.commit()
+
+    def get(self, key):
+        """key에 해당하는 CachedResult (없으면 None), 사용 시각 갱신"""
+        row = self.connection.execute("SELECT summary, logs FROM runs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self.connection:
+            self.connection.execute("UPDATE runs SET last_used = ? WHERE key = ?", (time.time(), key))
+        summary, logs = row
+        logs = pickle.loads(zlib.decompress(logs)) if logs is not None else None
+        return CachedResult(json.loads(summary), logs, from_cache=True)
+
+    def put(self, key, result):
+        """CachedResult를 저장하고 크기 제한을 넘으면 LRU 항목 삭제"""
+        summary = json.dumps(result.summary())
+        logs = zlib.compress(pickle.dumps(result.logs, pickle.HIGHEST_PROTOCOL)) if result.logs else None
+        size = len(summary) + (len(logs) if logs is not None else 0)
+        now = time.time()
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO runs (key, summary, logs, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, summary, logs, size, now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM runs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.connection.execute("SELECT key, size FROM runs ORDER BY last_used").fetchall():
+            self.connection.execute("DELETE FROM runs WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def size_bytes(self):
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM runs").fetchone()[0]
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM runs")
+
+    def close(self):
+        self.connection.close()
+
+
+_open_caches = {}
+
+
+def open_cache(path, max_bytes=256 * 2**20):
+    """프로세스마다 path당 하나의 ResultCache를 재사용"""
+    cache = _open_caches.get(path)
+    if cache is None:
+        cache = _open_caches[path] = ResultCache(path, max_bytes)
+    return cache
+
+
+def cached_run_simulation(config=None, seed=None, cache=None, store_logs=False):
+    """
+    cached_run_simulation 함수
+    -----------------------------
+    run_simulation()과 같은 인자로 실행하되, 같은 (설정, 시드, 소스 버전)의 결과가 캐시에 있으면 실행하지 않고 반환합니다.
+    seed가 None이면 실행마다 결과가 달라지므로 캐시를 사용하지 않습니다.
+    반환값은 항상 CachedResult입니다. (캐시에서 온 결과는 from_cache=True)
+
+    매개변수:
+        cache: ResultCache 객체 또는 SQLite 파일 경로 (None이면 캐시 없이 실행)
+        store_logs: True이면 item_log, daily_reports도 함께 저장 (캐시 적중 시 로그가 없으면 다시 실행)
+    """
+    if config is None or isinstance(config, dict):
+        config = build_config(config)
+    if isinstance(cache, str):
+        cache = open_cache(cache)
+    if cache is None or seed is None:
+        return CachedResult.from_result(run_simulation(config, seed), store_logs)
+
+    key = cache_key(config, seed)
+    cached = cache.get(key)
+    if cached is not None and (cached.logs or not store_logs):
+        return cached
+
+    result = CachedResult.from_result(run_simulation(config, seed), store_logs)
+    cache.put(key, result)
+    return result
@@ -0,0 +1,212 @@
+import copy
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+import numpy as np
+
+import config_Simpy
+import environment as env
+from log_simpy import (DAILY_COST_REPORT, DAILY_REPORT_COLUMNS, ITEM_LOG_COLUMNS, ColumnarLog, make_event_log,
+                       make_log_spills)
+
+# 난수를 사용하는 원천별 독립 난수 스트림 이름 (SimContext.rng_streams의 키)
+# 스트림은 하나의 SeedSequence(seed)에서 이 순서대로 spawn하므로, 새 스트림은 끝에 추가해야 기존 스트림의 난수가 바뀌지 않습니다.
+#   arrivals: Job 도착 (현재 도착 간격은 고정값이므로 예약)
+#   geometry: Item 크기 (ItemSampler)
+#   processing: 공정 시간 (현재 공정 시간은 고정값이므로 예약)
+#   defects: 검사 불량 판정 (Proc_Inspection)
+RNG_STREAMS = ("arrivals", "geometry", "processing", "defects")
+
+
+def build_config(overrides=None):
+    """
+    build_config 함수
+    --------------------
+    config_Simpy.py의 대문자 설정값들을 깊은 복사하여 실행(run) 전용 설정 객체를 생성합니다.
+    overrides의 키는 최상위 설정 이름(예: "SIM_TIME", "PRINTERS")이며 해당 값을 통째로 교체합니다.
+
+    매개변수:
+        overrides: {설정 이름: 값} 형태의 딕셔너리 (None이면 config_Simpy.py 그대로 사용)
+    """
+    config = {
+        name: copy.deepcopy(value)
+        for name, value in vars(config_Simpy).items()
+        if name.isupper()
+    }
+    for name, value in (overrides or {}).items():
+        if name not in config:
+            raise KeyError(f"Unknown configuration key: {name}")
+        config[name] = copy.deepcopy(value)
+    return SimpleNamespace(**config)
+
+
+def spawn_rng_streams(seed=None):
+    """
+    spawn_rng_streams 함수
+    -------------------------
+    seed 하나의 SeedSequence에서 RNG_STREAMS의 원천마다 독립적인 numpy Generator를 만듭니다.
+    원천마다 스트림이 따로 있으므로 한 원천의 난수 사용 횟수나 코드 순서가 바뀌어도 다른 원천의 난수는 그대로이며,
+    같은 seed로 실행한 두 설정은 공정 구성과 관계없이 같은 수요(Item 크기)를 봅니다. (common random numbers)
+
+    매개변수:
+        seed: 정수 시드 또는 SeedSequence (None이면 매번 다른 난수)
+    반환값: {스트림 이름: Generator}
+    """
+    sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return {name: np.random.Generator(np.random.PCG64(child))
+            for name, child in zip(RNG_STREAMS, sequence.spawn(len(RNG_STREAMS)))}
+
+
+class SimContext:
+    """
+    SimContext 클래스
+    ------------------
+    한 번의 시뮬레이션 실행(run)에 필요한 상태를 모아두는 객체
+    설정값, 이벤트 로그, 작업 기록, 비용 보고서, 원천별 난수 스트림을 실행마다 새로 만들어
+    같은 인터프리터에서 여러 번 실행해도 상태가 섞이지 않도록 합니다.
+    """
+    def __init__(self, config=None, seed=None):
+        """
+        config: build_config()로 만든 설정 객체 또는 overrides 딕셔너리 (None이면 기본 설정)
+        seed: 난수 시드 (None이면 매 실행마다 다른 난수 사용)
+        """
+        if config is None or isinstance(config, dict):
+            config = build_config(config)
+        self.config = config
+        self.seed = seed
+        # 원천별 난수 스트림 {RNG_STREAMS 이름: Generator}
+        self.rng_streams = spawn_rng_streams(seed)
+
+        # log_simpy.py의 전역 리스트를 대신하는 실행 단위 로그
+        # EVENT_SINK["PATH"]가 있으면 파일 기록(FileEventSink), PRINT_SIM_EVENTS가 False이면 기록하지 않는 NullEventLog 사용
+        self.daily_events = make_event_log(self.config)
+        self.daily_reports = ColumnarLog(DAILY_REPORT_COLUMNS)
+        self.cost_log = []
+        self.wip_log = []            # 일별 단계별 in-flight Job 수 스냅샷
+        self.satisfication_log = []
+        self.item_log = ColumnarLog(ITEM_LOG_COLUMNS)
+        self.daily_cost_report = dict.fromkeys(DAILY_COST_REPORT, 0)
+        # EVENT_SINK["SPILL_LOGS"]가 켜져 있으면 item_log, daily_reports의 완료된 행을 내보낼 파일 {로그 이름: LogSpill}
+        self.log_spills = make_log_spills(self.config)
+        # 단계별 in-flight Job 추적 객체 (SimPy 환경이 필요하므로 create_env에서 생성)
+        self.flow = None
+        # 단계별 KPI 누적기 {단계 이름: StationStats} (create_env에서 생성)
+        self.station_stats = {}
+        # 검사/재작업 루프 KPI (create_env에서 생성)
+        self.rework_stats = None
+
+
+class SimResult:
+    """
+    SimResult 클래스
+    ------------------
+    run_simulation()의 결과 요약 (KPI와 실행 컨텍스트)
+    """
+    def __init__(self, ctx, total_satisfication, end_time, timer_stats=None):
+        self.ctx = ctx
+        self.seed = ctx.seed
+        self.daily_costs = list(ctx.cost_log)           # 일별 총 비용
+        self.total_cost = sum(self.daily_costs)         # 전체 기간 총 비용
+        self.total_satisfication = total_satisfication
+        self.end_time = end_time                         # 시뮬레이션 종료 시각
+        self.timer_stats = timer_stats or {}             # 스테이션별 배치 타임아웃 타이머 통계
+        # 단계별 KPI (가동률, 평균 대기열, 배치 채움 비율, 대기/흐름 시간)
+        self.station_stats = {name: stats.summary() for name, stats in ctx.station_stats.items()}
+        # 검사/재작업 KPI (불량 Item 수, 재작업 Job 수, 재작업이 차지한 프린터 용량)
+        self.rework_stats = ctx.rework_stats.summary()
+        # makespan: 마지막 Job의 포장이 끝난 시각 (마지막으로 Job이 공정을 떠난 시각)
+        self.makespan = float(ctx.flow.last_exit_time)
+
+    def __repr__(self):
+        return (f"SimResult(seed={self.seed}, total_cost={self.total_cost:.2f}, "
+                f"total_satisfication={self.total_satisfication:.4f}, makespan={self.makespan:.2f})")
+
+
+def register_day_hooks(ctx, display):
+    """
+    register_day_hooks 함수
+    --------------------------
+    일(day) 경계마다 실행할 기본 훅을 display에 등록합니다.
+    - 단계별 in-flight Job 수 스냅샷을 ctx.wip_log에 기록
+    - 일별 비용을 ctx.cost_log에 기록하고 비용 보고서 초기화
+    - 일별 이벤트 로그 비우기
+    - (EVENT_SINK["SPILL_LOGS"]) item_log, daily_reports의 완료된 행을 파일로 내보내기
+    일별 출력 등 다른 훅은 이 함수보다 먼저 등록해야 비워지기 전의 로그와 비용을 볼 수 있습니다.
+    """
+    def record_wip_snapshot(day):
+        ctx.wip_log.append({
+            "day": day,
+            "time": display.env.now,
+            "jobs_in_flight": ctx.flow.jobs_in_flight,
+            "items_in_flight": ctx.flow.items_in_flight,
+            **ctx.flow.stage_counts,
+        })
+
+    def roll_over_day(day):
+        env.Cost.update_cost_log(ctx)
+        env.Cost.clear_cost(ctx)
+        ctx.daily_events.clear()
+
+    def spill_logs(day):
+        # daily_reports는 기록 후 수정되지 않으므로 전부, item_log는 공정 안에 남은 Item의 행 이전까지 내보냄
+        ctx.daily_reports.spill(ctx.daily_reports.end, ctx.log_spills["daily_reports"])
+        open_index = ctx.flow.open_log_index()
+        ctx.item_log.spill(ctx.item_log.end if open_index is None else open_index, ctx.log_spills["item_log"])
+
+    display.add_day_end_hook(record_wip_snapshot)
+    display.add_day_end_hook(roll_over_day)
+    if ctx.log_spills:
+        display.add_day_end_hook(spill_logs)
+
+
+def run_until_drained(simpy_env, flow, horizon=None):
+    """
+    run_until_drained 함수
+    -------------------------
+    Job 생성이 끝난 뒤 마지막 Job이 Proc_Packaging을 떠나는 순간(flow.drained 이벤트)까지 시뮬레이션을 실행합니다.
+    horizon(절대 시각)이 주어지면 그 시각에 먼저 도달할 경우 거기서 멈춥니다.
+    모든 작업이 끝났으면 True를 반환합니다.
+    """
+    if flow.is_drained:
+        return True
+    until = flow.drained
+    if horizon is not None:
+        until = simpy_env.any_of([flow.drained, simpy_env.timeout(max(0, horizon - simpy_env.now))])
+    simpy_env.run(until=until)
+    return flow.is_drained
+
+
+def run_simulation(config=None, seed=None, profiler=None):
+    """
+    run_simulation 함수
+    ----------------------
+    main.py와 같은 순서(create_env → day-end 훅 등록 → simpy_event_processes → 모든 Job 처리 완료까지 실행)로
+    시뮬레이션을 한 번 실행하고 SimResult를 반환합니다.
+    일별 비용 정산은 day-end 훅에서 처리되므로 env.run()은 한 번만 호출됩니다.
+    모든 상태는 새로 만든 SimContext에 저장되므로 반복 호출 시에도 서로 영향을 주지 않습니다.
+
+    매개변수:
+        config: 설정 overrides 딕셔너리 또는 build_config()로 만든 설정 객체
+        seed: 난수 시드
+        profiler: profiler.SimProfiler 객체 (주어지면 공정 메서드, 로그 기록, 이벤트 처리 시간을 측정)
+    """
+    ctx = SimContext(config, seed)
+
+    (simpy_env, printer_store, washing_store, drying_store, packaging, dry_machine, washing_machine, post_processor,
+     customer, display, printers, daily_events, satisfication) = env.create_env(ctx)
+    register_day_hooks(ctx, display)
+    if profiler is not None:
+        profiler.attach(simpy_env, ctx, printer_store, printers, washing_machine, dry_machine, post_processor, packaging)
+    env.simpy_event_processes(simpy_env, packaging, post_processor, customer, display, printers, washing_machine, dry_machine, daily_events)
+
+    # SIM_TIME 동안 Job을 생성하고, 마지막 Job의 포장이 끝나는 시각까지 한 번에 실행
+    with profiler.running() if profiler is not None else nullcontext():
+        run_until_drained(simpy_env, ctx.flow)
+    display.finish()
+    daily_events.close()
+
+    timer_stats = {
+        "Washing": washing_machine.batch_timers.stats(),
+        "Drying": dry_machine.batch_timers.stats(),
+    }
+    return SimResult(ctx, satisfication.total_satisfication, simpy_env.now, timer_stats)
@@ -0,0 +1,221 @@
+import math
+
+
+class RunningStat:
+    """
+    RunningStat 클래스
+    -------------------
+    Welford 알고리즘으로 평균과 분산을 온라인으로 계산하는 누적기
+    값을 저장하지 않으므로 시뮬레이션 기간과 관계없이 O(1) 메모리를 사용합니다.
+    """
+    __slots__ = ("n", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def variance(self):
+        """표본 분산 (값이 2개 미만이면 0)"""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def summary(self):
+        return {
+            "n": self.n,
+            "mean": self.mean if self.n else math.nan,
+            "std": self.std,
+            "min": self.min if self.n else math.nan,
+            "max": self.max if self.n else math.nan,
+        }
+
+
+class TimeWeighted:
+    """
+    TimeWeighted 클래스
+    --------------------
+    시간에 따라 변하는 값(작업 중인 서버 수, 대기열 길이 등)의 시간 가중 평균을 계산하는 누적기
+    값이 바뀔 때마다 set()을 호출하면, 이전 값이 유지된 시간만큼 면적(area)에 더합니다.
+    """
+    __slots__ = ("start_time", "last_time", "level", "area", "max")
+
+    def __init__(self, now=0, level=0):
+        self.start_time = now
+        self.last_time = now
+        self.level = level
+        self.area = 0.0
+        self.max = level
+
+    def set(self, now, level):
+        self.area += self.level * (now - self.last_time)
+        self.last_time = now
+        self.level = level
+        if level > self.max:
+            self.max = level
+
+    def add(self, now, delta):
+        self.set(now, self.level + delta)
+
+    def mean(self, now):
+        """start_time부터 now까지의 시간 가중 평균"""
+        elapsed = now - self.start_time
+        if elapsed <= 0:
+            return float(self.level)
+        return (self.area + self.level * (now - self.last_time)) / elapsed
+
+
+class StationStats:
+    """
+    StationStats 클래스
+    --------------------
+    공정 단계(station) 하나의 KPI를 시뮬레이션 진행 중에 누적하는 객체
+    - busy: 작업 중인 서버(프린터, 머신, 작업자) 수의 시간 가중 평균 → 가동률(utilization)
+    - queue: 단계에 도착했지만 아직 작업을 시작하지 않은 Job/Item 수의 시간 가중 평균
+    - batch_fill: 배치 출발 시 배치 크기 / 머신 용량 (Washing, Drying)
+    - waiting: 도착부터 작업 시작까지의 시간 (Welford 평균/분산)
+    - flow: 도착부터 단계를 떠날 때까지의 시간 (Welford 평균/분산)
+    누적값만 유지하고, 도착 시각은 현재 단계에 있는 Job/Item에 대해서만 보관합니다.
+
+    사용 순서: arrive(entity) → start(entity) → finish(entity), 서버 사용은 acquire()/release()
+    """
+    def __init__(self, env, name, capacity):
+        """
+        env: SimPy 환경 객체
+        name: 단계 이름 (예: "Printing")
+        capacity: 서버 수 (프린터/머신/작업자 수)
+        """
+        self.env = env
+        self.name = name
+        self.capacity = capacity
+        self.busy = TimeWeighted(env.now)
+        self.queue = TimeWeighted(env.now)
+        self.batch_fill = RunningStat()
+        self.waiting = RunningStat()
+        self.flow = RunningStat()
+        self.arrival_times = {}   # 현재 단계에 있는 entity -> 도착 시각
+        self.completed = 0
+
+    def arrive(self, entity):
+        """Job/Item이 단계에 도착 (대기열 +1)"""
+        self.arrival_times[entity] = self.env.now
+        self.queue.add(self.env.now, 1)
+
+    def start(self, entity):
+        """Job/Item의 작업 시작 (대기열 -1, 대기 시간 기록)"""
+        self.queue.add(self.env.now, -1)
+        self.waiting.add(self.env.now - self.arrival_times[entity])
+
+    def finish(self, entity):
+        """Job/Item이 단계를 떠남 (흐름 시간 기록)"""
+        self.flow.add(self.env.now - self.arrival_times.pop(entity))
+        self.completed += 1
+
+    def acquire(self):
+        """서버 하나가 작업을 시작"""
+        self.busy.add(self.env.now, 1)
+
+    def release(self):
+        """서버 하나가 작업을 마침"""
+        self.busy.add(self.env.now, -1)
+
+    def record_batch(self, size, capacity):
+        """배치 출발 시 배치 채움 비율 기록"""
+        self.batch_fill.add(size / capacity)
+
+    def utilization(self):
+        """현재 시각까지의 시간 가중 가동률 (0~1)"""
+        return self.busy.mean(self.env.now) / self.capacity if self.capacity else 0.0
+
+    def summary(self):
+        """현재 시각 기준 KPI 딕셔너리 (시뮬레이션 도중에도 호출 가능)"""
+        now = self.env.now
+        summary = {
+            "utilization": self.utilization(),
+            "busy_now": self.busy.level,
+            "queue_mean": self.queue.mean(now),
+            "queue_max": self.queue.max,
+            "queue_now": self.queue.level,
+            "in_station": len(self.arrival_times),
+            "completed": self.completed,
+            "waiting_mean": self.waiting.summary()["mean"],
+            "waiting_std": self.waiting.std,
+            "flow_mean": self.flow.summary()["mean"],
+            "flow_std": self.flow.std,
+        }
+        if self.batch_fill.n:
+            summary["batch_fill_mean"] = self.batch_fill.mean
+            summary["batches"] = self.batch_fill.n
+        return summary
+
+
+class ReworkStats:
+    """
+    ReworkStats 클래스
+    -------------------
+    검사(Inspection)와 재작업(rework) 루프의 KPI를 누적하는 객체
+    - inspected_items / defective_items: 검사한 Item 수와 그중 불량 Item 수
+    - rework_jobs / rework_items: 프린터로 다시 보낸 재작업 Job 수와 Item 수
+    - print_hours / rework_print_hours: 전체 인쇄 시간과 그중 재작업 Job의 인쇄 시간
+    재작업이 차지한 프린터 용량은 재작업 인쇄 시간 / (프린터 수 × 경과 시간)으로 계산합니다.
+    """
+    def __init__(self, env, printers):
+        """
+        env: SimPy 환경 객체
+        printers: 프린터 수
+        """
+        self.env = env
+        self.printers = printers
+        self.inspected_items = 0
+        self.defective_items = 0
+        self.rework_jobs = 0
+        self.rework_items = 0
+        self.print_hours = 0.0
+        self.rework_print_hours = 0.0
+
+    def record_inspection(self, items, defective):
+        """Job 하나의 검사 결과 (검사한 Item 수, 불량 Item 수)"""
+        self.inspected_items += items
+        self.defective_items += defective
+
+    def record_rework(self, items):
+        """items개의 불량 Item을 묶은 재작업 Job이 프린터로 보내짐"""
+        self.rework_jobs += 1
+        self.rework_items += items
+
+    def record_print(self, hours, rework):
+        """Job 하나의 인쇄 시간 (rework: 재작업 Job 여부)"""
+        self.print_hours += hours
+        if rework:
+            self.rework_print_hours += hours
+
+    def summary(self):
+        """현재 시각 기준 KPI 딕셔너리"""
+        capacity_hours = self.printers * self.env.now
+        return {
+            "inspected_items": self.inspected_items,
+            "defective_items": self.defective_items,
+            "defect_rate": self.defective_items / self.inspected_items if self.inspected_items else 0.0,
+            "rework_jobs": self.rework_jobs,
+            "rework_items": self.rework_items,
+            "print_hours": self.print_hours,
+            "rework_print_hours": self.rework_print_hours,
+            # 인쇄 작업 시간 중 재작업 비율, 전체 프린터 용량(프린터 수 × 경과 시간) 중 재작업 비율
+            "rework_print_share": self.rework_print_hours / self.print_hours if self.print_hours else 0.0,
+            "rework_capacity_share": self.rework_print_hours / capacity_hours if capacity_hours else 0.0,
+        }
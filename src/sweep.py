@@ -0,0 +1,222 @@
+import ast
+import copy
+import itertools
+import math
+from functools import partial
+
+import pandas as pd
+
+from replication import KPI_NAMES, iter_chunked, replication_seeds, result_kpis, simulate, t_critical
+from simulation import build_config
+
+STATIONS = ("Printing", "Washing", "Drying", "PostProcessing", "Packaging")
+
+
+def _set_count(name, size_key=None):
+    """name 설정(PRINTERS, WASHING_MACHINE 등)을 ID 0..n-1인 n개의 항목으로 교체하는 knob"""
+    def apply(config, count):
+        entries = getattr(config, name)
+        extra = {}
+        if size_key is not None:
+            # 기존 첫 번째 머신의 용량을 새 머신들에 그대로 사용
+            extra[size_key] = next(iter(entries.values()))[size_key]
+        setattr(config, name, {i: {"ID": i, **extra} for i in range(int(count))})
+    return apply
+
+
+def _set_size(name, size_key):
+    """name 설정의 모든 머신 용량(size_key)을 같은 값으로 바꾸는 knob"""
+    def apply(config, size):
+        for machine in getattr(config, name).values():
+            machine[size_key] = int(size)
+    return apply
+
+
+def _set_customer(key):
+    def apply(config, value):
+        config.CUSTOMER[key] = int(value)
+    return apply
+
+
+def _set_entry(name, key, cast=float):
+    """name 설정 딕셔너리(INSPECTION, PACKING 등)의 key 값을 바꾸는 knob"""
+    def apply(config, value):
+        getattr(config, name)[key] = cast(value)
+    return apply
+
+
+def _set_value(name):
+    def apply(config, value):
+        setattr(config, name, value)
+    return apply
+
+
+# sweep에서 사용할 수 있는 knob 이름 -> 설정 객체를 수정하는 함수
+# (knob 외에 config_Simpy.py의 대문자 설정 이름도 그대로 사용할 수 있습니다)
+KNOBS = {
+    "printers": _set_count("PRINTERS"),
+    "washing_machines": _set_count("WASHING_MACHINE", "WASHING_SIZE"),
+    "washing_size": _set_size("WASHING_MACHINE", "WASHING_SIZE"),
+    "drying_machines": _set_count("DRY_MACHINE", "DRYING_SIZE"),
+    "drying_size": _set_size("DRY_MACHINE", "DRYING_SIZE"),
+    "batch_timeout": _set_value("BATCH_TIMEOUT"),
+    "post_processing_workers": _set_count("POST_PROCESSING_WORKER"),
+    "packaging_workers": _set_count("PACKAGING_MACHINE"),
+    "job_list_size": _set_customer("JOB_LIST_SIZE"),
+    "item_size": _set_customer("ITEM_SIZE"),
+    "arrival_interval": _set_value("JOB_ARRIVAL_INTERVAL"),
+    "sim_time": _set_value("SIM_TIME"),
+    "defect_rate": _set_entry("INSPECTION", "DEFECT_RATE"),
+    "rework_batch_size": _set_entry("INSPECTION", "REWORK_BATCH_SIZE", int),
+    "packing": _set_entry("PACKING", "ENABLED", bool),
+}
+
+
+def expand_grid(grid):
+    """
+    {knob 이름: 값 리스트} 형태의 grid를 모든 조합의 point 리스트로 펼칩니다.
+    예: {"printers": [3, 5], "batch_timeout": [1, 2]} -> 4개의 point
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def point_config(point, base_config=None):
+    """
+    point_config 함수
+    --------------------
+    base_config(overrides 딕셔너리)로 만든 설정에 point의 knob 값을 적용한 설정 객체를 반환합니다.
+    knob이 아닌 이름은 config_Simpy.py의 대문자 설정 이름이어야 하며 값을 통째로 교체합니다.
+    """
+    config = build_config(base_config)
+    for name, value in point.items():
+        if name in KNOBS:
+            KNOBS[name](config, value)
+        elif name.isupper() and hasattr(config, name):
+            setattr(config, name, copy.deepcopy(value))
+        else:
+            raise KeyError(f"Unknown sweep knob: {name}")
+    return config
+
+
+def run_sweep_chunk(tasks, cache_path=None):
+    """
+    프로세스 풀 작업자에서 실행되는 함수
+    tasks: (point 번호, 설정 객체, replication 번호, seed) 튜플 리스트
+    각 실행의 결과 행(딕셔너리) 리스트를 반환합니다.
+    """
+    rows = []
+    for point_id, config, replication, seed in tasks:
+        result = simulate(config, seed, cache_path)
+        row = {"point": point_id, "replication": replication, "seed": seed, **result_kpis(result)}
+        for station in STATIONS:
+            row[f"utilization_{station}"] = result.station_stats[station]["utilization"]
+        rows.append(row)
+    return rows
+
+
+def run_sweep(points, n_replications, base_config=None, base_seed=0, workers=None, chunksize=None, on_row=None,
+              cache_path=None):
+    """
+    run_sweep 함수
+    ----------------
+    각 point(knob 딕셔너리)마다 n_replications번 시뮬레이션을 실행하고,
+    (point, replication) 한 행씩인 결과 테이블(DataFrame)을 반환합니다.
+    모든 point × replication 실행은 하나의 프로세스 풀에 나누어 실행됩니다.
+    point 간 비교의 분산을 줄이기 위해 모든 point가 같은 replication 시드를 사용합니다. (common random numbers)
+
+    매개변수:
+        points: knob 딕셔너리 리스트 (expand_grid()의 결과 등)
+        n_replications: point마다 실행할 replication 수
+        base_config: 모든 point에 공통으로 적용할 overrides 딕셔너리 (기본적으로 이벤트 출력은 끔)
+        base_seed: replication 시드를 생성할 기준 시드
+        workers, chunksize: iter_chunked()와 같음
+        on_row: 실행 하나가 끝날 때마다 결과 행으로 호출할 함수
+        cache_path: 결과 캐시 SQLite 파일 경로 (이미 실행한 (설정, 시드)는 다시 실행하지 않음)
+    """
+    base_config = {"PRINT_SIM_EVENTS": False, **(base_config or {})}
+    configs = [point_config(point, base_config) for point in points]
+    seeds = replication_seeds(n_replications, base_seed)
+    tasks = [
+        (point_id, config, replication, seed)
+        for point_id, config in enumerate(configs)
+        for replication, seed in enumerate(seeds)
+    ]
+
+    rows = []
+    for row in iter_chunked(partial(run_sweep_chunk, cache_path=cache_path), tasks, workers, chunksize):
+        rows.append(row)
+        if on_row is not None:
+            on_row(row)
+
+    results = pd.DataFrame(rows, columns=["point", "replication", "seed", *KPI_NAMES,
+                                          *(f"utilization_{station}" for station in STATIONS)])
+    knobs = pd.DataFrame(points).rename_axis("point").reset_index()
+    results = knobs.merge(results, on="point").sort_values(["point", "replication"], ignore_index=True)
+    return results
+
+
+def summarize_sweep(results, confidence=0.95, kpis=KPI_NAMES):
+    """
+    run_sweep() 결과 테이블을 point별로 묶어 KPI의 평균과 신뢰구간 반폭(half width)을 계산합니다.
+    반환값: point마다 한 행인 DataFrame (knob 열, n, <KPI>_mean, <KPI>_half_width)
+    """
+    knob_columns = [column for column in results.columns
+                    if column not in ("point", "replication", "seed", *KPI_NAMES)
+                    and not column.startswith("utilization_")]
+    grouped = results.groupby("point")
+    summary = grouped[knob_columns].first()
+    summary["n"] = grouped.size()
+    for kpi in kpis:
+        mean = grouped[kpi].mean()
+        std = grouped[kpi].std(ddof=1)
+        n = summary["n"]
+        summary[f"{kpi}_mean"] = mean
+        summary[f"{kpi}_half_width"] = [
+            t_critical(count - 1, confidence) * s / math.sqrt(count) if count > 1 else math.inf
+            for s, count in zip(std, n)
+        ]
+    return summary.reset_index()
+
+
+def parse_grid(specs):
+    """["printers=3,5", "batch_timeout=1,2"] 형태의 문자열을 grid 딕셔너리로 변환"""
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if not values:
+            raise ValueError(f"Grid entry must look like name=v1,v2: {spec}")
+        grid[name.strip()] = [ast.literal_eval(value.strip()) for value in values.split(",")]
+    return grid
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Parameter sweep over 3D print farm configurations")
+    parser.add_argument("--grid", nargs="+", default=[], metavar="NAME=V1,V2",
+                        help=f"knob values to combine; knobs: {', '.join(KNOBS)} or config_Simpy names")
+    parser.add_argument("--points", help="JSON file with a list of knob dictionaries (used with --grid as extra points)")
+    parser.add_argument("-n", "--replications", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--out", default="sweep_results.csv", help="tidy per-replication results (CSV)")
+    parser.add_argument("--summary", default="sweep_summary.csv", help="per-point summary (CSV)")
+    parser.add_argument("--cache", default=None, help="SQLite file for cached results of (config, seed) runs")
+    args = parser.parse_args()
+
+    points = expand_grid(parse_grid(args.grid)) if args.grid else []
+    if args.points:
+        with open(args.points, encoding="utf-8") as f:
+            points += json.load(f)
+    if not points:
+        parser.error("no sweep points: give --grid and/or --points")
+
+    results = run_sweep(points, args.replications, base_seed=args.seed, workers=args.workers, cache_path=args.cache)
+    summary = summarize_sweep(results, args.confidence)
+    results.to_csv(args.out, index=False)
+    summary.to_csv(args.summary, index=False)
+    print(summary.to_string(index=False))
+    print(f"\n{len(points)} points x {args.replications} replications -> {args.out}, {args.summary}")
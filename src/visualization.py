@@ -1,147 +1,213 @@
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+import numpy as np
 import pandas as pd
-import random
 
-def visualization(export_Daily_Report):
+from daily_report import REPORT_STAGES
+
+# 공정 이름 -> (Gantt 차트 레인 이름, 리소스 ID 열) (ctx.daily_reports의 process 열 기준)
+LANES = {
+    "Printing": ("Printer", "printer_id"),
+    "Washing": ("Washer", "machine_id"),
+    "Drying": ("Dryer", "machine_id"),
+    "Post-Processing": ("Post-Processor", "worker_id"),
+    "Packaging": ("Packaging", "worker_id"),
+}
+
+# Daily_Report 형식(Item당 한 행)의 열 -> (공정 이름, 리소스 열, 시작 열, 종료 열)
+EXPORT_STAGES = tuple(
+    (process, resource_column, f"{prefix}_START", f"{prefix}_FINISH")
+    for process, prefix, resource_column, _ in REPORT_STAGES
+)
+
+# 막대 수가 이 값 이하일 때만 Job ID와 작업 시간 라벨을 표시
+MAX_LABELS = 300
+# Job 수가 이 값 이하일 때만 Job 범례를 표시
+MAX_LEGEND_JOBS = 20
+
+
+def convert_time_to_float(values):
     """
-    Gantt 차트를 생성하여 3D 프린팅 팜의 모든 작업자와 프린터를 포함하고 Job별로 고유 색상으로 작업을 시각화합니다.
-    :param export_Daily_Report: 시뮬레이션 작업 기록 데이터 리스트
+    시간 열을 float(시간 단위)로 변환합니다.
+    숫자는 그대로, "HH:MM" 형식의 문자열은 시간으로 변환하고, 그 외 값은 NaN으로 처리합니다.
+    """
+    numeric = pd.to_numeric(values, errors="coerce")
+    if values.dtype != object:
+        return numeric.astype(float)
+    text = values.where(numeric.isna()).astype("string")
+    parts = text.str.extract(r"^\s*(\d+):(\d+)\s*$").astype(float)
+    return numeric.astype(float).fillna(parts[0] + parts[1] / 60.0)
+
+
+def operations_from_reports(daily_reports):
+    """
+    ctx.daily_reports(ColumnarLog 또는 DataFrame, 작업 하나당 한 행)를 Gantt 차트용 작업 테이블로 변환합니다.
+    반환값: 열이 process, resource, lane, job_id, start, end인 DataFrame (리소스가 없는 행은 제외)
+    """
+    if hasattr(daily_reports, "to_frame"):
+        daily_reports = daily_reports.to_frame()
+    frames = []
+    for process, (_, id_column) in LANES.items():
+        if id_column not in daily_reports.columns:
+            continue
+        rows = daily_reports[(daily_reports["process"] == process) & (daily_reports[id_column] >= 0)]
+        frames.append(pd.DataFrame({
+            "process": process,
+            "resource": rows[id_column].to_numpy(),
+            "job_id": rows["job_id"].to_numpy(),
+            "start": rows["start_time"].to_numpy(dtype=float),
+            "end": rows["end_time"].to_numpy(dtype=float),
+        }))
+    return _with_lanes(frames)
+
+
+def operations_from_export(export_Daily_Report):
+    """
+    Daily_Report 형식(ASSIGNED_PRINTER/PRINTING_START 등의 열, build_daily_report()의 결과 또는 CSV)을
+    Gantt 차트용 작업 테이블로 변환합니다. (operations_from_reports()와 같은 열)
+    Item당 한 행이므로 여러 Item에 반복된 Job 단위 공정은 한 번만 포함합니다.
     """
-    # 데이터 프레임 변환
     daily_reports = pd.DataFrame(export_Daily_Report)
+    frames = []
+    for process, resource_column, start_column, end_column in EXPORT_STAGES:
+        if resource_column not in daily_reports.columns:
+            continue
+        rows = daily_reports[daily_reports[resource_column].notna()]
+        frames.append(pd.DataFrame({
+            "process": process,
+            "resource": rows[resource_column].to_numpy(dtype=float).astype(np.int64),
+            "job_id": rows["JOB_ID"].to_numpy(),
+            "start": convert_time_to_float(rows[start_column]).to_numpy(),
+            "end": convert_time_to_float(rows[end_column]).to_numpy(),
+        }).drop_duplicates())
+    return _with_lanes(frames)
+
+
+def _with_lanes(frames):
+    """작업 테이블에 lane(세로축 번호) 열을 추가 (공정 순서 → 리소스 ID 순서)"""
+    columns = ["process", "resource", "job_id", "start", "end"]
+    operations = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    operations = operations.dropna(subset=["start", "end"])
+    process_order = operations["process"].map({process: i for i, process in enumerate(LANES)}).to_numpy(np.int64)
+    keys = process_order << 32 | operations["resource"].to_numpy(np.int64)
+    operations["lane"] = np.unique(keys, return_inverse=True)[1].reshape(-1)
+    return operations.reset_index(drop=True)
+
+
+def job_colors(job_ids, cmap="tab20"):
+    """Job ID별 색상 (같은 Job은 모든 공정에서 같은 색, 실행마다 같은 색)"""
+    colormap = plt.get_cmap(cmap)
+    n_colors = getattr(colormap, "N", 256)
+    return colormap((np.asarray(job_ids, dtype=np.int64) % n_colors) / max(n_colors - 1, 1))
+
 
-    # 시간 데이터를 변환
-    def convert_time_to_float(time_value):
-        if isinstance(time_value, str):  # 문자열인 경우
-            try:
-                hours, minutes = map(int, time_value.split(":"))
-                return hours + minutes / 60.0
-            except ValueError:
-                return None
-        elif isinstance(time_value, (int, float)):  # 숫자형 데이터인 경우
-            return time_value
-        return None  # 기타 형식은 NaN으로 처리
-
-    # 시간 열 변환
-    time_columns = [
-        "PRINTING_START", "PRINTING_FINISH",
-        "POSTPROCESSING_START", "POSTPROCESSING_FINISH",
-        "PACKAGING_START", "PACKAGING_FINISH"
-    ]
-    for col in time_columns:
-        if col in daily_reports.columns:
-            daily_reports[col] = daily_reports[col].apply(convert_time_to_float)
-
-    # Job ID별 고유 색상 생성
-    def generate_unique_color():
-        """고유한 색상을 생성 (RGB 값)"""
-        return [random.random() for _ in range(3)]  # R, G, B 값 무작위 생성
-
-    job_colors = {job_id: generate_unique_color() for job_id in daily_reports['JOB_ID'].unique()}
-
-    # 리소스(프린터, 작업자) 목록 생성
-    all_printers = sorted(daily_reports["ASSIGNED_PRINTER"].dropna().unique())
-    all_post_processors = sorted(daily_reports["ASSIGNED_POSTPROCESS_WORKER"].dropna().unique())
-    all_packaging_workers = sorted(daily_reports["ASSIGNED_PACKAGING_WORKER"].dropna().unique())
-
-    resource_labels = (
-        [f"Printer {int(printer)}" for printer in all_printers] +
-        [f"Post-Processor {int(worker)}" for worker in all_post_processors] +
-        [f"Packaging {int(worker)}" for worker in all_packaging_workers]
-    )
-
-    # 리소스를 세로축에 표시하기 위해 리소스별로 번호 매기기
-    resource_map = {label: idx for idx, label in enumerate(resource_labels)}
-
-    fig, ax = plt.subplots(figsize=(16, 10))
-
-    # 각 작업(Job)을 리소스별로 시각화
-    for _, row in daily_reports.iterrows():
-        # 프린팅 작업
-        if not pd.isna(row["ASSIGNED_PRINTER"]):
-            y_pos = resource_map[f"Printer {int(row['ASSIGNED_PRINTER'])}"]
-            duration = row["PRINTING_FINISH"] - row["PRINTING_START"]
-            ax.barh(
-                y_pos,
-                duration,
-                left=row["PRINTING_START"],
-                color=job_colors[row["JOB_ID"]],
-                edgecolor='black',
-                label=f"Job {row['JOB_ID']}" if f"Job {row['JOB_ID']}" not in ax.get_legend_handles_labels()[1] else None
-            )
-            ax.text(
-                row["PRINTING_START"] + duration / 2,
-                y_pos,
-                f"{row['JOB_ID']}",
-                va='center', ha='center', color='white', fontsize=8, weight='bold'
-            )
-            ax.text(
-                row["PRINTING_START"] + duration / 2,
-                y_pos - 0.2,
-                f"{duration:.2f}h",
-                va='center', ha='center', color='black', fontsize=8
-            )
-
-        # 후처리 작업
-        if not pd.isna(row["ASSIGNED_POSTPROCESS_WORKER"]):
-            y_pos = resource_map[f"Post-Processor {int(row['ASSIGNED_POSTPROCESS_WORKER'])}"]
-            duration = row["POSTPROCESSING_FINISH"] - row["POSTPROCESSING_START"]
-            ax.barh(
-                y_pos,
-                duration,
-                left=row["POSTPROCESSING_START"],
-                color=job_colors[row["JOB_ID"]],
-                edgecolor='black'
-            )
-            ax.text(
-                row["POSTPROCESSING_START"] + duration / 2,
-                y_pos,
-                f"{row['JOB_ID']}",
-                va='center', ha='center', color='white', fontsize=8, weight='bold'
-            )
-            ax.text(
-                row["POSTPROCESSING_START"] + duration / 2,
-                y_pos - 0.2,
-                f"{duration:.2f}h",
-                va='center', ha='center', color='black', fontsize=8
-            )
-
-        # 포장 작업
-        if not pd.isna(row["ASSIGNED_PACKAGING_WORKER"]):
-            y_pos = resource_map[f"Packaging {int(row['ASSIGNED_PACKAGING_WORKER'])}"]
-            duration = row["PACKAGING_FINISH"] - row["PACKAGING_START"]
-            ax.barh(
-                y_pos,
-                duration,
-                left=row["PACKAGING_START"],
-                color=job_colors[row["JOB_ID"]],
-                edgecolor='black'
-            )
-            ax.text(
-                row["PACKAGING_START"] + duration / 2,
-                y_pos,
-                f"{row['JOB_ID']}",
-                va='center', ha='center', color='white', fontsize=8, weight='bold'
-            )
-            ax.text(
-                row["PACKAGING_START"] + duration / 2,
-                y_pos - 0.2,
-                f"{duration:.2f}h",
-                va='center', ha='center', color='black', fontsize=8
-            )
+def lane_bars(starts, ends, lane, height=0.8):
+    """
+    한 레인의 막대들을 꼭짓점 배열(막대 수 × 4 × 2)로 한 번에 계산합니다.
+    (ax.broken_barh()와 같은 모양이지만 막대마다 Python 루프를 돌지 않음)
+    """
+    bottom, top = lane - height / 2, lane + height / 2
+    vertices = np.empty((len(starts), 4, 2))
+    vertices[:, 0, 0] = vertices[:, 1, 0] = starts
+    vertices[:, 2, 0] = vertices[:, 3, 0] = ends
+    vertices[:, (0, 3), 1] = bottom
+    vertices[:, (1, 2), 1] = top
+    return vertices
+
+
+def render_gantt(operations, path=None, max_labels=MAX_LABELS, figsize=None, title="Job Scheduling Gantt Chart"):
+    """
+    render_gantt 함수
+    -------------------
+    리소스(프린터, 머신, 작업자) 레인마다 PolyCollection 하나로 Gantt 차트를 그립니다.
+    막대마다 Artist를 만들지 않으므로 작업 수가 10만 개 이상이어도 빠르게 그릴 수 있습니다.
+    - 막대 수가 max_labels 이하일 때만 Job ID와 작업 시간 라벨과 테두리를 표시
+      (그보다 많으면 막대를 래스터로 그려 SVG/PDF 파일 크기와 저장 시간을 줄임)
+    - Job 수가 MAX_LEGEND_JOBS 이하일 때만 Job 범례를 표시
+
+    매개변수:
+        operations: operations_from_reports()/operations_from_export()의 결과
+        path: 저장할 파일 경로 (.png, .svg 등 확장자로 형식 결정, 저장 후 figure를 닫음)
+        max_labels: 라벨을 표시할 최대 막대 수
+        figsize: figure 크기 (None이면 레인 수에 맞춰 결정)
+    반환값: path가 None이면 matplotlib Figure, 아니면 path
+    """
+    lanes = operations.drop_duplicates("lane").sort_values("lane")
+    lane_labels = [f"{LANES[process][0]} {int(resource)}" for process, resource in zip(lanes["process"], lanes["resource"])]
+    if figsize is None:
+        figsize = (16, max(4, min(0.35 * len(lane_labels) + 2, 60)))
+
+    fig, ax = plt.subplots(figsize=figsize)
+    starts = operations["start"].to_numpy(dtype=float)
+    ends = operations["end"].to_numpy(dtype=float)
+    durations = ends - starts
+    colors = job_colors(operations["job_id"].to_numpy())
+    show_labels = len(operations) <= max_labels
+    style = {"edgecolor": "black", "linewidth": 0.5} if show_labels else {"linewidth": 0, "rasterized": True}
+
+    for lane, indices in operations.groupby("lane", sort=True).indices.items():
+        ax.add_collection(PolyCollection(lane_bars(starts[indices], ends[indices], lane),
+                                         facecolors=colors[indices], **style))
+
+    if show_labels:
+        centers = starts + durations / 2
+        for center, lane, job_id, duration in zip(centers, operations["lane"], operations["job_id"], durations):
+            ax.text(center, lane, f"{job_id}", va='center', ha='center', color='white', fontsize=8, weight='bold')
+            ax.text(center, lane + 0.2, f"{duration:.2f}h", va='center', ha='center', color='black', fontsize=8)
+
+    job_ids = np.unique(operations["job_id"].to_numpy())
+    if 0 < len(job_ids) <= MAX_LEGEND_JOBS:
+        handles = [plt.Rectangle((0, 0), 1, 1, facecolor=color, edgecolor='black') for color in job_colors(job_ids)]
+        ax.legend(handles, [f"Job {job_id}" for job_id in job_ids], loc='upper left', bbox_to_anchor=(1.01, 1))
 
     # 세로축 설정
-    ax.set_yticks(list(resource_map.values()))
-    ax.set_yticklabels(list(resource_map.keys()))
+    ax.set_yticks(range(len(lane_labels)))
+    ax.set_yticklabels(lane_labels)
+    ax.set_ylim(-0.6, len(lane_labels) - 0.4)
+    ax.invert_yaxis()
+    if len(starts):
+        ax.set_xlim(np.nanmin(starts), np.nanmax(ends))
     ax.set_xlabel("Time")
     ax.set_ylabel("Resources")
-    ax.set_title("Job Scheduling Gantt Chart")
+    ax.set_title(title)
+    fig.tight_layout()
+
+    if path is None:
+        return fig
+    fig.savefig(path, bbox_inches="tight")
+    plt.close(fig)
+    return path
+
+
+def visualization(export_Daily_Report, path=None):
+    """
+    Gantt 차트를 생성하여 3D 프린팅 팜의 모든 작업자와 프린터를 포함하고 Job별로 고유 색상으로 작업을 시각화합니다.
+    :param export_Daily_Report: Daily_Report 테이블 (build_daily_report()의 결과 또는 같은 열의 레코드 리스트)
+    :param path: 저장할 파일 경로 (None이면 화면에 표시하며, 창을 닫을 때까지 멈춤)
+    :return: 저장한 파일 경로 (path가 None이면 None)
+    """
+    result = render_gantt(operations_from_export(export_Daily_Report), path)
+    if path is None:
+        plt.show()
+        return None
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
 
-    # 범례 추가
-    handles, labels = ax.get_legend_handles_labels()
-    unique_labels = dict(zip(labels, handles))
-    ax.legend(unique_labels.values(), unique_labels.keys(), loc='upper right', bbox_to_anchor=(1.15, 1))
+    parser = argparse.ArgumentParser(description="Render a Gantt chart from a Daily_Report CSV without a display")
+    parser.add_argument("report", help="CSV file: Daily_Report.csv (one row per job) or a daily_reports log")
+    parser.add_argument("--out", default="gantt.png", help="output image (.png, .svg, .pdf)")
+    parser.add_argument("--max-labels", type=int, default=MAX_LABELS)
+    args = parser.parse_args()
 
-    # 레이아웃 조정 및 출력
-    plt.tight_layout()
-    plt.show()
+    matplotlib.use("Agg")
+    report = pd.read_csv(args.report)
+    if "process" in report.columns:
+        operations = operations_from_reports(report)
+    else:
+        operations = operations_from_export(report)
+    render_gantt(operations, args.out, args.max_labels)
+    print(f"{len(operations):,} operations -> {args.out}")